@@ -0,0 +1,163 @@
+"""Materialized authorizations table kept in sync with authorizations_view by triggers.
+
+Revision ID: 526e29efe03b
+Revises: 5a5a3a82f05c
+Create Date: 2026-10-17 09:12:41.331207
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "526e29efe03b"
+down_revision = "5a5a3a82f05c"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "authorizations_materialized"
+
+COLUMNS = (
+    "business_identifier, entity_name, folio_number, corp_type_code, org_membership, keycloak_guid, user_id, "
+    "org_id, org_name, status_code, org_type, product_code, bcol_user_id, bcol_account_id"
+)
+
+# Rebuilds every row of the given orgs from authorizations_view. The view is a cross product of memberships,
+# affiliations and product subscriptions per org, so an org is the smallest unit that can be refreshed safely.
+REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION refresh_authorizations_for_orgs(org_ids integer[]) RETURNS void AS $$
+BEGIN
+    IF org_ids IS NULL OR cardinality(org_ids) = 0 THEN
+        RETURN;
+    END IF;
+    DELETE FROM {TABLE_NAME} WHERE org_id = ANY(org_ids);
+    INSERT INTO {TABLE_NAME} ({COLUMNS})
+        SELECT {COLUMNS} FROM authorizations_view WHERE org_id = ANY(org_ids);
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Memberships, affiliations and product subscriptions change the shape of the join, refresh the affected orgs.
+ORG_REFRESH_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION {table}_refresh_authorizations() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_authorizations_for_orgs(ARRAY(SELECT DISTINCT org_id FROM new_rows));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_authorizations_for_orgs(
+            ARRAY(SELECT org_id FROM new_rows UNION SELECT org_id FROM old_rows)
+        );
+    ELSE
+        PERFORM refresh_authorizations_for_orgs(ARRAY(SELECT DISTINCT org_id FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Orgs, entities and users only contribute columns, update those in place.
+COLUMN_UPDATE_TRIGGER_FUNCTIONS = {
+    "orgs": f"""
+CREATE OR REPLACE FUNCTION orgs_refresh_authorizations() RETURNS trigger AS $$
+BEGIN
+    UPDATE {TABLE_NAME} am
+       SET org_name = n.name, status_code = n.status_code, org_type = n.type_code,
+           bcol_user_id = n.bcol_user_id, bcol_account_id = n.bcol_account_id
+      FROM new_rows n JOIN old_rows o ON o.id = n.id
+     WHERE am.org_id = n.id
+       AND (n.name, n.status_code, n.type_code, n.bcol_user_id, n.bcol_account_id)
+           IS DISTINCT FROM (o.name, o.status_code, o.type_code, o.bcol_user_id, o.bcol_account_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""",
+    "entities": f"""
+CREATE OR REPLACE FUNCTION entities_refresh_authorizations() RETURNS trigger AS $$
+BEGIN
+    UPDATE {TABLE_NAME} am
+       SET business_identifier = n.business_identifier, entity_name = n.name,
+           folio_number = n.folio_number, corp_type_code = n.corp_type_code
+      FROM new_rows n JOIN old_rows o ON o.id = n.id
+     WHERE am.business_identifier = o.business_identifier
+       AND (n.business_identifier, n.name, n.folio_number, n.corp_type_code)
+           IS DISTINCT FROM (o.business_identifier, o.name, o.folio_number, o.corp_type_code);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""",
+    "users": f"""
+CREATE OR REPLACE FUNCTION users_refresh_authorizations() RETURNS trigger AS $$
+BEGIN
+    UPDATE {TABLE_NAME} am
+       SET keycloak_guid = n.keycloak_guid
+      FROM new_rows n JOIN old_rows o ON o.id = n.id
+     WHERE am.user_id = n.id
+       AND n.keycloak_guid IS DISTINCT FROM o.keycloak_guid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""",
+}
+
+ORG_REFRESH_TABLES = ("memberships", "affiliations", "product_subscriptions")
+
+
+def _create_statement_trigger(table: str, operation: str):
+    transition_tables = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "NEW TABLE AS new_rows OLD TABLE AS old_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }[operation]
+    op.execute(
+        f"CREATE TRIGGER {table}_{operation.lower()}_authorizations AFTER {operation} ON {table} "
+        f"REFERENCING {transition_tables} FOR EACH STATEMENT EXECUTE FUNCTION {table}_refresh_authorizations()"
+    )
+
+
+def upgrade():
+    op.create_table(
+        TABLE_NAME,
+        sa.Column("business_identifier", sa.String(), nullable=True),
+        sa.Column("entity_name", sa.String(), nullable=True),
+        sa.Column("folio_number", sa.String(), nullable=True),
+        sa.Column("corp_type_code", sa.String(), nullable=True),
+        sa.Column("org_membership", sa.String(), nullable=True),
+        sa.Column("keycloak_guid", postgresql.UUID(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("org_id", sa.Integer(), nullable=True),
+        sa.Column("org_name", sa.String(), nullable=True),
+        sa.Column("status_code", sa.String(), nullable=True),
+        sa.Column("org_type", sa.String(), nullable=True),
+        sa.Column("product_code", sa.String(), nullable=True),
+        sa.Column("bcol_user_id", sa.String(), nullable=True),
+        sa.Column("bcol_account_id", sa.String(), nullable=True),
+    )
+    op.create_index(f"ix_{TABLE_NAME}_keycloak_guid_org_id", TABLE_NAME, ["keycloak_guid", "org_id"])
+    op.create_index(f"ix_{TABLE_NAME}_business_identifier_org_id", TABLE_NAME, ["business_identifier", "org_id"])
+    op.create_index(
+        f"ix_{TABLE_NAME}_org_id_product_code_membership", TABLE_NAME, ["org_id", "product_code", "org_membership"]
+    )
+    op.create_index(f"ix_{TABLE_NAME}_user_id", TABLE_NAME, ["user_id"])
+
+    op.execute(REFRESH_FUNCTION)
+    for table in ORG_REFRESH_TABLES:
+        op.execute(ORG_REFRESH_TRIGGER_FUNCTION.format(table=table))
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            _create_statement_trigger(table, operation)
+    for table, function_sql in COLUMN_UPDATE_TRIGGER_FUNCTIONS.items():
+        op.execute(function_sql)
+        _create_statement_trigger(table, "UPDATE")
+
+    op.execute(f"INSERT INTO {TABLE_NAME} ({COLUMNS}) SELECT {COLUMNS} FROM authorizations_view")
+
+
+def downgrade():
+    for table in ORG_REFRESH_TABLES:
+        for operation in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_{operation}_authorizations ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_refresh_authorizations()")
+    for table in COLUMN_UPDATE_TRIGGER_FUNCTIONS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_update_authorizations ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_refresh_authorizations()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_authorizations_for_orgs(integer[])")
+    op.drop_table(TABLE_NAME)
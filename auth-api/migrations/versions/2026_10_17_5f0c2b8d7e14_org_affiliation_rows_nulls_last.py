@@ -0,0 +1,32 @@
+"""Order the org_affiliation_rows index like the affiliation search, rows without created_on last.
+
+Revision ID: 5f0c2b8d7e14
+Revises: a9789fe323e0
+Create Date: 2026-10-17 22:41:17.530962
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5f0c2b8d7e14"
+down_revision = "a9789fe323e0"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_org_affiliation_rows_org_id_created_on"
+
+
+def upgrade():
+    op.drop_index(INDEX_NAME, table_name="org_affiliation_rows")
+    op.create_index(
+        INDEX_NAME,
+        "org_affiliation_rows",
+        ["org_id", sa.text("created_on DESC NULLS LAST"), sa.text("identifiers DESC")],
+    )
+
+
+def downgrade():
+    op.drop_index(INDEX_NAME, table_name="org_affiliation_rows")
+    op.create_index(INDEX_NAME, "org_affiliation_rows", ["org_id", "created_on", "identifiers"])
@@ -0,0 +1,23 @@
+"""Index affiliations by org and creation date for affiliation searches.
+
+Revision ID: 9b3d41c7e2a8
+Revises: 526e29efe03b
+Create Date: 2026-10-17 14:05:12.518304
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b3d41c7e2a8"
+down_revision = "526e29efe03b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # entity_mapping.business_identifier, bootstrap_identifier and nr_identifier are indexed since 6f2c09061fd3.
+    op.create_index("ix_affiliations_org_id_created", "affiliations", ["org_id", "created"])
+
+
+def downgrade():
+    op.drop_index("ix_affiliations_org_id_created", table_name="affiliations")
@@ -0,0 +1,60 @@
+"""Serialize refreshes of authorizations_materialized per org.
+
+Revision ID: a9789fe323e0
+Revises: e3c8f1a6b294
+Create Date: 2026-10-17 21:04:52.118406
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a9789fe323e0"
+down_revision = "e3c8f1a6b294"
+branch_labels = None
+depends_on = None
+
+TABLE_NAME = "authorizations_materialized"
+
+COLUMNS = (
+    "business_identifier, entity_name, folio_number, corp_type_code, org_membership, keycloak_guid, user_id, "
+    "org_id, org_name, status_code, org_type, product_code, bcol_user_id, bcol_account_id"
+)
+
+# Two transactions refreshing the same org would each delete the rows they can see and insert a full set, leaving
+# duplicates under READ COMMITTED. A transaction scoped advisory lock per org (first key 2 keeps these locks apart
+# from other per org locks), taken in org id order, makes the second refresh wait and replace the rows of the first.
+LOCKING_REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION refresh_authorizations_for_orgs(org_ids integer[]) RETURNS void AS $$
+BEGIN
+    IF org_ids IS NULL OR cardinality(org_ids) = 0 THEN
+        RETURN;
+    END IF;
+    PERFORM pg_advisory_xact_lock(2, ids.org_id)
+       FROM (SELECT DISTINCT unnest(org_ids) AS org_id ORDER BY 1) ids;
+    DELETE FROM {TABLE_NAME} WHERE org_id = ANY(org_ids);
+    INSERT INTO {TABLE_NAME} ({COLUMNS})
+        SELECT {COLUMNS} FROM authorizations_view WHERE org_id = ANY(org_ids);
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+REFRESH_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION refresh_authorizations_for_orgs(org_ids integer[]) RETURNS void AS $$
+BEGIN
+    IF org_ids IS NULL OR cardinality(org_ids) = 0 THEN
+        RETURN;
+    END IF;
+    DELETE FROM {TABLE_NAME} WHERE org_id = ANY(org_ids);
+    INSERT INTO {TABLE_NAME} ({COLUMNS})
+        SELECT {COLUMNS} FROM authorizations_view WHERE org_id = ANY(org_ids);
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade():
+    op.execute(LOCKING_REFRESH_FUNCTION)
+
+
+def downgrade():
+    op.execute(REFRESH_FUNCTION)
@@ -0,0 +1,37 @@
+"""Precomputed affiliation search rows per org.
+
+Revision ID: c41f7a2d9e05
+Revises: 9b3d41c7e2a8
+Create Date: 2026-10-17 16:31:08.204117
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c41f7a2d9e05"
+down_revision = "9b3d41c7e2a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are backfilled with `flask rebuild-affiliation-rows` before AFFILIATION_ROWS_ENABLED is switched on.
+    op.create_table(
+        "org_affiliation_rows",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("org_id", sa.Integer(), nullable=False),
+        sa.Column("identifiers", postgresql.ARRAY(sa.String(length=75)), nullable=False),
+        sa.Column("created_on", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["org_id"], ["orgs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_org_affiliation_rows_org_id_created_on", "org_affiliation_rows", ["org_id", "created_on", "identifiers"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_org_affiliation_rows_org_id_created_on", table_name="org_affiliation_rows")
+    op.drop_table("org_affiliation_rows")
@@ -0,0 +1,41 @@
+"""Trigram indexes for the staff org search.
+
+Revision ID: d7a9e3b15f42
+Revises: c41f7a2d9e05
+Create Date: 2026-10-17 16:48:37.204511
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d7a9e3b15f42"
+down_revision = "c41f7a2d9e05"
+branch_labels = None
+depends_on = None
+
+ORG_COLUMNS = ("name", "branch_name", "decision_made_by", "bcol_account_id")
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in ORG_COLUMNS:
+        op.create_index(
+            f"ix_orgs_{column}_trgm",
+            "orgs",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+    # The expressions must match the ones Org.search_org filters on for the planner to use these indexes.
+    op.execute("CREATE INDEX ix_orgs_id_text_trgm ON orgs USING gin ((CAST(id AS VARCHAR)) gin_trgm_ops)")
+    op.execute(
+        "CREATE INDEX ix_users_search_text_trgm ON users USING gin ("
+        "(COALESCE(last_name, '') || ' ' || COALESCE(first_name, '') || ' ' || COALESCE(username, '')) gin_trgm_ops)"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_search_text_trgm", table_name="users")
+    op.drop_index("ix_orgs_id_text_trgm", table_name="orgs")
+    for column in ORG_COLUMNS:
+        op.drop_index(f"ix_orgs_{column}_trgm", table_name="orgs")
@@ -0,0 +1,30 @@
+"""Indexes for excluding orgs with pending activation invitations from org searches.
+
+Revision ID: e3c8f1a6b294
+Revises: d7a9e3b15f42
+Create Date: 2026-10-17 18:21:09.631457
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e3c8f1a6b294"
+down_revision = "d7a9e3b15f42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_invitation_memberships_org_id", "invitation_memberships", ["org_id"])
+    op.create_index(
+        "ix_invitations_pending_activation",
+        "invitations",
+        ["id"],
+        postgresql_where=sa.text("invitation_status_code = 'PENDING' AND type IN ('DIRECTOR_SEARCH', 'GOVM')"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_invitations_pending_activation", table_name="invitations")
+    op.drop_index("ix_invitation_memberships_org_id", table_name="invitation_memberships")
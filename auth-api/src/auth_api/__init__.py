@@ -18,6 +18,7 @@ This module is the API for the Authroization system.
 import os
 import traceback
 
+import click
 from flask import Flask, request
 from flask_cors import CORS
 from flask_migrate import Migrate, upgrade
@@ -33,6 +34,7 @@ from auth_api.services.flags import flags
 from auth_api.services.gcp_queue import queue
 from auth_api.utils.auth import jwt
 from auth_api.utils.cache import cache
+from auth_api.utils.http_session import http_sessions
 from auth_api.utils.logging import setup_logging
 from auth_api.utils.user_context import _get_context
 
@@ -62,6 +64,7 @@ def create_app(run_mode=os.getenv("DEPLOYMENT_ENV", "production")):
         ma.init_app(app)
         queue.init_app(app)
         mail.init_app(app)
+        http_sessions.init_app(app)
         endpoints.init_app(app)
 
         app.after_request(convert_to_camel)
@@ -70,6 +73,7 @@ def create_app(run_mode=os.getenv("DEPLOYMENT_ENV", "production")):
         setup_403_logging(app)
         setup_jwt_manager(app, jwt)
         register_shellcontext(app)
+        register_commands(app)
         build_cache(app)
 
     return app
@@ -125,6 +129,30 @@ def register_shellcontext(app):
     app.shell_context_processor(shell_context)
 
 
+def register_commands(app):
+    """Register flask cli commands."""
+
+    @app.cli.command("rebuild-affiliation-rows")
+    @click.option("--org-id", "org_ids", type=int, multiple=True, help="Only rebuild these orgs.")
+    @click.option("--verify", is_flag=True, help="Compare the stored rows with the source tables instead.")
+    def rebuild_affiliation_rows(org_ids, verify):
+        """Backfill or verify org_affiliation_rows."""
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        from auth_api.models import Affiliation as AffiliationModel
+        from auth_api.services import OrgAffiliationRows
+
+        if not verify:
+            click.echo(f"Rebuilt affiliation rows of {OrgAffiliationRows.rebuild(list(org_ids))} orgs.")
+            return
+        org_ids = org_ids or db.session.scalars(select(AffiliationModel.org_id).distinct())
+        mismatched = [org_id for org_id in org_ids if not OrgAffiliationRows.verify(org_id)]
+        click.echo(f"Orgs with stale affiliation rows: {mismatched}" if mismatched else "Affiliation rows match.")
+        if mismatched:
+            raise SystemExit(1)
+
+
 def build_cache(app):
     """Build cache."""
     cache.init_app(app)
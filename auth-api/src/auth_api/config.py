@@ -64,7 +64,7 @@ class _Config:  # pylint: disable=too-few-public-methods
 
     ALEMBIC_INI = "migrations/alembic.ini"
     # Config to skip migrations when alembic migrate is used
-    SKIPPED_MIGRATIONS = ["authorizations_view"]
+    SKIPPED_MIGRATIONS = ["authorizations_view", "authorizations_materialized"]
 
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -110,6 +110,56 @@ class _Config:  # pylint: disable=too-few-public-methods
     CACHE_MEMCACHED_SERVERS = os.getenv("CACHE_MEMCACHED_SERVERS")
     CACHE_REDIS_HOST = os.getenv("CACHE_REDIS_HOST")
     CACHE_REDIS_PORT = os.getenv("CACHE_REDIS_PORT")
+    # Seconds authorizations_view lookups stay in the shared cache, 0 disables it
+    AUTHORIZATION_CACHE_TIMEOUT = int(os.getenv("AUTHORIZATION_CACHE_TIMEOUT", "300"))
+    # Read authorizations from the trigger maintained authorizations_materialized table instead of the view
+    USE_MATERIALIZED_AUTHORIZATIONS = os.getenv("USE_MATERIALIZED_AUTHORIZATIONS", "False").lower() == "true"
+    # Seconds before each worker reloads its in process permission matrix, 0 keeps it until restart or reload
+    PERMISSIONS_MATRIX_REFRESH_SECONDS = int(os.getenv("PERMISSIONS_MATRIX_REFRESH_SECONDS", "900"))
+    # Seconds before each worker reloads its in process product code table, 0 keeps it until restart
+    PRODUCTS_CACHE_REFRESH_SECONDS = int(os.getenv("PRODUCTS_CACHE_REFRESH_SECONDS", "900"))
+
+    # Seconds the latest version of each document type stays cached, 0 disables it
+    DOCUMENTS_CACHE_TIMEOUT = int(os.getenv("DOCUMENTS_CACHE_TIMEOUT", "3600"))
+
+    # Seconds before expiry that cached client credentials tokens are refreshed
+    TOKEN_REFRESH_SKEW_SECONDS = int(os.getenv("TOKEN_REFRESH_SKEW_SECONDS", "30"))
+    # Seconds before expiry that service account tokens are renewed in the background
+    TOKEN_BACKGROUND_REFRESH_SECONDS = int(os.getenv("TOKEN_BACKGROUND_REFRESH_SECONDS", "60"))
+
+    # Keycloak group membership calls a product group sync keeps in flight at once
+    KEYCLOAK_GROUP_SYNC_CONCURRENCY = int(os.getenv("KEYCLOAK_GROUP_SYNC_CONCURRENCY", "20"))
+    # Seconds the keycloak group tree stays in the shared cache, lookups of unknown groups reload it sooner
+    KEYCLOAK_GROUP_DIRECTORY_TIMEOUT = int(os.getenv("KEYCLOAK_GROUP_DIRECTORY_TIMEOUT", "86400"))
+    # Minimum seconds between reloads of the keycloak group tree, unknown groups are remembered as missing as long
+    KEYCLOAK_GROUP_DIRECTORY_RELOAD_SECONDS = int(os.getenv("KEYCLOAK_GROUP_DIRECTORY_RELOAD_SECONDS", "60"))
+    # Keycloak user lookups and creations the bulk user import keeps in flight at once
+    KEYCLOAK_USER_CONCURRENCY = int(os.getenv("KEYCLOAK_USER_CONCURRENCY", "10"))
+    # Users the bulk user import commits per transaction
+    BULK_USERS_COMMIT_SIZE = int(os.getenv("BULK_USERS_COMMIT_SIZE", "50"))
+
+    # Seconds a request thread waits for a coroutine on the shared event loop before cancelling it
+    ASYNC_RUNNER_TIMEOUT = int(os.getenv("ASYNC_RUNNER_TIMEOUT", "120"))
+
+    # Outbound HTTP connection pools, per process
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_CONNECT_TIMEOUT = int(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+
+    # Parallel POST fan-out to LEAR and namex
+    PARALLEL_POST_LIMIT_PER_HOST = int(os.getenv("PARALLEL_POST_LIMIT_PER_HOST", "10"))
+    PARALLEL_POST_TIMEOUT = int(os.getenv("PARALLEL_POST_TIMEOUT", "30"))
+    PARALLEL_POST_RETRIES = int(os.getenv("PARALLEL_POST_RETRIES", "2"))
+
+    # Identifiers sent to LEAR or namex per affiliation details call
+    AFFILIATION_DETAILS_BATCH_SIZE = int(os.getenv("AFFILIATION_DETAILS_BATCH_SIZE", "500"))
+    # Seconds LEAR and namex details stay cached per identifier, 0 disables it
+    AFFILIATION_DETAILS_CACHE_TIMEOUT = int(os.getenv("AFFILIATION_DETAILS_CACHE_TIMEOUT", "60"))
+    # Read the affiliation search from org_affiliation_rows, enable once `flask rebuild-affiliation-rows` has run
+    AFFILIATION_ROWS_ENABLED = os.getenv("AFFILIATION_ROWS_ENABLED", "False").lower() == "true"
+    # Keep org_affiliation_rows up to date on every write, needed before the rebuild that precedes enabling the rows
+    AFFILIATION_ROWS_MAINTAINED = os.getenv("AFFILIATION_ROWS_MAINTAINED", "False").lower() == "true"
 
     # Service account details
     KEYCLOAK_SERVICE_ACCOUNT_ID = os.getenv("SBC_AUTH_ADMIN_CLIENT_ID")
@@ -206,6 +256,8 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
 
     DEBUG = True
     TESTING = True
+    # Each test rolls its documents back without going through the session, keep versions uncached
+    DOCUMENTS_CACHE_TIMEOUT = 0
     # POSTGRESQL
     DB_USER = os.getenv("DATABASE_TEST_USERNAME", "postgres")
     DB_PASSWORD = os.getenv("DATABASE_TEST_PASSWORD", "postgres")
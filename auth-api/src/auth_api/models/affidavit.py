@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This manages an Affidavit record in the Auth service."""
+from __future__ import annotations
+
+from typing import List
+
 from sql_versioning import Versioned
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
@@ -68,6 +72,15 @@ class Affidavit(Versioned, BaseModel):
         """Find pending affidavit by user id."""
         return cls.query.filter_by(user_id=int(user_id or -1), status_code=AffidavitStatus.APPROVED.value).one_or_none()
 
+    @classmethod
+    def find_approved_by_user_ids(cls, user_ids: List[int]) -> List[Affidavit]:
+        """Find the approved affidavits of the users."""
+        if not user_ids:
+            return []
+        return cls.query.filter(
+            Affidavit.user_id.in_(user_ids), Affidavit.status_code == AffidavitStatus.APPROVED.value
+        ).all()
+
     @classmethod
     def find_effective_by_user_guid(cls, user_guid: str, status: str = None):
         """Find pending affidavit by user id."""
@@ -20,7 +20,7 @@ from __future__ import annotations
 from typing import List
 
 from sql_versioning import Versioned
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import contains_eager, relationship
 
 from .base_model import BaseModel
@@ -34,6 +34,8 @@ class Affiliation(
     """This is the model for an Affiliation."""
 
     __tablename__ = "affiliations"
+    # Affiliation searches filter on the org and order by the affiliation date.
+    __table_args__ = (Index("ix_affiliations_org_id_created", "org_id", "created"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     entity_id = Column(ForeignKey("entities.id"), nullable=False, index=True)
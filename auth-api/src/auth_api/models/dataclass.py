@@ -15,7 +15,7 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Self
+from typing import List, Optional, Self, Tuple
 
 from requests import Request
 
@@ -60,11 +60,13 @@ class AffiliationSearchDetails:  # pylint: disable=too-many-instance-attributes
     status: Optional[str] = None
     name: Optional[str] = None
     type: Optional[str] = None
+    cursor: Optional[str] = None
 
     @classmethod
     def from_request_args(cls, req: Request) -> Self:
         """Used for searching affiliations."""
         return cls(
+            cursor=req.args.get("cursor"),
             identifier=req.args.get("identifier"),
             status=req.args.getlist("status") or [],
             name=req.args.get("name"),
@@ -191,6 +193,17 @@ class KeycloakGroupSubscription:
     group_action: KeycloakGroupActions
 
 
+@dataclass(frozen=True)
+class ProductCodeInfo:
+    """Used for the in process product code lookup table."""
+
+    code: str
+    type_code: str
+    linked_product_code: Optional[str] = None
+    parent_code: Optional[str] = None
+    keycloak_group: Optional[str] = None
+
+
 @dataclass
 class ProductReviewTask:
     """Used for creating product subscription review task."""
@@ -210,3 +223,41 @@ class AffiliationBase:
 
     identifier: str
     created: datetime
+
+
+@dataclass
+class ParallelPostFailure:
+    """A call of a parallel POST fan-out that did not succeed."""
+
+    url: str
+    status: Optional[int]
+    error: str
+
+
+@dataclass
+class ParallelPostResult:
+    """Outcome of a parallel POST fan-out, responses keep the order of the calls that succeeded."""
+
+    responses: List = field(default_factory=list)
+    failures: List[ParallelPostFailure] = field(default_factory=list)
+
+    @property
+    def degraded(self) -> bool:
+        """Return True when some of the calls failed."""
+        return bool(self.failures)
+
+
+@dataclass
+class KeycloakGroupSyncReport:
+    """Outcome of a keycloak group sync, memberships are (user guid, group name) pairs."""
+
+    added: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[Tuple[str, str]] = field(default_factory=list)
+    unchanged: int = 0
+    failed: List[Tuple[str, str, str]] = field(default_factory=list)
+    missing_groups: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> int:
+        """Return the number of memberships that were added or removed."""
+        return len(self.added) + len(self.removed)
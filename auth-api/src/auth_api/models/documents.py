@@ -18,7 +18,9 @@ Documents which are static in nature are stored in this table  ie.terms of use
 
 from __future__ import annotations
 
-from sqlalchemy import Column, String, Text, desc
+from typing import Dict, List
+
+from sqlalchemy import Column, String, Text, desc, func
 
 from .base_model import BaseModel
 from .db import db
@@ -56,3 +58,16 @@ class Documents(BaseModel):
             .limit(1)
             .scalar()
         )
+
+    @classmethod
+    def find_latest_versions_by_types(cls, file_types: List[str]) -> Dict[str, str]:
+        """Fetch the latest version of every given document type in one query."""
+        if not file_types:
+            return {}
+        rows = (
+            db.session.query(Documents.type, func.max(Documents.version_id))
+            .filter(Documents.type.in_(file_types))
+            .group_by(Documents.type)
+            .all()
+        )
+        return dict(rows)
@@ -16,7 +16,7 @@
 from datetime import datetime, timedelta
 from typing import Self
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
@@ -32,6 +32,14 @@ class Invitation(BaseModel):  # pylint: disable=too-few-public-methods # Tempora
     """Model for a Invitation record."""
 
     __tablename__ = "invitations"
+    # Pending invitations of anonymous and GovM orgs, the orgs Org._search_for_statuses leaves out of searches.
+    __table_args__ = (
+        Index(
+            "ix_invitations_pending_activation",
+            "id",
+            postgresql_where=text("invitation_status_code = 'PENDING' AND type IN ('DIRECTOR_SEARCH', 'GOVM')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     sender_id = Column(ForeignKey("users.id"), nullable=False)
@@ -29,7 +29,7 @@ class InvitationMembership(BaseModel):  # pylint: disable=too-few-public-methods
 
     id = Column(Integer, primary_key=True)
     invitation_id = Column(ForeignKey("invitations.id"), nullable=False, index=True)
-    org_id = Column(ForeignKey("orgs.id"), nullable=False)
+    org_id = Column(ForeignKey("orgs.id"), nullable=False, index=True)
     membership_type_code = Column(ForeignKey("membership_types.code"), nullable=False)
 
     membership_type = relationship("MembershipType", foreign_keys=[membership_type_code])
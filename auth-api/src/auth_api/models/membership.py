@@ -21,8 +21,8 @@ from __future__ import annotations
 from typing import List
 
 from sql_versioning import Versioned
-from sqlalchemy import Column, ForeignKey, Integer, and_, desc, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, and_, desc, func, select
+from sqlalchemy.orm import relationship, selectinload
 
 from auth_api.utils.enums import LoginSource, OrgType, Status
 from auth_api.utils.roles import ADMIN, COORDINATOR, USER, VALID_ORG_STATUSES, VALID_STATUSES
@@ -91,6 +91,11 @@ class Membership(
         count = query.session.execute(count_q).scalar()
         return count
 
+    @classmethod
+    def find_members_with_users_by_org_id(cls, org_id: int) -> List[Membership]:
+        """Return all members of the org with their users loaded in one extra query."""
+        return cls.query.filter_by(org_id=int(org_id or -1)).options(selectinload(Membership.user)).all()
+
     @classmethod
     def find_members_by_org_id_by_status_by_roles(
         cls, org_id: int, roles, status=Status.ACTIVE.value
@@ -105,6 +110,22 @@ class Membership(
             .all()
         )
 
+    @classmethod
+    def find_user_ids_with_orgs(cls, user_ids: List[int], valid_statuses=VALID_STATUSES) -> set:
+        """Return the ids of the users that still have a membership counted by find_orgs_for_user."""
+        if not user_ids:
+            return set()
+        return set(
+            db.session.scalars(
+                select(cls.user_id)
+                .join(OrgModel)
+                .where(cls.user_id.in_(user_ids))
+                .where(cls.status.in_(valid_statuses))
+                .where(OrgModel.status_code.in_(VALID_ORG_STATUSES))
+                .distinct()
+            )
+        )
+
     @classmethod
     def find_orgs_for_user(cls, user_id: int, valid_statuses=VALID_STATUSES) -> List[OrgModel]:
         """Find the orgs for a user."""
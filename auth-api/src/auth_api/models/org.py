@@ -19,7 +19,22 @@ from typing import List, Self
 
 from flask import current_app
 from sql_versioning import Versioned
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, and_, cast, desc, event, func, text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    and_,
+    cast,
+    desc,
+    event,
+    exists,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import contains_eager, relationship
 
@@ -39,11 +54,19 @@ from .invitation import Invitation, InvitationMembership
 from .org_status import OrgStatus
 from .org_type import OrgType
 
+PENDING_ACTIVATION_INVITATION_TYPES = (InvitationType.DIRECTOR_SEARCH.value, InvitationType.GOVM.value)
+
 
 class Org(Versioned, BaseModel):  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """Model for an Org record."""
 
     __tablename__ = "orgs"
+    # Trigram indexes serve the ILIKE '%...%' filters of search_org, the org id and member name filters are served by
+    # the expression indexes ix_orgs_id_text_trgm and ix_users_search_text_trgm created in their migration.
+    __table_args__ = tuple(
+        Index(f"ix_orgs_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+        for column in ("name", "branch_name", "decision_made_by", "bcol_account_id")
+    )
 
     id = Column(Integer, primary_key=True)
     uuid = Column(UUID, nullable=False, server_default=text("uuid_generate_v4()"), unique=True)
@@ -183,7 +206,8 @@ class Org(Versioned, BaseModel):  # pylint: disable=too-few-public-methods,too-m
                     WHERE memberships.org_id = orgs.id
                     AND memberships.status = 1
                     AND users.status = 1
-                    AND CONCAT(users.last_name, ' ', users.first_name, ' ', users.username) ILIKE :member_search_text
+                    AND (COALESCE(users.last_name, '') || ' ' || COALESCE(users.first_name, '') || ' '
+                        || COALESCE(users.username, '')) ILIKE :member_search_text
                 )
                 """
             ).params(member_search_text=f"%{search.member_search_text}%")
@@ -236,27 +260,31 @@ class Org(Versioned, BaseModel):  # pylint: disable=too-few-public-methods,too-m
             query = query.filter(Org.status_code.in_(statuses))
         # If status is active, need to exclude the dir search orgs who haven't accepted the invitation yet
         if not statuses or OrgStatusEnum.ACTIVE.value in statuses:
-            pending_inv_subquery = (
-                db.session.query(Org.id)
-                .outerjoin(InvitationMembership, InvitationMembership.org_id == Org.id)
-                .outerjoin(Invitation, Invitation.id == InvitationMembership.invitation_id)
-                .filter(Invitation.invitation_status_code == InvitationStatus.PENDING.value)
-                .filter(
-                    (
-                        (Invitation.type == InvitationType.DIRECTOR_SEARCH.value)
-                        & (Org.status_code == OrgStatusEnum.ACTIVE.value)
-                        & (Org.access_type == AccessType.ANONYMOUS.value)
-                    )
-                    | (
-                        (Invitation.type == InvitationType.GOVM.value)
-                        & (Org.status_code == OrgStatusEnum.PENDING_INVITE_ACCEPT.value)
-                        & (Org.access_type == AccessType.GOVM.value)
-                    )
-                )
+            # NOT EXISTS lets postgres anti join on the pending invitations, found with
+            # ix_invitations_pending_activation, instead of building the NOT IN list for every search.
+            pending_invitation = exists().where(
+                InvitationMembership.org_id == Org.id,
+                Invitation.id == InvitationMembership.invitation_id,
+                Invitation.invitation_status_code == InvitationStatus.PENDING.value,
+                Invitation.type.in_(PENDING_ACTIVATION_INVITATION_TYPES),
+                cls._pending_activation_filter(),
             )
-            query = query.filter(Org.id.notin_(pending_inv_subquery))
+            query = query.filter(~pending_invitation)
         return query
 
+    @staticmethod
+    def _pending_activation_filter():
+        """Return the criteria of an org waiting for its pending invitation to be accepted."""
+        return (
+            (Invitation.type == InvitationType.DIRECTOR_SEARCH.value)
+            & (Org.status_code == OrgStatusEnum.ACTIVE.value)
+            & (Org.access_type == AccessType.ANONYMOUS.value)
+        ) | (
+            (Invitation.type == InvitationType.GOVM.value)
+            & (Org.status_code == OrgStatusEnum.PENDING_INVITE_ACCEPT.value)
+            & (Org.access_type == AccessType.GOVM.value)
+        )
+
     @classmethod
     def search_pending_activation_orgs(cls, name: str):
         """Find all orgs with the given type."""
@@ -266,18 +294,7 @@ class Org(Versioned, BaseModel):  # pylint: disable=too-few-public-methods,too-m
             .outerjoin(Invitation, Invitation.id == InvitationMembership.invitation_id)
             .options(contains_eager(Org.invitations).load_only(InvitationMembership.invitation_id))
             .filter(Invitation.invitation_status_code == InvitationStatus.PENDING.value)
-            .filter(
-                (
-                    (Invitation.type == InvitationType.DIRECTOR_SEARCH.value)
-                    & (Org.status_code == OrgStatusEnum.ACTIVE.value)
-                    & (Org.access_type == AccessType.ANONYMOUS.value)
-                )
-                | (
-                    (Invitation.type == InvitationType.GOVM.value)
-                    & (Org.status_code == OrgStatusEnum.PENDING_INVITE_ACCEPT.value)
-                    & (Org.access_type == AccessType.GOVM.value)
-                )
-            )
+            .filter(cls._pending_activation_filter())
         )
         if name:
             query = query.filter(Org.name.ilike(f"%{name}%"))
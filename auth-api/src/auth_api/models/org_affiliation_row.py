@@ -0,0 +1,41 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Precomputed rows of the affiliation search, one row per item displayed for an org.
+
+The rows are derived from affiliations, entities and entity mappings and are rebuilt per org whenever one of them
+changes, see auth_api.services.org_affiliation_rows.
+"""
+from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Index, Integer, String, text
+
+from .db import db
+
+
+class OrgAffiliationRow(db.Model):  # pylint: disable=too-few-public-methods
+    """One displayed affiliation of an org, holding a business, a TEMP, an NR or a TEMP and NR pair."""
+
+    __tablename__ = "org_affiliation_rows"
+    # Matches the order of the affiliation search, rows without created_on last.
+    __table_args__ = (
+        Index(
+            "ix_org_affiliation_rows_org_id_created_on",
+            "org_id",
+            text("created_on DESC NULLS LAST"),
+            text("identifiers DESC"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    org_id = Column(ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False)
+    identifiers = Column(ARRAY(String(75)), nullable=False)
+    created_on = Column(DateTime, nullable=True)
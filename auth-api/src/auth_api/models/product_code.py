@@ -74,6 +74,18 @@ class ProductCode(BaseCodeModel):  # pylint: disable=too-few-public-methods
         """Find a Product Role Code instance that matches the code."""
         return cls.query.filter_by(code=code).one_or_none()
 
+    @classmethod
+    def find_by_codes(cls, codes: List[str]) -> List[ProductCode]:
+        """Find all Product Code instances matching the codes."""
+        if not codes:
+            return []
+        return cls.query.filter(cls.__table__.c.code.in_(codes)).all()
+
+    @classmethod
+    def get_all_product_codes(cls) -> List[ProductCode]:
+        """Get every product code, including linked products."""
+        return cls.query.all()
+
     @classmethod
     def get_all_products(cls):
         """Get all of the products codes."""
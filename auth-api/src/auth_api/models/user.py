@@ -17,6 +17,7 @@ A User stores basic information from a KeyCloak user (including the KeyCloak GUI
 """
 
 import datetime
+from typing import Dict, List, Optional
 
 from flask import current_app
 from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, and_, or_
@@ -24,6 +25,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from auth_api.utils.enums import LoginSource, Status, UserStatus
+from auth_api.utils.request_cache import RequestCache
 from auth_api.utils.roles import Role
 from auth_api.utils.user_context import UserContext, user_context
 
@@ -33,6 +35,8 @@ from .membership import Membership as MembershipModel
 from .org import Org as OrgModel
 from .user_status_code import UserStatusCode
 
+current_user_id_cache = RequestCache("current_user_id", clear_on_rollback=True)
+
 
 class User(BaseModel):
     """This is the model for a User."""
@@ -85,6 +89,13 @@ class User(BaseModel):
         """Return the first user with the provided username."""
         return cls.query.filter_by(username=username).first()
 
+    @classmethod
+    def find_by_usernames(cls, usernames: List[str]) -> List["User"]:
+        """Return the users with the provided usernames."""
+        if not usernames:
+            return []
+        return cls.query.filter(cls.username.in_(usernames)).all()
+
     @classmethod
     @user_context
     def find_by_jwt_token(cls, **kwargs):
@@ -104,6 +115,28 @@ class User(BaseModel):
             .one_or_none()
         )
 
+    @classmethod
+    @user_context
+    def find_current_user_id(cls, **kwargs) -> Optional[int]:
+        """Return the id of the user in the token, looked up once per request.
+
+        Only found users are remembered, so a user created later in the same request is still picked up.
+        """
+        user_from_context: UserContext = kwargs["user_context"]
+        if not user_from_context.sub:
+            return None
+        key = (str(user_from_context.sub), user_from_context.token_info.get("idp_userid", None))
+        if (user_id := current_user_id_cache.get(key)) is None:
+            if user := cls.find_by_jwt_token():
+                user_id = user.id
+                current_user_id_cache.set(key, user_id)
+        return user_id
+
+    @staticmethod
+    def current_user_cache_stats() -> Dict[str, int]:
+        """Return the current user lookups served from the request cache (hits) and the database (misses)."""
+        return current_user_id_cache.stats()
+
     @classmethod
     @user_context
     def find_by_jwt_idp_userid(cls, **kwargs):
@@ -14,22 +14,30 @@
 """This manages Authorization view.
 
 Authorization view wraps details on the entities and membership through orgs and delegations.
+When USE_MATERIALIZED_AUTHORIZATIONS is set the model reads authorizations_materialized instead, a table with the
+same columns that database triggers keep in sync with the view on every membership, affiliation, product
+subscription, org, entity and user change.
 """
 
 import uuid
+from typing import List
 
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import expression
 
+from auth_api.config import get_named_config
 from auth_api.models.db import db
 from auth_api.utils.roles import ADMIN, COORDINATOR, USER
 
+# The table is picked when the model is declared, before an application exists.
+CONFIG = get_named_config()
+
 
 class Authorization(db.Model):
     """This is the model the authorizations_view."""
 
-    __tablename__ = "authorizations_view"
+    __tablename__ = "authorizations_materialized" if CONFIG.USE_MATERIALIZED_AUTHORIZATIONS else "authorizations_view"
 
     business_identifier = Column(String)
     entity_name = Column(String)
@@ -64,6 +72,40 @@ class Authorization(db.Model):
             auth = cls.query.filter_by(business_identifier=business_identifier).first()
         return auth
 
+    @classmethod
+    def find_authorizations_by_business_numbers(  # pylint: disable=too-many-arguments
+        cls,
+        business_identifiers: List[str],
+        *,
+        keycloak_guid: uuid = None,
+        org_id: int = None,
+        product_code: str = None,
+        is_staff=None,
+    ):
+        """Return authorization rows for many business identifiers in a single query.
+
+        Rows are returned as plain result rows, the mapped primary key (org_id, user_id) would otherwise collapse
+        the rows of different businesses in the same org into one identity.
+        """
+        if not business_identifiers or not (keycloak_guid or product_code or is_staff):
+            return []
+        query = cls.query.with_entities(*cls.__table__.columns).filter(
+            cls.business_identifier.in_(business_identifiers)
+        )
+        if keycloak_guid:
+            query = query.filter(cls.keycloak_guid == keycloak_guid)
+            if org_id:
+                query = query.filter(cls.org_id == int(org_id))
+        if product_code:
+            query = query.filter(cls.product_code == product_code).order_by(
+                expression.case(
+                    (Authorization.org_membership == ADMIN, 1),
+                    (Authorization.org_membership == COORDINATOR, 2),
+                    (Authorization.org_membership == USER, 3),
+                )
+            )
+        return query.all()
+
     @classmethod
     def find_user_authorization_by_business_number_and_product(cls, business_identifier: str, product_code: str):
         """Return authorization view object using corp type and business identifier.
@@ -16,6 +16,7 @@ from flask import Blueprint
 from sqlalchemy import exc, text
 
 from auth_api.models import db
+from auth_api.utils.affiliation_details_cache import affiliation_details_cache_stats
 
 bp = Blueprint("OPS", __name__, url_prefix="/ops")
 
@@ -39,3 +40,9 @@ def get_ops_readyz():
     """Return a JSON object that identifies if the service is setupAnd ready to work."""
     # TODO: add a poll to the DB when called
     return {"message": "api is ready"}, 200
+
+
+@bp.route("metrics", methods=["GET"])
+def get_ops_metrics():
+    """Return the cache hit and miss counters of this worker."""
+    return {"affiliation_details_cache": affiliation_details_cache_stats()}, 200
@@ -231,6 +231,28 @@ def delete_entity_contact(business_identifier):
     return response, status
 
 
+@bp.route("/authorizations", methods=["POST", "OPTIONS"])
+@cross_origin(origins="*", methods=["POST"])
+@_jwt.requires_auth
+def post_entities_authorizations():
+    """Return authorizations of the user for many business identifiers in one call."""
+    request_json = request.get_json()
+    valid_format, errors = schema_utils.validate(request_json, "entity_authorizations")
+    if not valid_format:
+        return {"message": schema_utils.serialize(errors)}, HTTPStatus.BAD_REQUEST
+
+    expanded: bool = request.args.get("expanded", False)
+    authorizations = AuthorizationService.get_user_authorizations_for_entities(
+        request_json["businessIdentifiers"], expanded
+    )
+    # A list rather than a map, business identifiers must not go through the camel case conversion of keys.
+    return {
+        "authorizations": [
+            {"businessIdentifier": identifier, **authorization} for identifier, authorization in authorizations.items()
+        ]
+    }, HTTPStatus.OK
+
+
 @bp.route("/<string:business_identifier>/authorizations", methods=["GET", "OPTIONS"])
 @cross_origin(origins="*", methods=["GET"])
 @_jwt.requires_auth
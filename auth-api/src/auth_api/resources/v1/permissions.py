@@ -24,11 +24,21 @@ from auth_api.services import Permissions as PermissionsService
 from auth_api.services.user import User as UserService
 from auth_api.utils.auth import jwt as _jwt
 from auth_api.utils.endpoints_enums import EndpointEnum
+from auth_api.utils.roles import Role
 from auth_api.utils.util import string_to_bool
 
 bp = Blueprint("MEMBER_PERMISSIONS", __name__, url_prefix=f"{EndpointEnum.API_V1.value}/permissions")
 
 
+@bp.route("/reload", methods=["POST", "OPTIONS"])
+@cross_origin(origins="*", methods=["POST"])
+@_jwt.has_one_of_roles([Role.SYSTEM.value])
+def post_reload_permissions():
+    """Reload the permission matrix of this worker, other workers pick changes up on their refresh interval."""
+    matrix = PermissionsService.build_all_permission_cache()
+    return {"version": matrix.version if matrix else None}, HTTPStatus.OK
+
+
 @bp.route("/<string:org_status>/<string:membership_type>", methods=["GET", "OPTIONS"])
 @cross_origin(origins="*", methods=["GET"])
 @_jwt.requires_auth
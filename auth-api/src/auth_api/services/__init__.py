@@ -27,6 +27,7 @@ from .google_store import GoogleStoreService
 from .invitation import Invitation
 from .membership import Membership
 from .org import Org
+from .org_affiliation_rows import OrgAffiliationRows
 from .permissions import Permissions
 from .products import Product
 from .simple_org import SimpleOrg
@@ -14,13 +14,16 @@
 """Service for managing Affiliation data."""
 import datetime
 import re
+import secrets
+import string
 from dataclasses import asdict
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from flask import current_app
 from requests.exceptions import HTTPError
 from sbc_common_components.utils.enums import QueueMessageTypes
-from sqlalchemy.orm import contains_eager, subqueryload
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager, selectinload
 
 from auth_api.exceptions import BusinessException, ServiceUnavailableException
 from auth_api.exceptions.errors import Error
@@ -30,22 +33,36 @@ from auth_api.models.affiliation_invitation import AffiliationInvitation as Affi
 from auth_api.models.contact_link import ContactLink
 from auth_api.models.dataclass import Activity
 from auth_api.models.dataclass import Affiliation as AffiliationData
-from auth_api.models.dataclass import AffiliationBase, AffiliationSearchDetails, DeleteAffiliationRequest
+from auth_api.models.dataclass import (
+    AffiliationBase,
+    AffiliationSearchDetails,
+    DeleteAffiliationRequest,
+    ParallelPostResult,
+)
 from auth_api.models.entity import Entity
 from auth_api.models.membership import Membership as MembershipModel
-from auth_api.schemas import AffiliationSchema
+from auth_api.schemas import AffiliationSchema, EntitySchema
 from auth_api.services.entity import Entity as EntityService
 from auth_api.services.org import Org as OrgService
 from auth_api.services.user import User as UserService
+from auth_api.utils.affiliation_details_cache import (
+    MISSING,
+    affiliation_details_cache_enabled,
+    cache_details,
+    get_cached_details,
+)
+from auth_api.utils.async_runner import async_runner
 from auth_api.utils.enums import ActivityAction, CorpType, NRActionCodes, NRNameStatus, NRStatus
-from auth_api.utils.passcode import validate_passcode
+from auth_api.utils.passcode import passcode_hashes, validate_passcode
 from auth_api.utils.roles import ALL_ALLOWED_ROLES, CLIENT_AUTH_ROLES, STAFF, Role
 from auth_api.utils.user_context import UserContext, user_context
 
-from ..utils.auth_event_publisher import publish_affiliation_event
+from ..utils.auth_event_publisher import publish_affiliation_event, publish_affiliation_events
 from .activity_log_publisher import ActivityLogPublisher
 from .rest_service import RestService
 
+TEMP_CORP_TYPES = {CorpType.TMP.value, CorpType.ATMP.value, CorpType.CTMP.value, CorpType.RTMP.value}
+
 
 class Affiliation:
     """Manages all aspect of Affiliation data.
@@ -87,19 +104,25 @@ class Affiliation:
         data = Affiliation.find_affiliations_by_org_id(org_id)
 
         # 3806 : Filter out the NR affiliation if there is IA affiliation for the same NR.
-        nr_number_name_dict = {
-            d["business_identifier"]: d["name"] for d in data if d["corp_type"]["code"] == CorpType.NR.value
-        }
+        nr_number_name_dict = {}
+        tmp_business_names = set()
+        for d in data:
+            if (code := d["corp_type"]["code"]) == CorpType.NR.value:
+                nr_number_name_dict[d["business_identifier"]] = d["name"]
+            elif code in TEMP_CORP_TYPES:
+                tmp_business_names.add(d["name"])
         nr_numbers = nr_number_name_dict.keys()
-        filtered_affiliations = Affiliation.filter_affiliations(data, nr_numbers, nr_number_name_dict)
+        filtered_affiliations = Affiliation.filter_affiliations(
+            data, nr_numbers, nr_number_name_dict, tmp_business_names
+        )
         current_app.logger.debug(">find_visible_affiliations_by_org_id")
         return filtered_affiliations
 
     @staticmethod
-    def filter_affiliations(data, nr_numbers, nr_number_name_dict: dict):
-        """Filter affiliations."""
-        temp_types = {CorpType.TMP.value, CorpType.ATMP.value, CorpType.CTMP.value, CorpType.RTMP.value}
-        tmp_business_list = {d["name"] for d in data if d["corp_type"]["code"] in temp_types}
+    def filter_affiliations(data, nr_numbers, nr_number_name_dict: dict, tmp_business_names: set = None):
+        """Filter affiliations, tmp_business_names is computed from data when the caller has not collected it."""
+        if tmp_business_names is None:
+            tmp_business_names = {d["name"] for d in data if d["corp_type"]["code"] in TEMP_CORP_TYPES}
         filtered_affiliations = []
 
         for entity in data:
@@ -107,10 +130,10 @@ class Affiliation:
             name = entity["name"]
             identifier = entity["business_identifier"]
 
-            if code == CorpType.NR.value and identifier in tmp_business_list:
+            if code == CorpType.NR.value and identifier in tmp_business_names:
                 continue
 
-            if code in temp_types:
+            if code in TEMP_CORP_TYPES:
                 # Only include if named company IA or numbered company
                 # Skip temp unless it's a numbered company or matches NR
                 if name not in nr_numbers and name != identifier:
@@ -126,22 +149,31 @@ class Affiliation:
     def find_affiliations_by_org_id(org_id):
         """Return business affiliations for the org."""
         # Accomplished in service instead of model (easier to avoid circular reference issues).
+        # The affiliation join already restricts entities to the org, selectinload fetches the related rows with one
+        # IN query each instead of re-running the whole join per relationship.
         entities = (
             db.session.query(Entity)
             .join(AffiliationModel)
             .options(
                 contains_eager(Entity.affiliations),
-                subqueryload(Entity.contacts).subqueryload(ContactLink.contact),
-                subqueryload(Entity.created_by),
-                subqueryload(Entity.modified_by),
-            )
-            .filter(
-                AffiliationModel.org_id == int(org_id or -1),
-                Entity.affiliations.any(AffiliationModel.org_id == int(org_id or -1)),
+                selectinload(Entity.contacts).selectinload(ContactLink.contact),
+                selectinload(Entity.created_by),
+                selectinload(Entity.modified_by),
             )
+            .filter(AffiliationModel.org_id == int(org_id or -1))
         )
         entities = entities.order_by(AffiliationModel.created.desc()).all()
-        return [EntityService(entity).as_dict() for entity in entities]
+        return EntitySchema().dump(entities, many=True)
+
+    @staticmethod
+    def find_affiliated_identifiers_by_org_id(org_id) -> List[str]:
+        """Return the business identifiers affiliated with the org, newest affiliation first, for internal callers."""
+        return db.session.scalars(
+            select(Entity.business_identifier)
+            .join(AffiliationModel, AffiliationModel.entity_id == Entity.id)
+            .where(AffiliationModel.org_id == int(org_id or -1))
+            .order_by(AffiliationModel.created.desc())
+        ).all()
 
     @staticmethod
     def find_affiliation(org_id, business_identifier):
@@ -412,6 +444,65 @@ class Affiliation:
 
         publish_affiliation_event(QueueMessageTypes.BUSINESS_UNAFFILIATED.value, org_id, entity.business_identifier)
 
+    @staticmethod
+    def delete_affiliations_for_org(org_id: int) -> List[Entity]:
+        """Delete every affiliation of the org and reset the passcodes of its entities, without committing.
+
+        Set based counterpart of delete_affiliation used when the org itself is deleted. Affiliations, their entities
+        and invitations are loaded with one query each and written in one flush, so versioning and the session
+        listeners still see every change. Returns the entities whose removal should be published, see
+        publish_affiliations_deleted.
+        """
+        affiliations = (
+            db.session.query(AffiliationModel)
+            .join(Entity, Entity.id == AffiliationModel.entity_id)
+            .options(contains_eager(AffiliationModel.entity))
+            .filter(AffiliationModel.org_id == int(org_id or -1))
+            .all()
+        )
+        if not affiliations:
+            return []
+        affiliation_ids = [affiliation.id for affiliation in affiliations]
+        for affiliation_invitation in AffiliationInvitationModel.query.filter(
+            AffiliationInvitationModel.affiliation_id.in_(affiliation_ids)
+        ):
+            db.session.delete(affiliation_invitation)
+        db.session.flush()
+
+        entities = [affiliation.entity for affiliation in affiliations]
+        new_pass_codes = ["".join(secrets.choice(string.digits) for _ in range(9)) for _ in entities]
+        for entity, pass_code in zip(entities, passcode_hashes(new_pass_codes)):
+            entity.pass_code = pass_code
+            entity.pass_code_claimed = False
+        for affiliation in affiliations:
+            db.session.delete(affiliation)
+        db.session.flush()
+        return [entity for entity in entities if entity.corp_type_code not in TEMP_CORP_TYPES]
+
+    @staticmethod
+    def publish_affiliations_deleted(org_id: int, entities: List[Entity], member_ids: List[int]):
+        """Publish the activity log entries and unaffiliated events of delete_affiliations_for_org."""
+        for entity in entities:
+            name_request = (
+                entity.status in [NRStatus.DRAFT.value, NRStatus.CONSUMED.value]
+                and entity.corp_type_code == CorpType.NR.value
+            ) or "NR " in entity.business_identifier
+            if not name_request:
+                ActivityLogPublisher.publish_activity(
+                    Activity(
+                        org_id,
+                        ActivityAction.REMOVE_AFFILIATION.value,
+                        name=entity.name or entity.business_identifier,
+                        id=entity.business_identifier,
+                    )
+                )
+        publish_affiliation_events(
+            QueueMessageTypes.BUSINESS_UNAFFILIATED.value,
+            org_id,
+            [entity.business_identifier for entity in entities],
+            member_ids,
+        )
+
     @staticmethod
     @user_context
     def fix_stale_affiliations(org_id: int, entity_details: Dict, **kwargs):
@@ -465,54 +556,143 @@ class Affiliation:
         ]
 
     @staticmethod
-    async def get_affiliation_details(
+    def get_affiliation_details(
         affiliation_bases: List[AffiliationBase],
         search_details: AffiliationSearchDetails,
         org_id,
         remove_stale_drafts,
-    ) -> List:
-        """Return affiliation details by calling the source api."""
-        url_identifiers = {}  # i.e. turns into { url: [identifiers...] }
+    ) -> Tuple[List, bool]:
+        """Return affiliation details by calling the source api, and whether some of the sources failed.
+
+        When only some of the sources fail, the details of the others are returned with degraded set. Only the
+        parallel POSTs run on the shared event loop, the token, cache and merge work stays on the calling thread.
+        """
         # Our pagination is already handled at the auth level when not doing a search.
         if not (search_details.status and search_details.name and search_details.type and search_details.identifier):
             search_details.page = 1
-        search_dict = asdict(search_details)
+        # Filters are applied by the sources, only unfiltered details can be served per identifier from the cache.
+        cacheable = not (
+            search_details.identifier or search_details.status or search_details.name or search_details.type
+        )
+        cached = get_cached_details(base.identifier for base in affiliation_bases) if cacheable else {}
+        bases_to_fetch = [base for base in affiliation_bases if base.identifier not in cached]
+        call_info, chunked = Affiliation._affiliation_details_call_info(bases_to_fetch, asdict(search_details))
+
+        try:
+            result = ParallelPostResult()
+            if call_info:
+                token = RestService.get_service_account_token(
+                    config_id="ENTITY_SVC_CLIENT_ID", config_secret="ENTITY_SVC_CLIENT_SECRET"
+                )
+                result = async_runner.run(RestService.post_in_parallel(call_info, token, org_id))
+            if result.failures and not result.responses and not cached:
+                raise ServiceUnavailableException(result.failures[0].error)
+            if result.degraded:
+                current_app.logger.warning(
+                    f"Returning partial affiliation details for ({org_id}), failed: "
+                    f"{[failure.url for failure in result.failures]}"
+                )
+            responses = result.responses
+            if cacheable and affiliation_details_cache_enabled():
+                responses = Affiliation._merge_cached_affiliation_details(result, cached, bases_to_fetch)
+            # Drafts only look stale when their NR is missing, which is always the case when namex failed.
+            combined = Affiliation._combine_affiliation_details(responses, remove_stale_drafts and not result.degraded)
+            Affiliation._sort_affiliation_details(combined, affiliation_bases)
+            if chunked:
+                # Every batch answers up to limit rows of its own, cut the merged rows down to the requested page.
+                start = (search_details.page - 1) * search_details.limit
+                combined = combined[start : start + search_details.limit]
+            Affiliation._handle_affiliation_debug(affiliation_bases, combined)
+            return combined, result.degraded
+        except ServiceUnavailableException as err:
+            current_app.logger.debug(err)
+            current_app.logger.debug("Failed to get affiliations details:  %s", affiliation_bases)
+            raise ServiceUnavailableException("Failed to get affiliation details") from err
+
+    @staticmethod
+    def _affiliation_details_call_info(
+        affiliation_bases: List[AffiliationBase], search_dict: Dict
+    ) -> Tuple[List[Dict], bool]:
+        """Build the calls to the source apis, splitting identifiers into batches of AFFILIATION_DETAILS_BATCH_SIZE.
+
+        Returns the calls and whether any source got more than one batch. Batches of a paginated search ask for
+        every row up to the requested page, the page itself is cut out once the batches are merged.
+        """
+        batch_size = max(current_app.config.get("AFFILIATION_DETAILS_BATCH_SIZE", 500), 1)
+        url_identifiers = {}  # i.e. turns into { url: [identifiers...] }
         for affiliation_base in affiliation_bases:
             url = Affiliation._affiliation_details_url(affiliation_base.identifier)
             url_identifiers.setdefault(url, []).append(affiliation_base.identifier)
+        chunked = any(len(identifiers) > batch_size for identifiers in url_identifiers.values())
+        if chunked and search_dict.get("page", 1) > 1:
+            search_dict = {**search_dict, "page": 1, "limit": search_dict["page"] * search_dict["limit"]}
         call_info = [
             {
                 "url": url,
                 "payload": {
-                    "identifiers": identifiers,
+                    "identifiers": identifiers[start : start + batch_size],
                     **search_dict,
                 },
             }
             for url, identifiers in url_identifiers.items()
+            for start in range(0, len(identifiers), batch_size)
         ]
+        return call_info, chunked
 
-        token = RestService.get_service_account_token(
-            config_id="ENTITY_SVC_CLIENT_ID", config_secret="ENTITY_SVC_CLIENT_SECRET"
-        )
-        try:
-            responses = await RestService.call_posts_in_parallel(call_info, token, org_id)
-            combined = Affiliation._combine_affiliation_details(responses, remove_stale_drafts)
-            ordered = {
-                affiliation.identifier: affiliation.created
-                for affiliation in sorted(affiliation_bases, key=lambda x: x.created, reverse=True)
-            }
+    @staticmethod
+    def _merge_cached_affiliation_details(
+        result: ParallelPostResult, cached: Dict[str, Dict], bases_to_fetch: List[AffiliationBase]
+    ) -> List:
+        """Cache the fetched details and return source shaped responses of the cached and fetched details."""
+        fetched = Affiliation._split_affiliation_details(result.responses)
+        # Identifiers of a failed source were not answered, only remember misses when every source answered.
+        if not result.degraded:
+            requested = {base.identifier for base in bases_to_fetch}
+            fetched.update({identifier: MISSING for identifier in requested - fetched.keys()})
+        cache_details(fetched)
+        return Affiliation._join_affiliation_details({**cached, **fetched})
 
-            def sort_key(item):
-                identifier = item.get("identifier", item.get("nameRequest", {}).get("nrNum", ""))
-                return ordered.get(identifier, datetime.datetime.min)
+    @staticmethod
+    def _sort_affiliation_details(combined: List, affiliation_bases: List[AffiliationBase]):
+        """Sort the combined details in place, newest affiliation first and affiliations without a date last."""
+        ordered = {
+            affiliation.identifier: affiliation.created or datetime.datetime.min
+            for affiliation in sorted(affiliation_bases, key=lambda x: x.created or datetime.datetime.min, reverse=True)
+        }
 
-            combined.sort(key=sort_key, reverse=True)
-            Affiliation._handle_affiliation_debug(affiliation_bases, combined)
-            return combined
-        except ServiceUnavailableException as err:
-            current_app.logger.debug(err)
-            current_app.logger.debug("Failed to get affiliations details:  %s", affiliation_bases)
-            raise ServiceUnavailableException("Failed to get affiliation details") from err
+        def sort_key(item):
+            identifier = item.get("identifier", item.get("nameRequest", {}).get("nrNum", ""))
+            return ordered.get(identifier, datetime.datetime.min)
+
+        combined.sort(key=sort_key, reverse=True)
+
+    @staticmethod
+    def _split_affiliation_details(responses: List) -> Dict[str, Dict]:
+        """Split source responses into cache entries keyed by identifier."""
+        entries = {}
+        for data in responses:
+            if isinstance(data, list):
+                for name_request in data:
+                    entries[name_request["nrNum"]] = {"kind": "nameRequest", "details": name_request}
+                continue
+            for kind in ("businessEntities", "draftEntities"):
+                for details in data.get(kind, []):
+                    entries[details["identifier"]] = {"kind": kind, "details": details}
+        return entries
+
+    @staticmethod
+    def _join_affiliation_details(entries: Dict[str, Dict]) -> List:
+        """Rebuild source shaped responses from cache entries."""
+        entities = {"businessEntities": [], "draftEntities": []}
+        name_requests = []
+        for entry in entries.values():
+            if entry == MISSING:
+                continue
+            if entry["kind"] == "nameRequest":
+                name_requests.append(entry["details"])
+            else:
+                entities[entry["kind"]].append(entry["details"])
+        return [entities, name_requests]
 
     @staticmethod
     def _handle_affiliation_debug(affiliation_bases, combined):
@@ -544,10 +724,11 @@ class Affiliation:
                     # i.e. {'NR1234567': {...}}
                     name_requests[name_request["nrNum"]] = {"legalType": CorpType.NR.value, "nameRequest": name_request}
                 continue
+            # Batched calls return one response per batch, merge them in call order.
             if businesses_key in data:
-                businesses = list(data[businesses_key])
+                businesses.extend(data[businesses_key])
             if drafts_key in data:
-                drafts = data[drafts_key]
+                drafts.extend(data[drafts_key])
         return name_requests, businesses, drafts
 
     @staticmethod
@@ -561,27 +742,38 @@ class Affiliation:
         return business
 
     @staticmethod
-    def _process_nr_for_business(business, name_requests, drafts):
-        """Process NR for a business entity."""
+    def _process_nr_for_business(business, name_requests):
+        """Attach the NR to a business entity, return False when the NR is not part of the results."""
         nr_num = business["nrNumber"]
         if nr_num in name_requests:
-            business["nameRequest"] = name_requests[nr_num]["nameRequest"]
-            business = Affiliation._update_draft_type_for_amalgamation_nr(business)
-            if business["nameRequest"]["stateCd"] == NRStatus.CONSUMED.value:
-                drafts.remove(business)
-            del name_requests[nr_num]
+            business["nameRequest"] = name_requests.pop(nr_num)["nameRequest"]
+            Affiliation._update_draft_type_for_amalgamation_nr(business)
             return True
         return False
 
     @staticmethod
     def _combine_nrs(name_requests, businesses, drafts, remove_stale_drafts=True):
-        """Combine NRs with the business and draft entities."""
-        for business in drafts + businesses:
-            if "nrNumber" in business and business["nrNumber"]:
-                processed = Affiliation._process_nr_for_business(business, name_requests, drafts)
-                if not processed and remove_stale_drafts and business in drafts:
-                    drafts.remove(business)
-        return list(name_requests.values()) + drafts + businesses
+        """Combine NRs with the business and draft entities.
+
+        Drafts with a consumed NR, or with an NR missing from the results when remove_stale_drafts is set, are marked
+        for exclusion by index instead of being removed from the list, keeping the merge linear in the entity count.
+        """
+        excluded_drafts = set()
+        for index, draft in enumerate(drafts):
+            if not draft.get("nrNumber"):
+                continue
+            if Affiliation._process_nr_for_business(draft, name_requests):
+                if draft["nameRequest"]["stateCd"] == NRStatus.CONSUMED.value:
+                    excluded_drafts.add(index)
+            elif remove_stale_drafts:
+                excluded_drafts.add(index)
+        for business in businesses:
+            if business.get("nrNumber"):
+                Affiliation._process_nr_for_business(business, name_requests)
+        combined = list(name_requests.values())
+        combined.extend(draft for index, draft in enumerate(drafts) if index not in excluded_drafts)
+        combined.extend(businesses)
+        return combined
 
     @staticmethod
     def _combine_affiliation_details(details, remove_stale_drafts=True):
@@ -15,16 +15,92 @@
 
 This module is to handle authorization related queries.
 """
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 from flask import abort, current_app
 
 from auth_api.models.views.authorization import Authorization as AuthorizationView
 from auth_api.services.permissions import Permissions as PermissionsService
+from auth_api.utils.authorization_cache import get_authorization
 from auth_api.utils.enums import ProductTypeCode as ProductTypeCodeEnum
+from auth_api.utils.request_cache import RequestCache
 from auth_api.utils.roles import STAFF, Role
 from auth_api.utils.user_context import UserContext, user_context
 
+# Per request memo of authorizations_view lookups, keyed by (lookup, sub, org_id, business_identifier, product_code).
+authorization_cache = RequestCache("authorizations", clear_on_flush=True)
+
+
+def _lookup_key(lookup: str, sub=None, org_id=None, business_identifier=None, product_code=None) -> tuple:
+    """Return the cache key of an authorization lookup."""
+    return (lookup, str(sub) if sub else None, str(org_id) if org_id else None, business_identifier, product_code)
+
+
+def _find_authorization(key: tuple, loader: Callable):
+    """Return the authorization view row, going through the request cache and then the shared cache."""
+    org_id = key[2]
+    return authorization_cache.get_or_load(key, lambda: get_authorization(key, org_id, loader))
+
+
+def _find_admin_authorization_by_org_id(org_id):
+    return _find_authorization(
+        _lookup_key("admin_by_org_id", org_id=org_id),
+        lambda: AuthorizationView.find_authorization_for_admin_by_org_id(org_id),
+    )
+
+
+def _find_user_authorization_by_org_id(keycloak_guid, org_id):
+    return _find_authorization(
+        _lookup_key("user_by_org_id", sub=keycloak_guid, org_id=org_id),
+        lambda: AuthorizationView.find_user_authorization_by_org_id(keycloak_guid, org_id),
+    )
+
+
+def _find_account_authorization_for_product(org_id, product_code: str):
+    return _find_authorization(
+        _lookup_key("account_by_product", org_id=org_id, product_code=product_code),
+        lambda: AuthorizationView.find_account_authorization_by_org_id_and_product(org_id, product_code),
+    )
+
+
+def _find_user_authorization_for_product(keycloak_guid, org_id, product_code: str):
+    return _find_authorization(
+        _lookup_key("user_by_product", sub=keycloak_guid, org_id=org_id, product_code=product_code),
+        lambda: AuthorizationView.find_account_authorization_by_org_id_and_product_for_user(
+            keycloak_guid, org_id, product_code
+        ),
+    )
+
+
+def _find_authorization_by_business_identifier(
+    business_identifier: str, keycloak_guid=None, org_id=None, is_staff: bool = None
+):
+    return _find_authorization(
+        _lookup_key(
+            "staff_by_business" if is_staff else "user_by_business",
+            sub=keycloak_guid,
+            org_id=org_id,
+            business_identifier=business_identifier,
+        ),
+        lambda: AuthorizationView.find_user_authorization_by_business_number(
+            business_identifier, keycloak_guid=keycloak_guid, org_id=org_id, is_staff=is_staff
+        ),
+    )
+
+
+def _find_authorization_by_business_identifier_and_product(business_identifier: str, product_code: str):
+    return _find_authorization(
+        _lookup_key("business_by_product", business_identifier=business_identifier, product_code=product_code),
+        lambda: AuthorizationView.find_user_authorization_by_business_number_and_product(
+            business_identifier, product_code
+        ),
+    )
+
+
+def authorization_cache_stats() -> Dict[str, int]:
+    """Return the hit and miss counters of the authorization cache for the current request."""
+    return authorization_cache.stats()
+
 
 class Authorization:
     """This module is to handle authorization related queries.
@@ -51,7 +127,7 @@ class Authorization:
         if any(role in [Role.STAFF.value, Role.EXTERNAL_STAFF_READONLY.value] for role in token_roles):
             if expanded:
                 # Query Authorization view by business identifier
-                auth = AuthorizationView.find_authorization_for_admin_by_org_id(account_id)
+                auth = _find_admin_authorization_by_org_id(account_id)
                 auth_response = Authorization(auth).as_dict(expanded)
             auth_response["roles"] = token_roles
 
@@ -62,18 +138,14 @@ class Authorization:
             check_product_based_auth = Authorization._is_product_based_auth(corp_type_code)
             if check_product_based_auth:
                 if account_id_claim:
-                    auth = AuthorizationView.find_account_authorization_by_org_id_and_product(
-                        account_id_claim, corp_type_code
-                    )
+                    auth = _find_account_authorization_for_product(account_id_claim, corp_type_code)
                 else:
-                    auth = AuthorizationView.find_account_authorization_by_org_id_and_product_for_user(
-                        keycloak_guid, account_id, corp_type_code
-                    )
+                    auth = _find_user_authorization_for_product(keycloak_guid, account_id, corp_type_code)
             else:
                 if account_id_claim and account_id == int(account_id_claim):
-                    auth = AuthorizationView.find_authorization_for_admin_by_org_id(account_id_claim)
+                    auth = _find_admin_authorization_by_org_id(account_id_claim)
                 elif account_id and keycloak_guid:
-                    auth = AuthorizationView.find_user_authorization_by_org_id(keycloak_guid, account_id)
+                    auth = _find_user_authorization_by_org_id(keycloak_guid, account_id)
             auth_response["roles"] = []
             if auth:
                 permissions = PermissionsService.get_permissions_for_membership(auth.status_code, auth.org_membership)
@@ -94,7 +166,7 @@ class Authorization:
         if Role.STAFF.value in token_roles:
             if expanded:
                 # Query Authorization view by business identifier
-                auth = AuthorizationView.find_user_authorization_by_business_number(business_identifier, is_staff=True)
+                auth = _find_authorization_by_business_identifier(business_identifier, is_staff=True)
                 auth_response = Authorization(auth).as_dict(expanded)
             auth_response["roles"] = token_roles
 
@@ -102,7 +174,7 @@ class Authorization:
             # a service account in keycloak should have product_code claim setup.
             keycloak_product_code = user_from_context.token_info.get("product_code", None)
             if keycloak_product_code:
-                auth = AuthorizationView.find_user_authorization_by_business_number_and_product(
+                auth = _find_authorization_by_business_identifier_and_product(
                     business_identifier, keycloak_product_code
                 )
                 if auth:
@@ -114,7 +186,7 @@ class Authorization:
 
                 # Check if the user has access to the resource
                 if keycloak_guid := user_from_context.sub:
-                    auth = AuthorizationView.find_user_authorization_by_business_number(
+                    auth = _find_authorization_by_business_identifier(
                         business_identifier=business_identifier,
                         keycloak_guid=keycloak_guid,
                         org_id=user_from_context.account_id,
@@ -129,6 +201,66 @@ class Authorization:
 
         return auth_response
 
+    @staticmethod
+    @user_context
+    def get_user_authorizations_for_entities(business_identifiers: List[str], expanded: bool = False, **kwargs):
+        """Get User authorizations for many entities, keyed by business identifier.
+
+        Resolves every identifier with one authorizations_view query and applies the permissions in memory, each
+        value matches what get_user_authorizations_for_entity returns for that identifier.
+        """
+        user_from_context: UserContext = kwargs["user_context"]
+        token_roles = user_from_context.roles
+        if Role.STAFF.value in token_roles and not expanded:
+            return {identifier: {"roles": token_roles} for identifier in business_identifiers}
+        auths, membership_override = Authorization._find_authorizations_for_entities(
+            business_identifiers, user_from_context
+        )
+
+        first_auths = {}
+        for auth in auths:
+            first_auths.setdefault(auth.business_identifier, auth)
+
+        permissions_by_membership = {}
+        auth_responses = {}
+        for identifier in business_identifiers:
+            auth_response = {}
+            if auth := first_auths.get(identifier):
+                auth_response = Authorization(auth).as_dict(expanded)
+                if Role.STAFF.value in token_roles:
+                    auth_response["roles"] = token_roles
+                else:
+                    membership_key = (auth.status_code, membership_override or auth.org_membership)
+                    if membership_key not in permissions_by_membership:
+                        permissions_by_membership[membership_key] = PermissionsService.get_permissions_for_membership(
+                            *membership_key
+                        )
+                    auth_response["roles"] = permissions_by_membership[membership_key]
+            elif Role.STAFF.value in token_roles:
+                auth_response["roles"] = token_roles
+            auth_responses[identifier] = auth_response
+        return auth_responses
+
+    @staticmethod
+    def _find_authorizations_for_entities(business_identifiers: List[str], user_from_context: UserContext):
+        """Return the authorization rows of the entities for the caller, and the membership their roles come from."""
+        token_roles = user_from_context.roles
+        if Role.STAFF.value in token_roles:
+            return AuthorizationView.find_authorizations_by_business_numbers(business_identifiers, is_staff=True), None
+        if Role.SYSTEM.value in token_roles:
+            if keycloak_product_code := user_from_context.token_info.get("product_code", None):
+                auths = AuthorizationView.find_authorizations_by_business_numbers(
+                    business_identifiers, product_code=keycloak_product_code
+                )
+                return auths, "SYSTEM"
+            return [], None
+        if keycloak_guid := user_from_context.sub:
+            auths = AuthorizationView.find_authorizations_by_business_numbers(
+                business_identifiers, keycloak_guid=keycloak_guid, org_id=user_from_context.account_id
+            )
+            return auths, None
+        return [], None
+
     @staticmethod
     def get_user_authorizations(keycloak_guid: str):
         """Get all user authorizations."""
@@ -147,11 +279,9 @@ class Authorization:
         user_from_context: UserContext = kwargs["user_context"]
         account_id_claim = user_from_context.account_id
         if account_id_claim:
-            auth = AuthorizationView.find_account_authorization_by_org_id_and_product(account_id_claim, product_code)
+            auth = _find_account_authorization_for_product(account_id_claim, product_code)
         else:
-            auth = AuthorizationView.find_account_authorization_by_org_id_and_product_for_user(
-                user_from_context.sub, account_id, product_code
-            )
+            auth = _find_user_authorization_for_product(user_from_context.sub, account_id, product_code)
         auth_response = Authorization(auth).as_dict(expanded)
         auth_response["roles"] = []
         if auth:
@@ -207,7 +337,7 @@ def is_competent_authority(**kwargs) -> bool:
     if account_id is None:
         return False
 
-    authorization = AuthorizationView.find_account_authorization_by_org_id_and_product(account_id, "CA_SEARCH")
+    authorization = _find_account_authorization_for_product(account_id, "CA_SEARCH")
 
     return authorization is not None
 
@@ -247,9 +377,9 @@ def check_auth(**kwargs):
             if user_from_context.account_id_claim and int(user_from_context.account_id_claim) == kwargs.get(
                 "org_id", None
             ):
-                auth_record = AuthorizationView.find_authorization_for_admin_by_org_id(user_from_context.account_id)
+                auth_record = _find_admin_authorization_by_org_id(user_from_context.account_id)
             else:
-                auth_record = AuthorizationView.find_user_authorization_by_org_id(user_from_context.sub, org_identifier)
+                auth_record = _find_user_authorization_by_org_id(user_from_context.sub, org_identifier)
             auth = Authorization(auth_record).as_dict() if auth_record else None
 
         _check_for_roles(auth.get("orgMembership", None) if auth else None, kwargs)
@@ -12,16 +12,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service for managing the documents."""
+from itertools import chain
+from typing import Dict, Iterable, List
 
+from flask import current_app
 from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from auth_api.config import get_named_config
 from auth_api.models import Documents as DocumentsModel
 from auth_api.schemas import DocumentSchema
+from auth_api.utils.cache import cache
 
 ENV = Environment(loader=FileSystemLoader("."), autoescape=True)
 CONFIG = get_named_config()
 
+_NOT_FOUND = "NOT_FOUND"
+_PENDING_DOCUMENT_TYPES = "documents_cache_types"
+
+
+def _latest_version_key(document_type: str) -> str:
+    return f"documents:latest_version:{document_type}"
+
 
 class Documents:
     """Manages the documents in DB.
@@ -45,7 +58,8 @@ class Documents:
     @classmethod
     def fetch_latest_document(cls, document_type):
         """Get a document type by the given document type."""
-        doc = DocumentsModel.fetch_latest_document_by_type(file_type=document_type)
+        version = cls.find_latest_version_by_type(document_type)
+        doc = DocumentsModel.find_by_id(version) if version else None
         if doc:
             return Documents(doc)
         return None
@@ -53,4 +67,59 @@ class Documents:
     @staticmethod
     def find_latest_version_by_type(document_type):
         """Get the latest version for the given document type."""
-        return DocumentsModel.find_latest_version_by_type(file_type=document_type)
+        return Documents.find_latest_versions_by_types([document_type]).get(document_type)
+
+    @staticmethod
+    def find_latest_versions_by_types(document_types: List[str]) -> Dict[str, str]:
+        """Get the latest version of each document type, cached for DOCUMENTS_CACHE_TIMEOUT seconds when set.
+
+        Types without any document are left out of the result.
+        """
+        if not (timeout := current_app.config.get("DOCUMENTS_CACHE_TIMEOUT", 0)):
+            return DocumentsModel.find_latest_versions_by_types(list(dict.fromkeys(document_types)))
+        keys = {document_type: _latest_version_key(document_type) for document_type in dict.fromkeys(document_types)}
+        cached = dict(zip(keys, cache.get_many(*keys.values()))) if keys else {}
+        if missing := [document_type for document_type, version in cached.items() if version is None]:
+            loaded = DocumentsModel.find_latest_versions_by_types(missing)
+            cache.set_many(
+                {keys[document_type]: loaded.get(document_type, _NOT_FOUND) for document_type in missing},
+                timeout=timeout,
+            )
+            cached.update(loaded)
+        return {
+            document_type: version
+            for document_type, version in cached.items()
+            if version is not None and version != _NOT_FOUND
+        }
+
+    @staticmethod
+    def invalidate_latest_versions(document_types: Iterable[str]):
+        """Drop the cached latest versions of the document types."""
+        if keys := [_latest_version_key(document_type) for document_type in set(document_types)]:
+            cache.delete_many(*keys)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_after_flush(session, flush_context):  # pylint: disable=unused-argument
+    """Invalidate the cached versions of changed document types and again once the transaction commits."""
+    if document_types := {
+        instance.type
+        for instance in chain(session.new, session.dirty, session.deleted)
+        if isinstance(instance, DocumentsModel)
+    }:
+        Documents.invalidate_latest_versions(document_types)
+        session.info.setdefault(_PENDING_DOCUMENT_TYPES, set()).update(document_types)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    """Invalidate again once committed, dropping anything read before the commit was visible."""
+    if document_types := session.info.pop(_PENDING_DOCUMENT_TYPES, None):
+        Documents.invalidate_latest_versions(document_types)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    """Forget pending document types of a rolled back transaction."""
+    if not session.in_transaction():
+        session.info.pop(_PENDING_DOCUMENT_TYPES, None)
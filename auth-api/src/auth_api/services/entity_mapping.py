@@ -12,16 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service for managing Affiliation Mapping data."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
 from flask import current_app
 from requests import HTTPError
-from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy import and_, case, func, literal, or_, select, tuple_
 from sqlalchemy.dialects.postgresql import array
 
+from auth_api.exceptions import BusinessException
+from auth_api.exceptions.errors import Error
 from auth_api.models import db
 from auth_api.models.affiliation import Affiliation as AffiliationModel
 from auth_api.models.dataclass import AffiliationBase, AffiliationSearchDetails
 from auth_api.models.entity import Entity
 from auth_api.models.entity_mapping import EntityMapping
+from auth_api.models.org_affiliation_row import OrgAffiliationRow
 from auth_api.services.rest_service import RestService
 from auth_api.utils.user_context import UserContext, user_context
 
@@ -52,9 +61,63 @@ class EntityMappingService:
             - but if this bad data shows up Org 1 would have business, Org 2 would have NR (without affiliation)
             - EG. For Temp Org 1, NR Org2
             - Temp would show on Org 1, NR would show on Org2
+
+        Rows are ordered by (created_on, identifiers) descending, rows without created_on last. When a cursor from a
+        previous page is passed the page starts right after the row it points at instead of at an offset. With
+        AFFILIATION_ROWS_ENABLED the rows are read from the precomputed org_affiliation_rows and the cursor bound is
+        served by its (org_id, created_on, identifiers) index, so deep pages only read the rows they return. Without it
+        every search still computes all rows of the org (the row_number() window sits below the bound), the cursor only
+        spares the offset skip.
         """
         org_id = int(org_id or -1)
+        if current_app.config.get("AFFILIATION_ROWS_ENABLED"):
+            rows = (
+                db.session.query(OrgAffiliationRow.identifiers, OrgAffiliationRow.created_on)
+                .filter(OrgAffiliationRow.org_id == org_id)
+                .subquery()
+            )
+        else:
+            rows = EntityMappingService.affiliation_rows_query(org_id).subquery()
+
+        query = db.session.query(rows.c.identifiers, rows.c.created_on).order_by(
+            rows.c.created_on.desc().nulls_last(), rows.c.identifiers.desc()
+        )
+        # For search we need all identifiers, the filtering is done in LEAR and NAMES.
+        if any([search_details.identifier, search_details.status, search_details.name, search_details.type]):
+            data = query.all()
+        elif search_details.cursor:
+            data = EntityMappingService._page_after_cursor(query, rows, search_details.cursor, search_details.limit + 1)
+        else:
+            data = query.offset((search_details.page - 1) * search_details.limit).limit(search_details.limit + 1).all()
+        return data[: search_details.limit], len(data) > search_details.limit
+
+    @staticmethod
+    def _page_after_cursor(query, rows, cursor: str, limit: int) -> List:
+        """Return up to limit rows of the ordered query following the row the cursor points at.
+
+        Rows without created_on sort last. After a dated row the dated rows are read first and the undated ones only
+        fill what is left of the page, keeping each query to a single range of the index.
+        """
+        created_on, identifiers = EntityMappingService._decode_cursor(cursor)
+        identifiers_bound = literal(identifiers, db.ARRAY(db.String))
+        undated = query.filter(rows.c.created_on.is_(None))
+        if created_on is None:
+            return undated.filter(rows.c.identifiers < identifiers_bound).limit(limit).all()
+        data = (
+            query.filter(tuple_(rows.c.created_on, rows.c.identifiers) < tuple_(literal(created_on), identifiers_bound))
+            .limit(limit)
+            .all()
+        )
+        if len(data) < limit:
+            data += undated.limit(limit - len(data)).all()
+        return data
 
+    @staticmethod
+    def affiliation_rows_query(org_id: int):
+        """Return a query of the (identifiers, created_on) rows displayed for the org, unordered.
+
+        Applies the priority and pairing rules described in paginate_from_affiliations.
+        """
         affiliated_identifiers_cte = (
             db.session.query(Entity.business_identifier)
             .join(AffiliationModel, AffiliationModel.entity_id == Entity.id)
@@ -168,21 +231,38 @@ class EntityMappingService:
             )
         ).subquery()
 
-        query = (
-            db.session.query(subq.c.identifiers, subq.c.created_on)
-            .filter(subq.c.row_number == 1)
-            .order_by(subq.c.created_on.desc())
-        )
-        # For search we need all identifiers, the filtering is done in LEAR and NAMES.
-        if not any([search_details.identifier, search_details.status, search_details.name, search_details.type]):
-            query = query.offset((search_details.page - 1) * search_details.limit).limit(search_details.limit + 1)
+        return db.session.query(subq.c.identifiers, subq.c.created_on).filter(subq.c.row_number == 1)
 
-        data = query.all()
-        return data[: search_details.limit], len(data) > search_details.limit
+    @staticmethod
+    def _encode_cursor(identifiers: List[str], created_on: Optional[datetime]) -> str:
+        """Return an opaque cursor pointing at the row with the identifiers and created_on, which may be None."""
+        payload = json.dumps([created_on and created_on.isoformat(), identifiers], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], List[str]]:
+        """Return the created_on and identifiers of the row the cursor points at."""
+        try:
+            created_on, identifiers = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_on = None if created_on is None else datetime.fromisoformat(created_on)
+            return created_on, [str(identifier) for identifier in identifiers]
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise BusinessException(Error.INVALID_INPUT, e) from e
+
+    @staticmethod
+    def next_cursor(data: List, has_more: bool) -> Optional[str]:
+        """Return the cursor of the page following data, None on the last page."""
+        if not has_more or not data:
+            return None
+        identifiers, created_on = data[-1]
+        return EntityMappingService._encode_cursor(identifiers, created_on)
 
     @staticmethod
     def populate_affiliation_base(org_id: int, search_details: AffiliationSearchDetails):
-        """Get entity details from the database and expand multiple identifiers into separate rows."""
+        """Get entity details from the database and expand multiple identifiers into separate rows.
+
+        Returns the affiliation bases, whether more rows follow and the cursor of the next page.
+        """
         data, has_more = EntityMappingService.paginate_from_affiliations(org_id, search_details)
 
         affiliation_bases = [
@@ -203,7 +283,7 @@ class EntityMappingService:
             current_app.logger.debug(f"NR identifiers ({len(nr_identifiers)}): {', '.join(nr_identifiers)}")
             current_app.logger.debug(f"Other identifiers ({len(other_identifiers)}): {', '.join(other_identifiers)}")
 
-        return affiliation_bases, has_more
+        return affiliation_bases, has_more, EntityMappingService.next_cursor(data, has_more)
 
     @staticmethod
     def _is_duplicate_mapping(nr_identifier: str, bootstrap_identifier: str, business_identifier: str) -> bool:
@@ -15,8 +15,9 @@
 
 import asyncio
 import json
+from http import HTTPStatus
 from string import Template
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import aiohttp
 import requests
@@ -24,7 +25,8 @@ from flask import current_app
 
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
-from auth_api.models.dataclass import KeycloakGroupSubscription
+from auth_api.models.dataclass import KeycloakGroupSubscription, KeycloakGroupSyncReport
+from auth_api.utils.async_runner import async_runner
 from auth_api.utils.constants import (
     GROUP_ACCOUNT_HOLDERS,
     GROUP_ANONYMOUS_USERS,
@@ -32,13 +34,22 @@ from auth_api.utils.constants import (
     GROUP_PUBLIC_USERS,
 )
 from auth_api.utils.enums import ContentType, KeycloakGroupActions, LoginSource
+from auth_api.utils.http_session import http_sessions
+from auth_api.utils.keycloak_group_directory import KeycloakGroupDirectory
 from auth_api.utils.roles import Role
+from auth_api.utils.token_manager import TokenManager
 from auth_api.utils.user_context import UserContext, user_context
 
+from .keycloak_group_sync import KeycloakGroupSync
 from .keycloak_user import KeycloakUser
 
+admin_tokens = TokenManager("keycloak_admin")
+keycloak_groups = KeycloakGroupDirectory("keycloak")
 
-class KeycloakService:
+GROUPS_PAGE_SIZE = 100
+
+
+class KeycloakService:  # pylint: disable=too-many-public-methods
     """For Keycloak services."""
 
     @staticmethod
@@ -50,7 +61,6 @@ class KeycloakService:
 
         base_url = config.get("KEYCLOAK_BCROS_BASE_URL")
         realm = config.get("KEYCLOAK_BCROS_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
 
         # Check if the user exists
         if return_if_exists or throw_error_if_exists:
@@ -60,10 +70,8 @@ class KeycloakService:
                     return existing_user
                 raise BusinessException(Error.USER_ALREADY_EXISTS_IN_KEYCLOAK, None)
         # Add user to the keycloak group '$group_name'
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-
         add_user_url = f"{base_url}/auth/admin/realms/{realm}/users"
-        response = requests.post(add_user_url, data=user.value(), headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("POST", add_user_url, admin_token, upstream=True, data=user.value())
         response.raise_for_status()
 
         return KeycloakService.get_user_by_username(user.user_name, admin_token)
@@ -77,15 +85,12 @@ class KeycloakService:
 
         base_url = config.get("KEYCLOAK_BCROS_BASE_URL")
         realm = config.get("KEYCLOAK_BCROS_REALMNAME")
-        timeout = current_app.config.get("CONNECT_TIMEOUT", 60)
 
         existing_user = KeycloakService.get_user_by_username(user.user_name, admin_token=admin_token)
         if not existing_user:
             raise BusinessException(Error.DATA_NOT_FOUND, None)
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-
         update_user_url = f"{base_url}/auth/admin/realms/{realm}/users/{existing_user.id}"
-        response = requests.put(update_user_url, data=user.value(), headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("PUT", update_user_url, admin_token, upstream=True, data=user.value())
         response.raise_for_status()
 
         return KeycloakService.get_user_by_username(user.user_name, admin_token)
@@ -96,22 +101,90 @@ class KeycloakService:
         user = None
         base_url = current_app.config.get("KEYCLOAK_BCROS_BASE_URL")
         realm = current_app.config.get("KEYCLOAK_BCROS_REALMNAME")
-        timeout = current_app.config.get("CONNECT_TIMEOUT", 60)
         if not admin_token:
             admin_token = KeycloakService._get_admin_token(upstream=True)
 
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-
         # Get the user and return
         query_user_url = Template(f"{base_url}/auth/admin/realms/{realm}/users?username=$username").substitute(
             username=username
         )
-        response = requests.get(query_user_url, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("GET", query_user_url, admin_token, upstream=True)
         response.raise_for_status()
         if len(response.json()) == 1:
             user = KeycloakUser(response.json()[0])
         return user
 
+    @staticmethod
+    def get_users_by_usernames(usernames: List[str]) -> Dict[str, KeycloakUser]:
+        """Get users from Keycloak by username concurrently, usernames without a single match are left out."""
+        if not usernames:
+            return {}
+        results = KeycloakService._run_bcros_user_calls(usernames, False)
+        if errors := [result for result in results if isinstance(result, Exception)]:
+            raise errors[0]
+        return {username: user for username, user in zip(usernames, results) if user}
+
+    @staticmethod
+    def add_users(users: List[KeycloakUser]) -> List:
+        """Add users to Keycloak concurrently, failing like add_user with throw_error_if_exists for existing users.
+
+        Returns the added KeycloakUser or the exception raised for each user, in the order of the users.
+        """
+        if not users:
+            return []
+        return KeycloakService._run_bcros_user_calls(users, True)
+
+    @staticmethod
+    def _run_bcros_user_calls(items: List, add: bool) -> List:
+        """Run the BCROS user calls, calls keycloak rejected the admin token for are run once more with a new one."""
+        admin_token = KeycloakService._get_admin_token(upstream=True)
+        results = async_runner.run(KeycloakService._bcros_user_calls(items, add, admin_token))
+        rejected = [
+            index
+            for index, result in enumerate(results)
+            if isinstance(result, aiohttp.ClientResponseError) and result.status == HTTPStatus.UNAUTHORIZED
+        ]
+        if rejected:
+            admin_tokens.invalidate(KeycloakService._admin_token_slot(upstream=True), admin_token)
+            admin_token = KeycloakService._get_admin_token(upstream=True)
+            retried = async_runner.run(
+                KeycloakService._bcros_user_calls([items[index] for index in rejected], add, admin_token)
+            )
+            for index, result in zip(rejected, retried):
+                results[index] = result
+        return results
+
+    @staticmethod
+    async def _bcros_user_calls(items: List, add: bool, admin_token: str) -> List:
+        """Find (usernames) or add (KeycloakUsers) BCROS users, at most KEYCLOAK_USER_CONCURRENCY at a time."""
+        config = current_app.config
+        base_url = config.get("KEYCLOAK_BCROS_BASE_URL")
+        realm = config.get("KEYCLOAK_BCROS_REALMNAME")
+        timeout = config.get("CONNECT_TIMEOUT", 60)
+        users_url = f"{base_url}/auth/admin/realms/{realm}/users"
+        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
+        semaphore = asyncio.Semaphore(config.get("KEYCLOAK_USER_CONCURRENCY", 10))
+        session = await async_runner.client_session("keycloak", limit=40)
+
+        async def find(username: str) -> KeycloakUser:
+            async with session.get(users_url, params={"username": username}, headers=headers, timeout=timeout) as r:
+                r.raise_for_status()
+                found = await r.json()
+            return KeycloakUser(found[0]) if len(found) == 1 else None
+
+        async def add_user(user: KeycloakUser) -> KeycloakUser:
+            if await find(user.user_name):
+                raise BusinessException(Error.USER_ALREADY_EXISTS_IN_KEYCLOAK, None)
+            async with session.post(users_url, data=user.value(), headers=headers, timeout=timeout) as r:
+                r.raise_for_status()
+            return await find(user.user_name)
+
+        async def call(item):
+            async with semaphore:
+                return await (add_user(item) if add else find(item))
+
+        return await asyncio.gather(*[call(item) for item in items], return_exceptions=True)
+
     @staticmethod
     def get_user_groups(user_id, upstream: bool = False) -> KeycloakUser:
         """Get user from Keycloak by username."""
@@ -125,13 +198,11 @@ class KeycloakService:
             if upstream
             else current_app.config.get("KEYCLOAK_REALMNAME")
         )
-        timeout = current_app.config.get("CONNECT_TIMEOUT", 60)
         admin_token = KeycloakService._get_admin_token(upstream=upstream)
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
 
         # Get the user and return
         query_user_url = f"{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups"
-        response = requests.get(query_user_url, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("GET", query_user_url, admin_token, upstream=upstream)
         response.raise_for_status()
         return response.json()
 
@@ -139,11 +210,9 @@ class KeycloakService:
     def delete_user_by_username(username):
         """Delete user from Keycloak by username."""
         admin_token = KeycloakService._get_admin_token(upstream=True)
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
 
         base_url = current_app.config.get("KEYCLOAK_BCROS_BASE_URL")
         realm = current_app.config.get("KEYCLOAK_BCROS_REALMNAME")
-        timeout = current_app.config.get("CONNECT_TIMEOUT", 60)
         user = KeycloakService.get_user_by_username(username)
 
         if not user:
@@ -151,7 +220,7 @@ class KeycloakService:
 
         # Delete the user
         delete_user_url = f"{base_url}/auth/admin/realms/{realm}/users/{user.id}"
-        response = requests.delete(delete_user_url, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("DELETE", delete_user_url, admin_token, upstream=True)
         response.raise_for_status()
 
     @staticmethod
@@ -165,11 +234,11 @@ class KeycloakService:
                 f"&client_secret={current_app.config.get('JWT_OIDC_CLIENT_SECRET')}"
                 f"&username={username}&password={password}&grant_type=password"
             )
-            timeout = current_app.config.get("CONNECT_TIMEOUT", 60)
+            timeout = http_sessions.timeout()
 
             headers = {"Content-Type": "application/x-www-form-urlencoded"}
             token_url = f"{base_url}/auth/realms/{realm}/protocol/openid-connect/token"
-            response = requests.post(token_url, data=token_request, headers=headers, timeout=timeout)
+            response = http_sessions.session().post(token_url, data=token_request, headers=headers, timeout=timeout)
 
             response.raise_for_status()
             return response.json()
@@ -232,6 +301,29 @@ class KeycloakService:
                     f"Error removing user {user_from_context.sub} from account holders group: {err}"
                 )
 
+    @staticmethod
+    @user_context
+    def remove_users_from_account_holders_group(keycloak_guids: List[str], **kwargs):
+        """Remove the users from the account holders group concurrently, like remove_from_account_holders_group."""
+        user_from_context: UserContext = kwargs["user_context"]
+        if not keycloak_guids or Role.ACCOUNT_HOLDER.value not in user_from_context.roles:
+            return
+        kgs = [
+            KeycloakGroupSubscription(
+                user_guid=keycloak_guid,
+                product_code=None,
+                group_name=GROUP_ACCOUNT_HOLDERS,
+                group_action=KeycloakGroupActions.REMOVE_FROM_GROUP.value,
+            )
+            for keycloak_guid in keycloak_guids
+        ]
+        try:
+            admin_token = KeycloakService._get_admin_token()
+            group_ids = KeycloakService._get_group_ids(admin_token, kgs)
+            async_runner.run(KeycloakService.add_or_remove_users_from_group(kgs, admin_token, group_ids))
+        except Exception as err:  # NOQA # pylint: disable=broad-except
+            current_app.logger.error(f"Error removing {len(kgs)} users from account holders group: {err}")
+
     @staticmethod
     @user_context
     def reset_otp(keycloak_guid: str = None, **kwargs):
@@ -243,23 +335,47 @@ class KeycloakService:
         KeycloakService._reset_otp(keycloak_guid)
 
     @staticmethod
-    def add_or_remove_product_keycloak_groups(kgs: List[KeycloakGroupSubscription]):
-        """Call add_or_remove_users_from_group, by add to group then remove from group."""
-        add_groups = [kg for kg in kgs if kg.group_action == KeycloakGroupActions.ADD_TO_GROUP.value]
-        remove_groups = [kg for kg in kgs if kg.group_action == KeycloakGroupActions.REMOVE_FROM_GROUP.value]
-        for keycloak_group_subscription in add_groups + remove_groups:
+    def add_or_remove_product_keycloak_groups(kgs: List[KeycloakGroupSubscription]) -> KeycloakGroupSyncReport:
+        """Sync the product keycloak groups of the users, only memberships that differ are changed."""
+        for keycloak_group_subscription in kgs:
             current_app.logger.debug(
                 f"Action: {keycloak_group_subscription.group_action} "
                 f"Product: {keycloak_group_subscription.product_code} "
                 f"Keycloak Group: {keycloak_group_subscription.group_name} "
                 f"User guid: {keycloak_group_subscription.user_guid}"
             )
-        asyncio.run(KeycloakService.add_or_remove_users_from_group(add_groups))
-        asyncio.run(KeycloakService.add_or_remove_users_from_group(remove_groups))
+        if not kgs:
+            return KeycloakGroupSyncReport()
+        # Token and group ids are resolved here, the event loop is shared and only runs the membership calls.
+        admin_token = KeycloakService._get_admin_token()
+        group_ids = KeycloakService._get_group_ids(admin_token, kgs)
+        report = async_runner.run(KeycloakGroupSync(admin_token, group_ids).sync(kgs))
+        for user_guid, group_name, error in report.failed:
+            current_app.logger.error(f"Keycloak group sync failed for {user_guid} - {group_name}: {error}")
+        for group_name in report.missing_groups:
+            current_app.logger.error(f"Keycloak group {group_name} not found.")
+        current_app.logger.info(
+            f"Keycloak group sync: {len(report.added)} added, {len(report.removed)} removed, "
+            f"{report.unchanged} unchanged, {len(report.failed)} failed."
+        )
+        return report
 
     @staticmethod
-    async def add_or_remove_users_from_group(kgs: List[KeycloakGroupSubscription]):
-        """Asynchronously add/remove users from group - there can be upwards of 700+ users at once."""
+    def _get_group_ids(admin_token: str, kgs: List[KeycloakGroupSubscription]) -> Dict[str, str]:
+        """Return the ids of the groups of the subscriptions, keyed by group name."""
+        return {
+            group_name: KeycloakService._get_group_id(admin_token, group_name)
+            for group_name in {kg.group_name for kg in kgs}
+        }
+
+    @staticmethod
+    async def add_or_remove_users_from_group(
+        kgs: List[KeycloakGroupSubscription], admin_token: str = None, group_ids: Dict[str, str] = None
+    ):
+        """Asynchronously add/remove users from group - there can be upwards of 700+ users at once.
+
+        Callers on a request thread should pass the admin token and group ids, resolving them here blocks the loop.
+        """
         if not kgs:
             return
         config = current_app.config
@@ -269,37 +385,37 @@ class KeycloakService:
             config.get("CONNECT_TIMEOUT", 60),
         )
 
-        admin_token = KeycloakService._get_admin_token()
-        group_names = {kg.group_name for kg in kgs}
-        group_ids = {group_name: KeycloakService._get_group_id(admin_token, group_name) for group_name in group_names}
+        admin_token = admin_token or KeycloakService._get_admin_token()
+        group_ids = group_ids or KeycloakService._get_group_ids(admin_token, kgs)
         headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
 
         method = "PUT" if kgs[0].group_action == KeycloakGroupActions.ADD_TO_GROUP.value else "DELETE"
         # Normal limit is 100, cap this to 40, so it doesn't hit keycloak too aggressively.
-        connector = aiohttp.TCPConnector(limit=40)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            tasks = [
-                asyncio.create_task(
-                    session.request(
-                        method,
-                        f"{base_url}/auth/admin/realms/{realm}/users/"
-                        f"{kg.user_guid}/groups/{group_ids[kg.group_name]}",
-                        headers=headers,
-                        timeout=timeout,
-                    )
+        session = await async_runner.client_session("keycloak", limit=40)
+        tasks = [
+            asyncio.create_task(
+                session.request(
+                    method,
+                    f"{base_url}/auth/admin/realms/{realm}/users/{kg.user_guid}/groups/{group_ids[kg.group_name]}",
+                    headers=headers,
+                    timeout=timeout,
                 )
-                for kg in kgs
-            ]
-            tasks = await asyncio.gather(*tasks, return_exceptions=True)
-            for task in tasks:
-                if isinstance(task, aiohttp.ClientConnectionError):
-                    current_app.logger.error("Connection error")
-                elif isinstance(task, asyncio.TimeoutError):
-                    current_app.logger.error("Timeout error")
-                elif isinstance(task, Exception):
-                    current_app.logger.error(f"Exception: {task}")
-                elif task.status != 204:
+            )
+            for kg in kgs
+        ]
+        tasks = await asyncio.gather(*tasks, return_exceptions=True)
+        for task in tasks:
+            if isinstance(task, aiohttp.ClientConnectionError):
+                current_app.logger.error("Connection error")
+            elif isinstance(task, asyncio.TimeoutError):
+                current_app.logger.error("Timeout error")
+            elif isinstance(task, Exception):
+                current_app.logger.error(f"Exception: {task}")
+            else:
+                if task.status != 204:
                     current_app.logger.error(f"Returned non 204: {task.method} - {task.url} - {task.status}")
+                # The session is shared, hand the connection back to its pool.
+                task.release()
 
     @staticmethod
     def get_user_emails_with_role(role: str):
@@ -307,14 +423,11 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         admin_token = KeycloakService._get_admin_token()
 
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-
         users = []
         get_role_users = f"{base_url}/auth/admin/realms/{realm}/roles/{role}/users"
-        response = requests.get(get_role_users, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("GET", get_role_users, admin_token)
         if response.status_code == 404:
             raise BusinessException(Error.DATA_NOT_FOUND, None)
         response.raise_for_status()
@@ -328,16 +441,17 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         # Create an admin token
         admin_token = KeycloakService._get_admin_token()
         # Get the '$group_name' group
         group_id = KeycloakService._get_group_id(admin_token, group_name)
 
         # Add user to the keycloak group '$group_name'
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
         add_to_group_url = f"{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups/{group_id}"
-        response = requests.put(add_to_group_url, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("PUT", add_to_group_url, admin_token)
+        if response.status_code == 404:
+            # The group may have been recreated under a new id, load the group tree again next time.
+            keycloak_groups.invalidate(KeycloakService._groups_slot())
         response.raise_for_status()
 
     @staticmethod
@@ -346,50 +460,112 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         # Create an admin token
         admin_token = KeycloakService._get_admin_token()
         # Get the '$group_name' group
         group_id = KeycloakService._get_group_id(admin_token, group_name)
 
         # Remove user from keycloak group '$group_name'
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
         remove_group_url = f"{base_url}/auth/admin/realms/{realm}/users/{user_id}/groups/{group_id}"
-        response = requests.delete(remove_group_url, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("DELETE", remove_group_url, admin_token)
+        if response.status_code == 404:
+            # The group may have been recreated under a new id, load the group tree again next time.
+            keycloak_groups.invalidate(KeycloakService._groups_slot())
         response.raise_for_status()
 
     @staticmethod
     def _get_admin_token(upstream: bool = False):
-        """Create an admin token."""
+        """Return an admin token for the BCROS (upstream) or internal realm, reused until shortly before expiry."""
+        config = current_app.config
+        admin_client_id, token_url = KeycloakService._admin_client(upstream)
+        admin_secret = config.get("KEYCLOAK_BCROS_ADMIN_SECRET") if upstream else config.get("KEYCLOAK_ADMIN_SECRET")
+        timeout = http_sessions.timeout()
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        def fetch_token():
+            response = http_sessions.session().post(
+                token_url,
+                data=f"client_id={admin_client_id}&grant_type=client_credentials" f"&client_secret={admin_secret}",
+                headers=headers,
+                timeout=timeout,
+            )
+            return response.json()
+
+        return admin_tokens.get_token(KeycloakService._admin_token_slot(upstream), fetch_token)
+
+    @staticmethod
+    def _admin_client(upstream: bool = False) -> Tuple[str, str]:
+        """Return the admin client id and the token url of the BCROS (upstream) or internal realm."""
         config = current_app.config
         base_url = config.get("KEYCLOAK_BCROS_BASE_URL") if upstream else config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_BCROS_REALMNAME") if upstream else config.get("KEYCLOAK_REALMNAME")
         admin_client_id = (
             config.get("KEYCLOAK_BCROS_ADMIN_CLIENTID") if upstream else config.get("KEYCLOAK_ADMIN_USERNAME")
         )
-        admin_secret = config.get("KEYCLOAK_BCROS_ADMIN_SECRET") if upstream else config.get("KEYCLOAK_ADMIN_SECRET")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        token_url = f"{base_url}/auth/realms/{realm}/protocol/openid-connect/token"
+        return admin_client_id, f"{base_url}/auth/realms/{realm}/protocol/openid-connect/token"
 
-        response = requests.post(
-            token_url,
-            data=f"client_id={admin_client_id}&grant_type=client_credentials" f"&client_secret={admin_secret}",
-            headers=headers,
-            timeout=timeout,
-        )
-        return response.json().get("access_token")
+    @staticmethod
+    def _admin_token_slot(upstream: bool = False) -> str:
+        admin_client_id, token_url = KeycloakService._admin_client(upstream)
+        return f"{'bcros' if upstream else 'internal'}|{token_url}|{admin_client_id}"
+
+    @staticmethod
+    def _admin_request(method: str, url: str, admin_token: str, upstream: bool = False, **kwargs) -> requests.Response:
+        """Send a keycloak admin api request, sent once more with a new admin token when keycloak rejects the token."""
+        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
+        timeout = http_sessions.timeout()
+        response = http_sessions.session().request(method, url, headers=headers, timeout=timeout, **kwargs)
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
+            # Revoked or signed with rotated realm keys, the token is dropped unless it was replaced already.
+            admin_tokens.invalidate(KeycloakService._admin_token_slot(upstream), admin_token)
+            headers["Authorization"] = f"Bearer {KeycloakService._get_admin_token(upstream=upstream)}"
+            response = http_sessions.session().request(method, url, headers=headers, timeout=timeout, **kwargs)
+        return response
+
+    @staticmethod
+    def _groups_slot() -> str:
+        config = current_app.config
+        return f"{config.get('KEYCLOAK_BASE_URL')}|{config.get('KEYCLOAK_REALMNAME')}"
 
     @staticmethod
     def _get_group_id(admin_token: str, group_name: str):
-        """Get a group id for the group name."""
+        """Get a group id for the group name or path, from the group directory."""
+        # Subgroups left out of the group tree (newer keycloak versions page them) are still found by a search.
+        return keycloak_groups.group_id(
+            KeycloakService._groups_slot(),
+            group_name,
+            lambda: KeycloakService._get_groups(admin_token),
+            lambda: KeycloakService._search_group_id(admin_token, group_name),
+        )
+
+    @staticmethod
+    def _get_groups(admin_token: str) -> List[Dict]:
+        """Return the whole group tree of the realm."""
+        config = current_app.config
+        base_url = config.get("KEYCLOAK_BASE_URL")
+        realm = config.get("KEYCLOAK_REALMNAME")
+        groups, first = [], 0
+        while True:
+            response = KeycloakService._admin_request(
+                "GET",
+                f"{base_url}/auth/admin/realms/{realm}/groups",
+                admin_token,
+                params={"first": first, "max": GROUPS_PAGE_SIZE},
+            )
+            response.raise_for_status()
+            groups.extend(page := response.json())
+            if len(page) < GROUPS_PAGE_SIZE:
+                return groups
+            first += GROUPS_PAGE_SIZE
+
+    @staticmethod
+    def _search_group_id(admin_token: str, group_name: str):
+        """Get a group id for the group name with a group search."""
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         get_group_url = f"{base_url}/auth/admin/realms/{realm}/groups?search={group_name}"
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-        response = requests.get(get_group_url, headers=headers, timeout=timeout)
+        response = KeycloakService._admin_request("GET", get_group_url, admin_token)
         return KeycloakService._find_group_or_subgroup_id(response.json(), group_name)
 
     @staticmethod
@@ -408,24 +584,22 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         # Create an admin token
         admin_token = KeycloakService._get_admin_token()
 
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
         # step 1: add required action as configure otp
         configure_otp_url = f"{base_url}/auth/admin/realms/{realm}/users/{user_id}"
         input_data = json.dumps({"id": user_id, "requiredActions": ["CONFIGURE_TOTP"]})
 
-        response = requests.put(configure_otp_url, headers=headers, data=input_data, timeout=timeout)
+        response = KeycloakService._admin_request("PUT", configure_otp_url, admin_token, data=input_data)
 
         if response.status_code == 204:
             get_credentials_url = f"{base_url}/auth/admin/realms/{realm}/users/{user_id}/credentials"
-            response = requests.get(get_credentials_url, headers=headers, timeout=timeout)
+            response = KeycloakService._admin_request("GET", get_credentials_url, admin_token)
             for credential in response.json():
                 if credential["type"] == "otp":
                     delete_credential_url = f'{get_credentials_url}/{credential["id"]}'
-                    response = requests.delete(delete_credential_url, headers=headers, timeout=timeout)
+                    response = KeycloakService._admin_request("DELETE", delete_credential_url, admin_token)
         response.raise_for_status()
 
     @staticmethod
@@ -434,14 +608,11 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         admin_token = KeycloakService._get_admin_token()
 
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-
         create_client_url = f"{base_url}/auth/admin/realms/{realm}/clients"
-        response = requests.post(
-            create_client_url, data=json.dumps(client_representation), headers=headers, timeout=timeout
+        response = KeycloakService._admin_request(
+            "POST", create_client_url, admin_token, data=json.dumps(client_representation)
         )
         response.raise_for_status()
 
@@ -451,13 +622,9 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         admin_token = KeycloakService._get_admin_token()
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-        response = requests.get(
-            f"{base_url}/auth/admin/realms/{realm}/clients?clientId={client_name}",
-            headers=headers,
-            timeout=timeout,
+        response = KeycloakService._admin_request(
+            "GET", f"{base_url}/auth/admin/realms/{realm}/clients?clientId={client_name}", admin_token
         )
         response.raise_for_status()
         if len(response.json()) == 0:
@@ -471,13 +638,9 @@ class KeycloakService:
         config = current_app.config
         base_url = config.get("KEYCLOAK_BASE_URL")
         realm = config.get("KEYCLOAK_REALMNAME")
-        timeout = config.get("CONNECT_TIMEOUT", 60)
         admin_token = KeycloakService._get_admin_token()
-        headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
-        response = requests.get(
-            f"{base_url}/auth/admin/realms/{realm}/clients/{client_identifier}/service-account-user",
-            headers=headers,
-            timeout=timeout,
+        response = KeycloakService._admin_request(
+            "GET", f"{base_url}/auth/admin/realms/{realm}/clients/{client_identifier}/service-account-user", admin_token
         )
         response.raise_for_status()
         return response.json()
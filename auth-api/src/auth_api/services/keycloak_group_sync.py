@@ -0,0 +1,144 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Brings keycloak group memberships in line with product subscriptions, sending only the changes.
+
+The subscriptions are folded into the desired membership of every (user, group) pair, a removal wins over an
+addition of the same pair. Group ids are resolved by the caller before the sync runs on the event loop, the current
+groups of every user are read once and only the memberships that differ are added or removed. At most
+KEYCLOAK_GROUP_SYNC_CONCURRENCY calls are in flight.
+"""
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from flask import current_app
+
+from auth_api.models.dataclass import KeycloakGroupSubscription, KeycloakGroupSyncReport
+from auth_api.utils.async_runner import async_runner
+from auth_api.utils.enums import ContentType, KeycloakGroupActions
+
+USER_GROUPS_PAGE_SIZE = 100
+
+
+class KeycloakGroupSync:
+    """Computes and applies the minimal membership changes for a list of keycloak group subscriptions."""
+
+    def __init__(self, admin_token: str, group_ids: Dict[str, Optional[str]]):
+        """Return a sync for one run, group_ids maps the group names of the subscriptions to their ids."""
+        config = current_app.config
+        self.admin_url = f"{config.get('KEYCLOAK_BASE_URL')}/auth/admin/realms/{config.get('KEYCLOAK_REALMNAME')}"
+        self.headers = {"Content-Type": ContentType.JSON.value, "Authorization": f"Bearer {admin_token}"}
+        self.timeout = config.get("CONNECT_TIMEOUT", 60)
+        self.semaphore = asyncio.Semaphore(config.get("KEYCLOAK_GROUP_SYNC_CONCURRENCY", 20))
+        self.group_ids = group_ids
+
+    @staticmethod
+    def desired_memberships(kgs: List[KeycloakGroupSubscription]) -> Dict[Tuple[str, str], bool]:
+        """Return whether the user of each (user guid, group name) pair should be a member of the group."""
+        desired = {}
+        for kg in kgs:
+            key = (str(kg.user_guid), kg.group_name)
+            desired[key] = desired.get(key, True) and kg.group_action == KeycloakGroupActions.ADD_TO_GROUP.value
+        return desired
+
+    async def current_group_ids(self, session, user_guid: str) -> Set[str]:
+        """Return the ids of the groups the user is a direct member of."""
+        group_ids, first = set(), 0
+        while True:
+            async with self.semaphore:
+                async with session.get(
+                    f"{self.admin_url}/users/{user_guid}/groups",
+                    params={"first": first, "max": USER_GROUPS_PAGE_SIZE, "briefRepresentation": "true"},
+                    headers=self.headers,
+                    timeout=self.timeout,
+                ) as response:
+                    response.raise_for_status()
+                    groups = await response.json()
+            group_ids.update(group["id"] for group in groups)
+            if len(groups) < USER_GROUPS_PAGE_SIZE:
+                return group_ids
+            first += USER_GROUPS_PAGE_SIZE
+
+    async def apply(self, session, user_guid: str, group_id: str, member: bool):
+        """Add the user to or remove the user from the group."""
+        async with self.semaphore:
+            async with session.request(
+                "PUT" if member else "DELETE",
+                f"{self.admin_url}/users/{user_guid}/groups/{group_id}",
+                headers=self.headers,
+                timeout=self.timeout,
+            ) as response:
+                if response.status != 204:
+                    raise ValueError(f"Returned non 204: {response.method} - {response.url} - {response.status}")
+
+    def _resolve_memberships(
+        self, kgs: List[KeycloakGroupSubscription], report: KeycloakGroupSyncReport
+    ) -> Dict[str, Dict[str, Tuple[str, bool]]]:
+        """Return the desired memberships per user keyed by group id, reporting groups without an id as missing."""
+        memberships: Dict[str, Dict[str, Tuple[str, bool]]] = {}
+        for (user_guid, group_name), member in self.desired_memberships(kgs).items():
+            if (group_id := self.group_ids.get(group_name)) is None:
+                if group_name not in report.missing_groups:
+                    report.missing_groups.append(group_name)
+                continue
+            memberships.setdefault(user_guid, {})[group_id] = (group_name, member)
+        return memberships
+
+    async def _diff(
+        self, session, memberships: Dict[str, Dict[str, Tuple[str, bool]]], report: KeycloakGroupSyncReport
+    ) -> List[Tuple[str, str, str, bool]]:
+        """Return the (user guid, group id, group name, member) changes that differ from the current groups."""
+        user_guids = list(memberships)
+        current = await asyncio.gather(
+            *[self.current_group_ids(session, user_guid) for user_guid in user_guids], return_exceptions=True
+        )
+        changes = []
+        for user_guid, group_ids in zip(user_guids, current):
+            if isinstance(group_ids, Exception):
+                report.failed.extend(
+                    (user_guid, group_name, f"Reading groups failed: {group_ids}")
+                    for group_name, _ in memberships[user_guid].values()
+                )
+                continue
+            for group_id, (group_name, member) in memberships[user_guid].items():
+                if member == (group_id in group_ids):
+                    report.unchanged += 1
+                else:
+                    changes.append((user_guid, group_id, group_name, member))
+        return changes
+
+    async def _apply_changes(self, session, changes: List[Tuple[str, str, str, bool]], report: KeycloakGroupSyncReport):
+        """Apply the changes and report each one as added, removed or failed."""
+        results = await asyncio.gather(
+            *[self.apply(session, user_guid, group_id, member) for user_guid, group_id, _, member in changes],
+            return_exceptions=True,
+        )
+        for (user_guid, _, group_name, member), result in zip(changes, results):
+            if isinstance(result, Exception):
+                report.failed.append((user_guid, group_name, str(result) or type(result).__name__))
+            elif member:
+                report.added.append((user_guid, group_name))
+            else:
+                report.removed.append((user_guid, group_name))
+
+    async def sync(self, kgs: List[KeycloakGroupSubscription]) -> KeycloakGroupSyncReport:
+        """Apply the membership changes the subscriptions call for and report what changed."""
+        report = KeycloakGroupSyncReport()
+        if not (memberships := self._resolve_memberships(kgs, report)):
+            return report
+
+        # Normal limit is 100, cap this to 40, so it doesn't hit keycloak too aggressively.
+        session = await async_runner.client_session("keycloak", limit=40)
+        changes = await self._diff(session, memberships, report)
+        await self._apply_changes(session, changes, report)
+        return report
@@ -32,8 +32,9 @@ from auth_api.models import Membership as MembershipModel
 from auth_api.models import Org as OrgModel
 from auth_api.models import Task as TaskModel
 from auth_api.models import User as UserModel
+from auth_api.models import db
 from auth_api.models.affidavit import Affidavit as AffidavitModel
-from auth_api.models.dataclass import Activity, DeleteAffiliationRequest
+from auth_api.models.dataclass import Activity
 from auth_api.models.org import OrgSearch
 from auth_api.schemas import ContactSchema, InvitationSchema, MembershipSchema, OrgSchema
 from auth_api.services.membership import Membership
@@ -578,36 +579,39 @@ class Org:  # pylint: disable=too-many-public-methods
         # Deactivate pay account
         Org._delete_pay_account(org_id)
 
-        # Find all active affiliations and remove them.
-        entities = AffiliationService.find_affiliations_by_org_id(org_id)
-        for entity in entities:
-            delete_affiliation_request = DeleteAffiliationRequest(
-                org_id=org_id, business_identifier=entity["business_identifier"], reset_passcode=True
-            )
-            AffiliationService.delete_affiliation(delete_affiliation_request)
+        members = MembershipModel.find_members_with_users_by_org_id(org_id)
+        active_member_ids = [member.user_id for member in members if member.status == Status.ACTIVE.value]
+
+        # Remove all affiliations.
+        unaffiliated_entities = AffiliationService.delete_affiliations_for_org(org_id)
 
         # Deactivate all members.
-        members = MembershipModel.find_members_by_org_id(org_id)
         for member in members:
             member.status = Status.INACTIVE.value
-            member.flush()
-
-            user: UserModel = UserModel.find_by_id(member.user_id)
-            # Remove user from keycloak group if they are not part of any orgs
-            if len(MembershipModel.find_orgs_for_user(member.user_id)) == 0:
-                KeycloakService.remove_from_account_holders_group(user.keycloak_guid)
-
-            # If the admin is BCeID user, mark the affidavit INACTIVE.
-            if user.login_source == LoginSource.BCEID.value and member.membership_type_code == ADMIN:
-                affidavit: AffidavitModel = AffidavitModel.find_approved_by_user_id(user.id)
-                if affidavit:
-                    affidavit.status_code = AffidavitStatus.INACTIVE.value
-                    affidavit.flush()
-
-        # Set the account as INACTIVE
+        db.session.flush()
+        # Users without any other org are removed from the keycloak account holders group.
+        user_ids_with_orgs = MembershipModel.find_user_ids_with_orgs([member.user_id for member in members])
+        keycloak_guids = [
+            member.user.keycloak_guid
+            for member in members
+            if member.user_id not in user_ids_with_orgs and member.user.keycloak_guid
+        ]
+
+        # If an admin is a BCeID user, mark the affidavit INACTIVE.
+        bceid_admin_ids = [
+            member.user_id
+            for member in members
+            if member.user.login_source == LoginSource.BCEID.value and member.membership_type_code == ADMIN
+        ]
+        for affidavit in AffidavitModel.find_approved_by_user_ids(bceid_admin_ids):
+            affidavit.status_code = AffidavitStatus.INACTIVE.value
+
+        # Set the account as INACTIVE, committing everything above in one transaction.
         org.status_code = OrgStatus.INACTIVE.value
         org.save()
 
+        KeycloakService.remove_users_from_account_holders_group(list(dict.fromkeys(keycloak_guids)))
+        AffiliationService.publish_affiliations_deleted(org_id, unaffiliated_entities, active_member_ids)
         ProductService.update_org_product_keycloak_groups(org.id)
 
         current_app.logger.debug("org Inactivated>")
@@ -0,0 +1,164 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Maintains org_affiliation_rows, the precomputed rows of the entity mapping affiliation search.
+
+The rows of an org only depend on its affiliations, the entities they point at and the entity mappings of those
+entities. Any flushed change to one of them records the orgs involved, and the rows of those orgs are rebuilt from
+EntityMappingService.affiliation_rows_query right before the transaction commits, so they are never out of date for
+a committed change. An org is the smallest unit that can be rebuilt safely, rows pair identifiers of one org, and a
+transaction-scoped advisory lock per org keeps two transactions from rebuilding the same org at once.
+
+Rows are only maintained with AFFILIATION_ROWS_MAINTAINED or AFFILIATION_ROWS_ENABLED set, other writes skip the
+rebuild. To switch the search over, set AFFILIATION_ROWS_MAINTAINED on the api and the queues, run
+`flask rebuild-affiliation-rows` and only then set AFFILIATION_ROWS_ENABLED.
+"""
+from itertools import chain
+from typing import Iterable, List, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, func, insert, inspect, literal, or_, select
+from sqlalchemy.orm import Session
+
+from auth_api.models import db
+from auth_api.models.affiliation import Affiliation as AffiliationModel
+from auth_api.models.entity import Entity as EntityModel
+from auth_api.models.entity_mapping import EntityMapping as EntityMappingModel
+from auth_api.models.org_affiliation_row import OrgAffiliationRow as OrgAffiliationRowModel
+from auth_api.services.entity_mapping import EntityMappingService
+
+_PENDING_CHANGES = "org_affiliation_rows_changes"
+# First key of the per org advisory locks, keeps them apart from other per org locks.
+_LOCK_NAMESPACE = 18
+
+
+def _maintained() -> bool:
+    config = current_app.config if has_app_context() else {}
+    return bool(config.get("AFFILIATION_ROWS_MAINTAINED") or config.get("AFFILIATION_ROWS_ENABLED"))
+
+
+class OrgAffiliationRows:
+    """Rebuilds and verifies the precomputed affiliation search rows of orgs."""
+
+    @staticmethod
+    def refresh_orgs(org_ids: Iterable[int], session: Session = None):
+        """Replace the rows of the orgs with freshly computed ones, within the current transaction."""
+        session = session or db.session
+        table = OrgAffiliationRowModel.__table__
+        for org_id in sorted({int(org_id) for org_id in org_ids if org_id}):
+            rows = EntityMappingService.affiliation_rows_query(org_id).subquery()
+            # Held until the transaction ends, a concurrent rebuild of the org waits and replaces these rows.
+            session.execute(select(func.pg_advisory_xact_lock(_LOCK_NAMESPACE, org_id)))
+            session.execute(delete(table).where(table.c.org_id == org_id))
+            session.execute(
+                insert(table).from_select(
+                    ["org_id", "identifiers", "created_on"],
+                    select(literal(org_id), rows.c.identifiers, rows.c.created_on),
+                )
+            )
+
+    @staticmethod
+    def rebuild(org_ids: Optional[List[int]] = None, batch_size: int = 100) -> int:
+        """Rebuild the rows of the orgs, or of every org with an affiliation, committing every batch_size orgs."""
+        if not org_ids:
+            org_ids = db.session.scalars(select(AffiliationModel.org_id).distinct().order_by(AffiliationModel.org_id))
+        org_ids = list(org_ids)
+        for start in range(0, len(org_ids), batch_size):
+            OrgAffiliationRows.refresh_orgs(org_ids[start : start + batch_size])
+            db.session.commit()
+            current_app.logger.info(f"Rebuilt org affiliation rows for {min(start + batch_size, len(org_ids))} orgs.")
+        return len(org_ids)
+
+    @staticmethod
+    def verify(org_id: int) -> bool:
+        """Return True when the stored rows of the org match the rows computed from the source tables."""
+        stored_rows = db.session.query(OrgAffiliationRowModel.identifiers, OrgAffiliationRowModel.created_on).filter(
+            OrgAffiliationRowModel.org_id == org_id
+        )
+        expected = sorted(
+            (tuple(identifiers), created_on)
+            for identifiers, created_on in EntityMappingService.affiliation_rows_query(org_id)
+        )
+        return expected == sorted((tuple(identifiers), created_on) for identifiers, created_on in stored_rows)
+
+
+def _values(instance, attribute: str) -> list:
+    """Return the current and, for updated or deleted instances, the previous values of the attribute."""
+    history = inspect(instance).attrs[attribute].history
+    return [value for value in chain(history.added, history.unchanged, history.deleted) if value]
+
+
+def _changed(instance, *attributes) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session, flush_context):  # pylint: disable=unused-argument
+    """Remember the orgs, entities and identifiers touched by the flush until the transaction commits."""
+    if not _maintained():
+        return
+    org_ids, entity_ids, identifiers = set(), set(), set()
+    for instance in chain(session.new, session.deleted):
+        if isinstance(instance, AffiliationModel):
+            org_ids.add(instance.org_id)
+        elif isinstance(instance, EntityMappingModel):
+            identifiers.update((instance.business_identifier, instance.bootstrap_identifier, instance.nr_identifier))
+    for instance in session.dirty:
+        if isinstance(instance, AffiliationModel) and _changed(instance, "org_id", "entity_id", "created"):
+            org_ids.update(_values(instance, "org_id"))
+        elif isinstance(instance, EntityModel) and _changed(instance, "business_identifier", "is_loaded_lear"):
+            entity_ids.add(instance.id)
+        elif isinstance(instance, EntityMappingModel):
+            for attribute in ("business_identifier", "bootstrap_identifier", "nr_identifier"):
+                identifiers.update(_values(instance, attribute))
+    identifiers.discard(None)
+    if org_ids or entity_ids or identifiers:
+        changes = session.info.setdefault(
+            _PENDING_CHANGES, {"org_ids": set(), "entity_ids": set(), "identifiers": set()}
+        )
+        changes["org_ids"].update(org_ids)
+        changes["entity_ids"].update(entity_ids)
+        changes["identifiers"].update(identifiers)
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_before_commit(session):
+    """Rebuild the rows of every org touched by the transaction."""
+    # Flush what is still pending so its changes are recorded too.
+    session.flush()
+    if not (changes := session.info.pop(_PENDING_CHANGES, None)):
+        return
+    org_ids = set(changes["org_ids"])
+    if changes["entity_ids"] or changes["identifiers"]:
+        org_ids.update(
+            session.scalars(
+                select(AffiliationModel.org_id)
+                .join(EntityModel, EntityModel.id == AffiliationModel.entity_id)
+                .where(
+                    or_(
+                        EntityModel.id.in_(changes["entity_ids"]),
+                        EntityModel.business_identifier.in_(changes["identifiers"]),
+                    )
+                )
+                .distinct()
+            )
+        )
+    OrgAffiliationRows.refresh_orgs(org_ids, session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    """Forget the changes of a rolled back transaction."""
+    if not session.in_transaction():
+        session.info.pop(_PENDING_CHANGES, None)
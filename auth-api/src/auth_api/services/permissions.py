@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service to invoke Rest services."""
-from typing import Dict, List, Tuple
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from flask import current_app
 from sqlalchemy import and_, select
@@ -24,39 +27,59 @@ from auth_api.models.org import Org as OrgModel
 from auth_api.models.permissions import Permissions as PermissionsModel
 from auth_api.models.user import User as UserModel
 
-from ..utils.cache import cache
 from ..utils.enums import OrgStatus, Status
 from ..utils.roles import VALID_ORG_STATUSES
 from ..utils.user_context import UserContext, user_context
 
 
+@dataclass(frozen=True)
+class PermissionMatrix:
+    """Immutable snapshot of the permissions table, keyed by (org_status, membership_type)."""
+
+    version: int
+    loaded_at: float
+    actions: Dict[Tuple[Optional[str], str], FrozenSet[str]] = field(default_factory=dict)
+
+
 class Permissions:  # pylint: disable=too-few-public-methods
     """Service for user settings."""
 
+    _matrix: Optional[PermissionMatrix] = None
+    _matrix_lock = threading.Lock()
+
     def __init__(self, model):
         """Return an Permissions Service."""
         self._model = model
 
     @classmethod
-    def build_all_permission_cache(cls):
-        """Build cache for all permission values."""
+    def build_all_permission_cache(cls) -> Optional[PermissionMatrix]:
+        """Build the in process permission matrix from the permissions table."""
         try:
             permissions: List[PermissionsModel] = PermissionsModel.get_all_permissions()
-            per_kv: Dict[Tuple[str, int], List[str]] = {}
+            per_kv: Dict[Tuple[Optional[str], str], set] = {}
             for perm in permissions:
-                key_tuple = (perm.org_status_code, perm.membership_type_code)
-                actions_v: List = per_kv.get(key_tuple)
-                if actions_v:
-                    actions_v.append(perm.actions)
-                    per_kv.update({key_tuple: actions_v})
-                else:
-                    per_kv[key_tuple] = [perm.actions]
-
-            for key, val in per_kv.items():
-                cache.set(key, val)
+                per_kv.setdefault((perm.org_status_code, perm.membership_type_code), set()).add(perm.actions)
 
+            with cls._matrix_lock:
+                version = cls._matrix.version + 1 if cls._matrix else 1
+                cls._matrix = PermissionMatrix(
+                    version=version,
+                    loaded_at=time.monotonic(),
+                    actions={key: frozenset(actions) for key, actions in per_kv.items()},
+                )
+            current_app.logger.info("Permission matrix version %s loaded with %s keys", version, len(per_kv))
         except SQLAlchemyError as e:
             current_app.logger.info("Error on building cache %s", e)
+        return cls._matrix
+
+    @classmethod
+    def get_permission_matrix(cls) -> Optional[PermissionMatrix]:
+        """Return the permission matrix, reloading it when it is older than PERMISSIONS_MATRIX_REFRESH_SECONDS."""
+        matrix = cls._matrix
+        refresh_seconds = current_app.config.get("PERMISSIONS_MATRIX_REFRESH_SECONDS", 0)
+        if matrix is None or (refresh_seconds and time.monotonic() - matrix.loaded_at > refresh_seconds):
+            matrix = cls.build_all_permission_cache()
+        return matrix
 
     @staticmethod
     def get_permissions_for_membership(
@@ -72,18 +95,15 @@ class Permissions:  # pylint: disable=too-few-public-methods
         ):
             org_status = None
         key_tuple = (org_status, membership_type)
-        actions_from_cache = cache.get(key_tuple)
 
         additional_permissions = []
         if include_all_permissions:
             additional_permissions = Permissions.get_additional_user_permissions(user_model)
-        if actions_from_cache:
-            actions = actions_from_cache + additional_permissions
+        if matrix := Permissions.get_permission_matrix():
+            actions = sorted(matrix.actions.get(key_tuple, ()))
         else:
             permissions = PermissionsModel.get_permissions_by_membership(org_status, membership_type)
-            actions = []
-            for permission in permissions:
-                actions.append(permission.actions)
+            actions = [permission.actions for permission in permissions]
         return actions + additional_permissions
 
     @staticmethod
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service for managing Product and Product Subscription data."""
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set
 
 from flask import current_app
 from sqlalchemy import and_, case, func, literal, or_
@@ -28,7 +30,7 @@ from auth_api.models import ProductSubscription as ProductSubscriptionModel
 from auth_api.models import Task as TaskModel
 from auth_api.models import User as UserModel
 from auth_api.models import db
-from auth_api.models.dataclass import Activity, KeycloakGroupSubscription, ProductReviewTask
+from auth_api.models.dataclass import Activity, KeycloakGroupSubscription, ProductCodeInfo, ProductReviewTask
 from auth_api.schemas import ProductCodeSchema
 from auth_api.services.keycloak import KeycloakService
 from auth_api.services.user import User as UserService
@@ -49,7 +51,6 @@ from auth_api.utils.enums import (
 from auth_api.utils.user_context import UserContext, user_context
 
 from ..utils.account_mailer import publish_to_mailer
-from ..utils.cache import cache
 from ..utils.notifications import (
     ProductNotificationInfo,
     ProductSubscriptionInfo,
@@ -70,24 +71,71 @@ class Product:
     This service manages creating, updating, and retrieving products and product subscriptions.
     """
 
+    _product_codes: Optional[Dict[str, ProductCodeInfo]] = None
+    _unknown_product_codes: Set[str] = set()
+    _product_codes_loaded_at: float = 0
+    _product_codes_lock = threading.Lock()
+
+    @staticmethod
+    def _product_code_info(product: ProductCodeModel) -> ProductCodeInfo:
+        """Return the lookup table entry of the product code."""
+        return ProductCodeInfo(
+            code=product.code,
+            type_code=product.type_code,
+            linked_product_code=product.linked_product_code,
+            parent_code=product.parent_code,
+            keycloak_group=product.keycloak_group,
+        )
+
     @classmethod
     def build_all_products_cache(cls):
-        """Build cache for all permission values."""
+        """Build the in process lookup table of every product code."""
         try:
-            product_list: List[ProductCodeModel] = ProductCodeModel.get_all_products()
-            for product in product_list:
-                cache.set(product.code, product.type_code)
+            product_codes = {
+                product.code: cls._product_code_info(product) for product in ProductCodeModel.get_all_product_codes()
+            }
+            with cls._product_codes_lock:
+                cls._product_codes = product_codes
+                cls._unknown_product_codes = set()
+                cls._product_codes_loaded_at = time.monotonic()
         except SQLAlchemyError as e:
             current_app.logger.info("Error on building cache %s", e)
 
+    @classmethod
+    def find_product_code_info(cls, code: str) -> Optional[ProductCodeInfo]:
+        """Return the product code details from the in process lookup table, unknown codes are negatively cached."""
+        refresh_seconds = current_app.config.get("PRODUCTS_CACHE_REFRESH_SECONDS", 0)
+        if cls._product_codes is None or (
+            refresh_seconds and time.monotonic() - cls._product_codes_loaded_at > refresh_seconds
+        ):
+            cls.build_all_products_cache()
+        if not code or code in cls._unknown_product_codes:
+            return None
+        if (info := (cls._product_codes or {}).get(code)) is not None:
+            return info
+        product = ProductCodeModel.find_by_code(code)
+        info = cls._product_code_info(product) if product else None
+        with cls._product_codes_lock:
+            if info is None:
+                cls._unknown_product_codes.add(code)
+            elif cls._product_codes is not None:
+                cls._product_codes[code] = info
+        return info
+
     @staticmethod
     def find_product_type_by_code(code: str) -> str:
         """Find Product Type."""
-        code_from_cache = cache.get(code)
-        if code_from_cache:
-            return code_from_cache
-        product_code_model: ProductCodeModel = ProductCodeModel.find_by_code(code)
-        return getattr(product_code_model, "type_code", "")
+        info = Product.find_product_code_info(code)
+        return info.type_code if info else ""
+
+    @staticmethod
+    def _find_product_models(product_codes: List[str]) -> Dict[str, ProductCodeModel]:
+        """Load the product models for the codes and their parent and linked products in one query."""
+        codes = set(product_codes)
+        for code in product_codes:
+            if info := Product.find_product_code_info(code):
+                codes.update(filter(None, (info.parent_code, info.linked_product_code)))
+        return {product.code: product for product in ProductCodeModel.find_by_codes(list(codes))}
 
     @staticmethod
     def _validate_product_resubmission(task: TaskModel, product_model: ProductCodeModel):
@@ -115,10 +163,11 @@ class Product:
 
         user = UserModel.find_by_jwt_token()
         subscriptions_list = subscription_data.get("subscriptions")
+        product_models = Product._find_product_models([sub.get("productCode") for sub in subscriptions_list])
         for subscription in subscriptions_list:
             product_code = subscription.get("productCode")
             existing_sub = ProductSubscriptionModel.find_by_org_id_product_code(org_id, product_code)
-            product_model: ProductCodeModel = ProductCodeModel.find_by_code(product_code)
+            product_model: ProductCodeModel = product_models.get(product_code)
 
             # We only care about existing subs for resubmission
             if not existing_sub:
@@ -182,11 +231,12 @@ class Product:
             check_auth(one_of_roles=(*CLIENT_ADMIN_ROLES, STAFF), org_id=org_id)
 
         subscriptions_list = subscription_data.get("subscriptions")
+        product_models = Product._find_product_models([sub.get("productCode") for sub in subscriptions_list])
         for subscription in subscriptions_list:
             product_code = subscription.get("productCode")
             if ProductSubscriptionModel.find_by_org_id_product_code(org_id, product_code):
                 raise BusinessException(Error.PRODUCT_SUBSCRIPTION_EXISTS, None)
-            product_model = ProductCodeModel.find_by_code(product_code)
+            product_model = product_models.get(product_code)
             if product_model:
                 # Check if product requires system admin, if yes abort
                 if product_model.need_system_admin:
@@ -210,7 +260,9 @@ class Product:
                 # If there is a parent product, add subscription to that to
                 # This is to satisfy any preceding subscriptions required
                 if product_model.parent_code:
-                    Product._update_parent_subscription(org_id, product_model, subscription_status)
+                    Product._update_parent_subscription(
+                        org_id, product_model, subscription_status, product_models.get(product_model.parent_code)
+                    )
 
                 # create a staff review task for this product subscription if pending status
                 if subscription_status == ProductSubscriptionStatus.PENDING_STAFF_REVIEW.value:
@@ -221,7 +273,7 @@ class Product:
                             product_code=product_subscription.product_code,
                             product_description=product_model.description,
                             product_subscription_id=product_subscription.id,
-                            user_id=UserModel.find_by_jwt_token().id,
+                            user_id=UserModel.find_current_user_id(),
                             external_source_id=subscription.get("externalSourceId"),
                         )
                     )
@@ -274,9 +326,11 @@ class Product:
         Product.send_product_subscription_notification(product_notification_info)
 
     @staticmethod
-    def _update_parent_subscription(org_id, sub_product_model, subscription_status):
+    def _update_parent_subscription(
+        org_id, sub_product_model, subscription_status, parent_product_model: ProductCodeModel = None
+    ):
         parent_code = sub_product_model.parent_code
-        parent_product_model: ProductCodeModel = ProductCodeModel.find_by_code(parent_code)
+        parent_product_model = parent_product_model or ProductCodeModel.find_by_code(parent_code)
         existing_parent_sub = ProductSubscriptionModel.find_by_org_id_product_code(org_id, parent_code)
 
         # Parent sub does not exist create it and return
@@ -14,26 +14,27 @@
 """Service to invoke Rest services."""
 import asyncio
 import json
+import random
 from collections.abc import Iterable
 from http import HTTPStatus
-from typing import Dict
+from typing import Dict, List
+from urllib.parse import urlparse
 
 import aiohttp
-import requests
-from aiohttp.client_exceptions import ClientConnectorError  # pylint:disable=ungrouped-imports
 from flask import current_app, request
-from requests.adapters import HTTPAdapter  # pylint:disable=ungrouped-imports
 
 # pylint:disable=ungrouped-imports
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import ConnectTimeout, HTTPError
-from urllib3.util.retry import Retry
 
 from auth_api.exceptions import ServiceUnavailableException
-from auth_api.utils.cache import cache
+from auth_api.models.dataclass import ParallelPostFailure, ParallelPostResult
+from auth_api.utils.async_runner import async_runner
 from auth_api.utils.enums import AuthHeaderType, ContentType
+from auth_api.utils.http_session import http_sessions
+from auth_api.utils.token_manager import TokenManager
 
-RETRY_ADAPTER = HTTPAdapter(max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[404]))
+service_account_tokens = TokenManager("service_account", background_refresh=True)
 
 
 class RestService:
@@ -66,10 +67,12 @@ class RestService:
         current_app.logger.debug(f"headers : {headers}")
         response = None
         try:
-            invoke_rest_method = getattr(requests, rest_method)
-            response = invoke_rest_method(
-                endpoint, data=data, headers=headers, timeout=current_app.config.get("CONNECT_TIMEOUT", 60)
-            )
+            invoke_rest_method = getattr(http_sessions.session(), rest_method)
+            response = invoke_rest_method(endpoint, data=data, headers=headers, timeout=http_sessions.timeout())
+            if response.status_code == HTTPStatus.UNAUTHORIZED and (renewed := service_account_tokens.renew(token)):
+                # The service account token was revoked or signed with rotated keys, retry once with a new one.
+                headers = RestService._generate_headers(content_type, additional_headers, renewed, auth_header_type)
+                response = invoke_rest_method(endpoint, data=data, headers=headers, timeout=http_sessions.timeout())
             if raise_for_status:
                 response.raise_for_status()
         except (ReqConnectionError, ConnectTimeout) as exc:
@@ -207,12 +210,14 @@ class RestService:
 
         current_app.logger.debug(f"Endpoint : {endpoint}")
         current_app.logger.debug(f"headers : {headers}")
-        session = requests.Session()
-        if retry_on_failure:
-            session.mount(endpoint, RETRY_ADAPTER)
+        session = http_sessions.session(retry_on_failure=retry_on_failure)
         response = None
         try:
-            response = session.get(endpoint, headers=headers, timeout=current_app.config.get("CONNECT_TIMEOUT", 60))
+            response = session.get(endpoint, headers=headers, timeout=http_sessions.timeout())
+            if response.status_code == HTTPStatus.UNAUTHORIZED and (renewed := service_account_tokens.renew(token)):
+                # The service account token was revoked or signed with rotated keys, retry once with a new one.
+                headers = RestService._generate_headers(content_type, additional_headers, renewed, auth_header_type)
+                response = session.get(endpoint, headers=headers, timeout=http_sessions.timeout())
             response.raise_for_status()
         except (ReqConnectionError, ConnectTimeout) as exc:
             current_app.logger.error("---Error on GET---")
@@ -235,25 +240,32 @@ class RestService:
         return response
 
     @staticmethod
-    @cache.cached(query_string=True)
     def get_service_account_token(
         config_id="KEYCLOAK_SERVICE_ACCOUNT_ID", config_secret="KEYCLOAK_SERVICE_ACCOUNT_SECRET"
     ) -> str:
-        """Generate a service account token."""
+        """Return a service account token for the client, reused until shortly before it expires.
+
+        Only needs an application context, so queue workers can call it outside of a request.
+        """
         kc_service_id = current_app.config.get(config_id)
         kc_secret = current_app.config.get(config_secret)
 
         issuer_url = current_app.config.get("JWT_OIDC_ISSUER")
         token_url = issuer_url + "/protocol/openid-connect/token"
-        auth_response = requests.post(
-            token_url,
-            auth=(kc_service_id, kc_secret),
-            headers={"Content-Type": ContentType.FORM_URL_ENCODED.value},
-            data="grant_type=client_credentials",
-            timeout=current_app.config.get("CONNECT_TIMEOUT", 60),
-        )
-        auth_response.raise_for_status()
-        return auth_response.json().get("access_token")
+        timeout = http_sessions.timeout()
+
+        def fetch_token():
+            auth_response = http_sessions.session().post(
+                token_url,
+                auth=(kc_service_id, kc_secret),
+                headers={"Content-Type": ContentType.FORM_URL_ENCODED.value},
+                data="grant_type=client_credentials",
+                timeout=timeout,
+            )
+            auth_response.raise_for_status()
+            return auth_response.json()
+
+        return service_account_tokens.get_token(f"{token_url}|{kc_service_id}", fetch_token)
 
     @staticmethod
     def _generate_headers(content_type, additional_headers, token, auth_header_type):
@@ -265,31 +277,56 @@ class RestService:
         }
 
     @staticmethod
-    async def call_posts_in_parallel(call_info: dict, token: str, org_id):
-        """Call the services in parallel and return the responses."""
+    async def post_in_parallel(call_info: List[Dict], token: str, org_id=None) -> ParallelPostResult:
+        """POST to every url in parallel, collecting the successful responses and the failed calls.
+
+        Calls to the same host are capped by PARALLEL_POST_LIMIT_PER_HOST, each attempt has PARALLEL_POST_TIMEOUT
+        seconds to complete, and 5xx responses, connection errors and timeouts are retried with jittered backoff. A 200
+        whose body is not JSON is a failure of its call.
+        """
+        config = current_app.config
+        limit_per_host = config.get("PARALLEL_POST_LIMIT_PER_HOST", 10)
+        timeout = aiohttp.ClientTimeout(total=config.get("PARALLEL_POST_TIMEOUT", 30))
+        retries = config.get("PARALLEL_POST_RETRIES", 2)
         headers = {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
-        responses = []
-        # call all urls in parallel
-        async with aiohttp.ClientSession() as session:
-            fetch_tasks = [
-                asyncio.create_task(session.post(data["url"], json=data["payload"], headers=headers))
-                for data in call_info
-            ]
-            tasks = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-
-            for task in tasks:
-                if isinstance(task, ClientConnectorError):
-                    # if no response from task we will go in here (i.e. namex-api is down)
-                    error_msg = f"Error for ({str(org_id)}) in _call_urls_in_parallel: no response from {task.os_error}"
-                    current_app.logger.error(error_msg)
-                    raise ServiceUnavailableException(f"No response from {task.os_error}")
-                if task.status != HTTPStatus.OK:
-                    error_msg = f"Error for ({str(org_id)}) in _call_urls_in_parallel: error response from {task.url}"
-                    current_app.logger.error(error_msg)
-                    raise ServiceUnavailableException(f"Error response from {task.url}")
-                task_json = await task.json()
-                responses.append(task_json)
-        return responses
+        semaphores = {urlparse(data["url"]).netloc: asyncio.Semaphore(limit_per_host) for data in call_info}
+        session = await async_runner.client_session("rest_service")
+
+        async def post(data: Dict):
+            url = data["url"]
+            async with semaphores[urlparse(url).netloc]:
+                for attempt in range(retries + 1):
+                    try:
+                        async with session.post(url, json=data["payload"], headers=headers, timeout=timeout) as resp:
+                            if resp.status == HTTPStatus.OK:
+                                try:
+                                    return await resp.json()
+                                except (aiohttp.ContentTypeError, ValueError) as exc:
+                                    return ParallelPostFailure(url, resp.status, f"Invalid JSON from {url}: {exc!r}")
+                            if resp.status < 500 or attempt == retries:
+                                return ParallelPostFailure(url, resp.status, f"Error response from {url}")
+                    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                        if attempt == retries:
+                            return ParallelPostFailure(url, None, f"No response from {url}: {exc!r}")
+                    await asyncio.sleep(0.2 * 2**attempt * random.uniform(0.5, 1.5))  # nosec
+            return None
+
+        result = ParallelPostResult()
+        for outcome in await asyncio.gather(*(post(data) for data in call_info)):
+            if isinstance(outcome, ParallelPostFailure):
+                current_app.logger.error(f"Error for ({str(org_id)}) in post_in_parallel: {outcome.error}")
+                result.failures.append(outcome)
+            else:
+                result.responses.append(outcome)
+        return result
+
+    @staticmethod
+    async def call_posts_in_parallel(call_info: dict, token: str, org_id):
+        """Call the services in parallel and return the responses, failing if any of the calls failed."""
+        result = await RestService.post_in_parallel(call_info, token, org_id)
+        if result.failures:
+            raise ServiceUnavailableException(result.failures[0].error)
+        return result.responses
 
 
 def _get_token() -> str:
@@ -17,6 +17,7 @@ This module manages the User Information.
 """
 
 import json
+from dataclasses import dataclass
 from http import HTTPStatus
 from typing import Dict, List
 
@@ -61,6 +62,24 @@ from .keycloak import KeycloakService
 ENV = Environment(loader=FileSystemLoader("."), autoescape=True)
 
 
+@dataclass
+class _BulkUser:
+    """A user of a bulk import on its way through keycloak and the DB."""
+
+    index: int
+    membership: dict
+    create_user_request: KeycloakUser
+    db_username: str
+    user_model: UserModel = None
+    membership_model: MembershipModel = None
+    kc_user: KeycloakUser = None
+
+    @property
+    def re_enable(self) -> bool:
+        """Return True for an inactive user coming back to its org."""
+        return self.membership_model is not None
+
+
 class User:  # pylint: disable=too-many-instance-attributes disable=too-many-public-methods
     """Manages all aspects of the User Entity.
 
@@ -116,73 +135,133 @@ class User:  # pylint: disable=too-many-instance-attributes disable=too-many-pub
         single_mode can be used if called method already perfomed the authenticaiton
         single_mode= true is used now incase of invitation for admin users scenarion
         other cases should be invoked with single_mode=false
+        Existing users are found with one query, keycloak users are created concurrently and the DB rows are
+        committed in chunks of BULK_USERS_COMMIT_SIZE, every user still gets its own result.
         """
         User._validate_and_throw_exception(memberships, org_id, single_mode)
 
         current_app.logger.debug("create_user")
-        users = []
-        for membership in memberships:
+        users: List[dict] = [None] * len(memberships)
+        db_usernames = [IdpHint.BCROS.value + "/" + membership["username"] for membership in memberships]
+        user_models = {user_model.username: user_model for user_model in UserModel.find_by_usernames(db_usernames)}
+        # Keycloak only decides whether inactive users can be re-enabled.
+        kc_users = KeycloakService.get_users_by_usernames(
+            [
+                membership["username"]
+                for membership, db_username in zip(memberships, db_usernames)
+                if getattr(user_models.get(db_username), "status", None) == Status.INACTIVE.value
+            ]
+        )
+
+        new_users, saved_users, seen = [], [], set()
+        for index, (membership, db_username) in enumerate(zip(memberships, db_usernames)):
             username = membership["username"]
             current_app.logger.debug(f"create user username: {username}")
-            create_user_request = User._create_kc_user(membership)
-            db_username = IdpHint.BCROS.value + "/" + username
-            user_model = UserModel.find_by_username(db_username)
-            re_enable_user = False
-            existing_kc_user = KeycloakService.get_user_by_username(username)
-            enabled_in_kc = getattr(existing_kc_user, "enabled", True)
+            user_model = user_models.get(db_username)
+            membership_model = None
+            enabled_in_kc = getattr(kc_users.get(username), "enabled", True)
             if getattr(user_model, "status", None) == Status.INACTIVE.value and not enabled_in_kc:
                 membership_model = MembershipModel.find_membership_by_userid(user_model.id)
-                re_enable_user = membership_model.org_id == int(org_id or -1)
-            if user_model and not re_enable_user:
+                if membership_model.org_id != int(org_id or -1):
+                    membership_model = None
+            if (user_model and not membership_model) or db_username in seen:
                 current_app.logger.debug("Existing users found in DB")
-                users.append(User._get_error_dict(username, Error.USER_ALREADY_EXISTS))
+                users[index] = User._get_error_dict(username, Error.USER_ALREADY_EXISTS)
                 continue
+            seen.add(db_username)
 
+            create_user_request = User._create_kc_user(membership)
             if membership.get("update_password_on_login", True):  # by default , reset needed
                 create_user_request.update_password_on_login()
-            try:
-                if re_enable_user:
-                    kc_user = KeycloakService.update_user(create_user_request)
-                else:
-                    kc_user = KeycloakService.add_user(create_user_request, throw_error_if_exists=True)
-            except BusinessException as err:
-                error_msg = f"create_user in keycloak failed :duplicate user {err}"
-                current_app.logger.error(error_msg)
-                users.append(User._get_error_dict(username, Error.USER_ALREADY_EXISTS))
+            bulk_user = _BulkUser(index, membership, create_user_request, db_username, user_model, membership_model)
+            if not bulk_user.re_enable:
+                new_users.append(bulk_user)
                 continue
-            except HTTPError as err:
-                error_msg = f"create_user in keycloak failed {err}"
-                current_app.logger.error(error_msg)
-                users.append(User._get_error_dict(username, Error.FAILED_ADDING_USER_ERROR))
+            try:
+                KeycloakService.update_user(create_user_request)
+                saved_users.append(bulk_user)
+            except (BusinessException, HTTPError) as err:
+                users[index] = User._get_keycloak_error_dict(username, err)
+
+        added = KeycloakService.add_users([bulk_user.create_user_request for bulk_user in new_users])
+        for bulk_user, kc_user in zip(new_users, added):
+            if isinstance(kc_user, Exception):
+                users[bulk_user.index] = User._get_keycloak_error_dict(bulk_user.membership["username"], kc_user)
                 continue
+            bulk_user.kc_user = kc_user
+            saved_users.append(bulk_user)
+
+        User._save_bulk_users(sorted(saved_users, key=lambda bulk_user: bulk_user.index), org_id, users)
+        return {"users": users}
+
+    @staticmethod
+    def _get_keycloak_error_dict(username, err):
+        if isinstance(err, BusinessException):
+            current_app.logger.error(f"create_user in keycloak failed :duplicate user {err}")
+            return User._get_error_dict(username, Error.USER_ALREADY_EXISTS)
+        current_app.logger.error(f"create_user in keycloak failed {err}")
+        return User._get_error_dict(username, Error.FAILED_ADDING_USER_ERROR)
+
+    @staticmethod
+    def _save_bulk_users(bulk_users: List[_BulkUser], org_id, users: List[dict]):
+        """Save the users in chunks, a chunk that fails is saved again one user at a time."""
+        chunk_size = current_app.config.get("BULK_USERS_COMMIT_SIZE", 50)
+        for start in range(0, len(bulk_users), chunk_size):
+            chunk = bulk_users[start : start + chunk_size]
             try:
-                if re_enable_user:
-                    user_model.status = Status.ACTIVE.value
-                    user_model.type = Role.ANONYMOUS_USER.name
-                    user_model.login_source = LoginSource.BCROS.value
-                    user_model.flush()
-                    membership_model.status = Status.ACTIVE.value
-                    membership_model.membership_type_code = membership["membershipType"]
-                    membership_model.flush()
-                else:
-                    user_model = User._create_new_user_and_membership(db_username, kc_user, membership, org_id)
-
-                db.session.commit()  # commit is for session ;need not to invoke for every object
-                user_dict = User(user_model).as_dict()
-                user_dict.update({"http_status": HTTPStatus.CREATED, "error": ""})
-                users.append(user_dict)
+                user_ids = [User._save_bulk_user(bulk_user, org_id).id for bulk_user in chunk]
+                db.session.commit()
             except Exception as e:  # NOQA # pylint: disable=broad-except
-                error_msg = f"Error on  create_user_and_add_membership {e}"
-                current_app.logger.error(error_msg)
+                current_app.logger.info(f"Saving {len(chunk)} bulk users failed, saving them one by one: {e}")
                 db.session.rollback()
-                if re_enable_user:
-                    User._update_user_in_kc(create_user_request)
-                else:
-                    KeycloakService.delete_user_by_username(create_user_request.user_name)
-                users.append(User._get_error_dict(username, Error.FAILED_ADDING_USER_ERROR))
+                for bulk_user in chunk:
+                    users[bulk_user.index] = User._save_bulk_user_alone(bulk_user, org_id)
                 continue
+            # Reload the committed users with one query rather than one per user.
+            user_models = {
+                user_model.id: user_model for user_model in UserModel.query.filter(UserModel.id.in_(user_ids))
+            }
+            for bulk_user, user_id in zip(chunk, user_ids):
+                users[bulk_user.index] = User._get_created_dict(user_models[user_id])
 
-        return {"users": users}
+    @staticmethod
+    def _save_bulk_user_alone(bulk_user: _BulkUser, org_id) -> dict:
+        """Save and commit one user, removing or disabling the keycloak user again when that fails."""
+        try:
+            user_model = User._save_bulk_user(bulk_user, org_id)
+            db.session.commit()
+            return User._get_created_dict(user_model)
+        except Exception as e:  # NOQA # pylint: disable=broad-except
+            error_msg = f"Error on  create_user_and_add_membership {e}"
+            current_app.logger.error(error_msg)
+            db.session.rollback()
+            if bulk_user.re_enable:
+                User._update_user_in_kc(bulk_user.create_user_request)
+            else:
+                KeycloakService.delete_user_by_username(bulk_user.create_user_request.user_name)
+            return User._get_error_dict(bulk_user.membership["username"], Error.FAILED_ADDING_USER_ERROR)
+
+    @staticmethod
+    def _save_bulk_user(bulk_user: _BulkUser, org_id) -> UserModel:
+        if not bulk_user.re_enable:
+            return User._create_new_user_and_membership(
+                bulk_user.db_username, bulk_user.kc_user, bulk_user.membership, org_id
+            )
+        user_model, membership_model = bulk_user.user_model, bulk_user.membership_model
+        user_model.status = Status.ACTIVE.value
+        user_model.type = Role.ANONYMOUS_USER.name
+        user_model.login_source = LoginSource.BCROS.value
+        user_model.flush()
+        membership_model.status = Status.ACTIVE.value
+        membership_model.membership_type_code = bulk_user.membership["membershipType"]
+        membership_model.flush()
+        return user_model
+
+    @staticmethod
+    def _get_created_dict(user_model: UserModel) -> dict:
+        user_dict = User(user_model).as_dict()
+        user_dict.update({"http_status": HTTPStatus.CREATED, "error": ""})
+        return user_dict
 
     @staticmethod
     def _update_user_in_kc(create_user_request):
@@ -0,0 +1,87 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Short lived cache of the details LEAR and namex return per identifier.
+
+Entries hold the business, draft or name request details of one identifier, or a marker for identifiers the source
+did not return. They live for AFFILIATION_DETAILS_CACHE_TIMEOUT seconds and are dropped by the auth-queue when a name
+request changes state. Caching only kicks in with a shared backend (Redis or Memcached), otherwise the queue could
+not reach the entries of the api workers.
+"""
+import threading
+from typing import Dict, Iterable
+
+from flask import current_app, has_app_context
+
+from .cache import cache
+
+MISSING = "MISSING"
+_PREFIX = "affiliation_details"
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _is_shared_backend() -> bool:
+    return has_app_context() and cache.config.get("CACHE_TYPE") in ("RedisCache", "MemcachedCache")
+
+
+def _timeout() -> int:
+    if not _is_shared_backend():
+        return 0
+    return current_app.config.get("AFFILIATION_DETAILS_CACHE_TIMEOUT", 0)
+
+
+def _key(identifier: str) -> str:
+    return f"{_PREFIX}:{identifier.replace(' ', '_')}"
+
+
+def affiliation_details_cache_enabled() -> bool:
+    """Return True when affiliation details are cached."""
+    return bool(_timeout())
+
+
+def get_cached_details(identifiers: Iterable[str]) -> Dict[str, Dict]:
+    """Return the cached entries of the identifiers, identifiers without an entry are left out."""
+    identifiers = list(dict.fromkeys(identifiers))
+    if not identifiers or not affiliation_details_cache_enabled():
+        return {}
+    cached = {
+        identifier: entry
+        for identifier, entry in zip(identifiers, cache.get_many(*[_key(identifier) for identifier in identifiers]))
+        if entry is not None
+    }
+    with _stats_lock:
+        _stats["hits"] += len(cached)
+        _stats["misses"] += len(identifiers) - len(cached)
+    return cached
+
+
+def cache_details(entries: Dict[str, Dict]):
+    """Store the entries, keyed by identifier."""
+    if entries and (timeout := _timeout()):
+        cache.set_many({_key(identifier): entry for identifier, entry in entries.items()}, timeout=timeout)
+
+
+def invalidate_affiliation_details(identifiers: Iterable[str]):
+    """Drop the cached entries of the identifiers.
+
+    Only needs the shared backend, the queues invalidate without AFFILIATION_DETAILS_CACHE_TIMEOUT configured.
+    """
+    if _is_shared_backend() and (keys := [_key(identifier) for identifier in identifiers if identifier]):
+        cache.delete_many(*keys)
+
+
+def affiliation_details_cache_stats() -> Dict[str, int]:
+    """Return the identifiers served from the cache (hits) and fetched from the sources (misses) by this process."""
+    with _stats_lock:
+        return dict(_stats)
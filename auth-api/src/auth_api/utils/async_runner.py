@@ -0,0 +1,129 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Long lived event loop for running async fan-out calls from synchronous code.
+
+Each worker process starts one event loop on a daemon thread the first time it is needed. Coroutines submitted with
+run() execute on that loop with a copy of the caller's context, so the Flask application and request contexts stay
+available, and the caller blocks until they finish or ASYNC_RUNNER_TIMEOUT seconds pass, the coroutine is cancelled
+then. The loop is shared by every request thread of the worker, coroutines must not block it with synchronous I/O or
+heavy CPU work. aiohttp sessions are created once per loop and reused, keeping their keep-alive connections between
+requests.
+"""
+import asyncio
+import atexit
+import contextvars
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, Dict
+
+import aiohttp
+from flask import current_app, has_app_context
+
+
+def _default_timeout() -> float:
+    return current_app.config.get("ASYNC_RUNNER_TIMEOUT", 120) if has_app_context() else 120
+
+
+class AsyncRunner:
+    """Run coroutines on a background event loop shared by the whole worker process."""
+
+    def __init__(self):
+        """Return a runner, the loop is started on first use."""
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: threading.Thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        atexit.register(self.close)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._pid == os.getpid() and self._loop is not None:
+            return self._loop
+        with self._lock:
+            # A forked worker can not use the loop thread of its parent, start its own.
+            if self._pid != os.getpid() or self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="async-runner", daemon=True)
+                thread.start()
+                self._sessions = {}
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+        return self._loop
+
+    def run(self, coroutine: Coroutine, timeout: float = None) -> Any:
+        """Run the coroutine on the background loop and return its result.
+
+        Raises TimeoutError and cancels the coroutine when it does not finish within timeout seconds, which defaults
+        to ASYNC_RUNNER_TIMEOUT.
+        """
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncRunner.run can not be called from a coroutine on its own loop, await instead.")
+        context = contextvars.copy_context()
+        result: Future = Future()
+        tasks = []
+
+        def copy_outcome(task: asyncio.Task):
+            if task.cancelled():
+                result.cancel()
+            elif (exception := task.exception()) is not None:
+                result.set_exception(exception)
+            else:
+                result.set_result(task.result())
+
+        def start():
+            task = loop.create_task(coroutine, context=context)
+            task.add_done_callback(copy_outcome)
+            tasks.append(task)
+
+        def cancel():
+            for task in tasks:
+                task.cancel()
+
+        loop.call_soon_threadsafe(start)
+        try:
+            return result.result(_default_timeout() if timeout is None else timeout)
+        except FutureTimeoutError:
+            # Callbacks run in order, so the task exists by the time cancel runs.
+            loop.call_soon_threadsafe(cancel)
+            raise
+
+    async def client_session(self, name: str, limit: int = 100) -> aiohttp.ClientSession:
+        """Return the pooled aiohttp session for name, must be awaited on the background loop."""
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            # Cookies set by one upstream response must not be replayed on the calls of other users.
+            session = self._sessions[name] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=limit), cookie_jar=aiohttp.DummyCookieJar()
+            )
+        return session
+
+    async def _close_sessions(self):
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            await session.close()
+
+    def close(self):
+        """Close the pooled sessions and stop the loop of this process."""
+        if self._loop is None or self._pid != os.getpid() or not self._loop.is_running():
+            return
+        try:
+            self.run(self._close_sessions(), timeout=5)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+async_runner = AsyncRunner()
@@ -21,9 +21,9 @@ from flask import current_app
 from simple_cloudevent import SimpleCloudEvent
 
 from auth_api.models import Membership as MembershipModel
+from auth_api.models import User as UserModel
 from auth_api.services.flags import flags
 from auth_api.services.gcp_queue import GcpQueue, queue
-from auth_api.services.user import User as UserService
 from auth_api.utils.enums import QueueSources, Status
 from auth_api.utils.serializable import Serializable
 
@@ -61,19 +61,29 @@ def publish_account_event(queue_message_type: str, data: AccountEvent, source: s
 
 def publish_affiliation_event(queue_message_type: str, org_id: int, business_identifier: str):
     """Publish affiliation event to topic."""
-    if flags.is_on("enable-publish-account-events", default=False) is True:
-        current_user: UserService = UserService.find_by_jwt_token(silent_mode=True)
+    publish_affiliation_events(queue_message_type, org_id, [business_identifier])
+
+
+def publish_affiliation_events(
+    queue_message_type: str, org_id: int, business_identifiers: List[str], member_ids: List[int] = None
+):
+    """Publish one affiliation event per business identifier, looking up the org members and the actor once."""
+    if not business_identifiers or flags.is_on("enable-publish-account-events", default=False) is not True:
+        return
+    if member_ids is None:
         member_ids = [
             membership.user_id
             for membership in MembershipModel.find_members_by_org_id(org_id)
             if membership.status == Status.ACTIVE.value
         ]
+    actioned_by = UserModel.find_current_user_id()
+    for business_identifier in business_identifiers:
         publish_account_event(
             queue_message_type=queue_message_type,
             data=AccountEvent(
                 account_id=org_id,
                 business_identifier=business_identifier,
-                actioned_by=current_user.identifier if current_user else None,
+                actioned_by=actioned_by,
                 user_ids=member_ids,
             ),
         )
@@ -82,10 +92,7 @@ def publish_affiliation_event(queue_message_type: str, org_id: int, business_ide
 def publish_team_member_event(queue_message_type: str, org_id: int, user_id: int):
     """Publish team member removed event to topic."""
     if flags.is_on("enable-publish-account-events", default=False) is True:
-        current_user: UserService = UserService.find_by_jwt_token(silent_mode=True)
         publish_account_event(
             queue_message_type=queue_message_type,
-            data=AccountEvent(
-                account_id=org_id, actioned_by=current_user.identifier if current_user else None, user_ids=[user_id]
-            ),
+            data=AccountEvent(account_id=org_id, actioned_by=UserModel.find_current_user_id(), user_ids=[user_id]),
         )
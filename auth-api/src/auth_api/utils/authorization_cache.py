@@ -0,0 +1,138 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared cache for authorizations_view lookups.
+
+Entries are stored in the configured cache backend so every worker shares them. Each entry key embeds a generation
+token, either of the org the lookup is bound to or a global one for lookups without an org. Any flushed or committed
+change to a membership, affiliation, product subscription, org or entity, or to the keycloak guid or status of a
+user, replaces the generation tokens of the orgs involved (for an entity, the orgs it is affiliated with, for a user,
+the orgs it is a member of) and the global token, which makes every older entry unreachable. Caching only kicks in
+with a shared backend (Redis or Memcached), a per process cache could not see invalidations made by other workers or
+the queues.
+"""
+import uuid
+from itertools import chain
+from typing import Callable, Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from auth_api.models.affiliation import Affiliation as AffiliationModel
+from auth_api.models.entity import Entity as EntityModel
+from auth_api.models.membership import Membership as MembershipModel
+from auth_api.models.org import Org as OrgModel
+from auth_api.models.product_subscription import ProductSubscription as ProductSubscriptionModel
+from auth_api.models.user import User as UserModel
+from auth_api.models.views.authorization import Authorization as AuthorizationView
+
+from .cache import cache
+
+_PREFIX = "authorizations"
+_GLOBAL_SCOPE = "*"
+_NOT_FOUND = "NOT_FOUND"
+_PENDING_ORG_IDS = "authorization_cache_org_ids"
+_COLUMNS = [column.key for column in AuthorizationView.__table__.columns]
+
+
+def _is_shared_backend() -> bool:
+    return cache.config.get("CACHE_TYPE") in ("RedisCache", "MemcachedCache")
+
+
+def _timeout() -> int:
+    if not has_app_context() or not _is_shared_backend():
+        return 0
+    return current_app.config.get("AUTHORIZATION_CACHE_TIMEOUT", 0)
+
+
+def _generation_key(scope) -> str:
+    return f"{_PREFIX}:generation:{scope}"
+
+
+def _generation(scope) -> str:
+    key = _generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, timeout=0)
+        generation = cache.get(key)
+    return generation
+
+
+def get_authorization(lookup_key: tuple, org_id, loader: Callable) -> Optional[AuthorizationView]:
+    """Return the authorization for the lookup from the shared cache, calling loader on a miss."""
+    if not (timeout := _timeout()):
+        return loader()
+    scope = str(org_id) if org_id else _GLOBAL_SCOPE
+    key = f"{_PREFIX}:{scope}:{_generation(scope)}:{':'.join(str(part) for part in lookup_key)}"
+    cached = cache.get(key)
+    if cached == _NOT_FOUND:
+        return None
+    if cached is not None:
+        return AuthorizationView(**cached)
+
+    auth = loader()
+    cache.set(key, {column: getattr(auth, column) for column in _COLUMNS} if auth else _NOT_FOUND, timeout=timeout)
+    return auth
+
+
+def invalidate_org_authorizations(org_ids: Iterable[int]):
+    """Invalidate cached authorizations for the orgs, along with every lookup that is not bound to an org."""
+    if not has_app_context() or not _is_shared_backend():
+        return
+    scopes = {str(org_id) for org_id in org_ids if org_id}
+    scopes.add(_GLOBAL_SCOPE)
+    cache.set_many({_generation_key(scope): uuid.uuid4().hex for scope in scopes}, timeout=0)
+
+
+def _changed_org_ids(session) -> set:
+    org_ids = set()
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, (MembershipModel, AffiliationModel, ProductSubscriptionModel)):
+            org_ids.add(instance.org_id)
+        elif isinstance(instance, OrgModel):
+            org_ids.add(instance.id)
+        elif isinstance(instance, EntityModel):
+            # Name, corp type, folio number and identifier are served from the entity through its affiliations.
+            org_ids.update(affiliation.org_id for affiliation in instance.affiliations)
+        elif isinstance(instance, UserModel) and (instance in session.deleted or _user_changed(instance)):
+            # The keycloak guid is served from the user through its memberships, other user columns are not.
+            org_ids.update(membership.org_id for membership in instance.orgs)
+    return org_ids
+
+
+def _user_changed(user: UserModel) -> bool:
+    state = inspect(user)
+    return any(state.attrs[attribute].history.has_changes() for attribute in ("keycloak_guid", "status"))
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_after_flush(session, flush_context):  # pylint: disable=unused-argument
+    """Invalidate as soon as changes reach the database and remember the orgs until the transaction commits."""
+    if org_ids := _changed_org_ids(session):
+        invalidate_org_authorizations(org_ids)
+        session.info.setdefault(_PENDING_ORG_IDS, set()).update(org_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    """Invalidate again once committed, dropping anything other workers read before the commit was visible."""
+    if org_ids := session.info.pop(_PENDING_ORG_IDS, None):
+        invalidate_org_authorizations(org_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    """Forget pending orgs of a rolled back transaction, nothing changed for them."""
+    if not session.in_transaction():
+        session.info.pop(_PENDING_ORG_IDS, None)
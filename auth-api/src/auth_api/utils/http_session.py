@@ -0,0 +1,102 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pooled HTTP sessions for outbound calls.
+
+Every worker process keeps its own keep-alive connection pools, one pool per host, so calls to Keycloak, pay-api,
+legal-api, namex, notify-api and the API gateway skip the TCP and TLS handshakes after the first request. Sessions
+serve calls made for every user and org, so they reject cookies rather than replay them on unrelated calls.
+"""
+import atexit
+import http.cookiejar
+import os
+import threading
+from typing import Dict, Tuple
+
+import requests
+from flask import Flask, current_app, has_app_context
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpSessions:
+    """Per process requests sessions sharing keep-alive connection pools."""
+
+    def __init__(self, app: Flask = None):
+        """Return the session holder, sessions are created on first use."""
+        self._sessions: Dict[bool, requests.Session] = {}
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        """Close the pooled connections when the worker exits."""
+        app.extensions["http_sessions"] = self
+        atexit.register(self.close)
+
+    @staticmethod
+    def _config(key: str, default: int) -> int:
+        return current_app.config.get(key, default) if has_app_context() else default
+
+    def _build_session(self, retry_on_failure: bool) -> requests.Session:
+        if retry_on_failure:
+            # Used for calls to resources that may not exist yet, keeps retrying on 404 with backoff.
+            retry = Retry(total=5, backoff_factor=1, status_forcelist=[404])
+        else:
+            # Idempotent requests are retried on connection errors and gateway failures, the final response is
+            # returned as is so callers keep handling the status themselves.
+            retry = Retry(
+                total=self._config("HTTP_MAX_RETRIES", 3),
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,
+            )
+        adapter = HTTPAdapter(
+            pool_connections=self._config("HTTP_POOL_CONNECTIONS", 10),
+            pool_maxsize=self._config("HTTP_POOL_MAXSIZE", 20),
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session(self, retry_on_failure: bool = False) -> requests.Session:
+        """Return the pooled session of this process."""
+        if self._pid != os.getpid():
+            # Connections must not be shared with a forked parent, start with fresh pools.
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._sessions = {}
+                    self._pid = os.getpid()
+        if (session := self._sessions.get(retry_on_failure)) is None:
+            with self._lock:
+                if (session := self._sessions.get(retry_on_failure)) is None:
+                    session = self._sessions[retry_on_failure] = self._build_session(retry_on_failure)
+        return session
+
+    def timeout(self) -> Tuple[int, int]:
+        """Return the connect and read timeouts for outbound calls."""
+        return self._config("HTTP_CONNECT_TIMEOUT", 10), self._config("CONNECT_TIMEOUT", 60)
+
+    def close(self):
+        """Close every pooled connection of this process."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+http_sessions = HttpSessions()
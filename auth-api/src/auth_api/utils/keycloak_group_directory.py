@@ -0,0 +1,130 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Lookup of keycloak group ids by group name or path.
+
+Group ids do not change while a group exists, so the whole group tree of a realm is loaded once and indexed by the
+name and by the path (e.g. /parent/child) of every group, a name shared by several groups resolves to the first one
+depth first like a group search did. A worker keeps the index in memory and shares it with other workers through the
+configured cache when that cache is Redis or Memcached.
+
+A lookup that misses reloads the tree, at most once per KEYCLOAK_GROUP_DIRECTORY_RELOAD_SECONDS per worker, and then
+falls back to a group search, since newer keycloak versions leave subgroups out of the tree. Ids found by a search are
+added to the index, names neither finds are remembered as missing for the same number of seconds.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from flask import current_app, has_app_context
+
+from .cache import cache
+
+
+def _is_shared_backend() -> bool:
+    return has_app_context() and cache.config.get("CACHE_TYPE") in ("RedisCache", "MemcachedCache")
+
+
+def _timeout() -> int:
+    return current_app.config.get("KEYCLOAK_GROUP_DIRECTORY_TIMEOUT", 86400) if has_app_context() else 86400
+
+
+def _reload_seconds() -> int:
+    return current_app.config.get("KEYCLOAK_GROUP_DIRECTORY_RELOAD_SECONDS", 60) if has_app_context() else 60
+
+
+def index_groups(groups: List[Dict], index: Dict[str, str] = None, parent_path: str = "") -> Dict[str, str]:
+    """Return the ids of the groups and their subgroups keyed by name and by path."""
+    index = {} if index is None else index
+    for group in groups:
+        path = group.get("path") or f"{parent_path}/{group['name']}"
+        index.setdefault(group["name"], group["id"])
+        index[path] = group["id"]
+        index_groups(group.get("subGroups") or [], index, path)
+    return index
+
+
+class KeycloakGroupDirectory:
+    """Hand out keycloak group ids, loading the group tree only when a group is not known yet."""
+
+    def __init__(self, name: str):
+        """Return a group directory, name keeps its cache keys apart from other directories."""
+        self.name = name
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._missing: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _cache_key(self, slot: str) -> str:
+        return f"keycloak_groups:{self.name}:{hashlib.sha256(slot.encode()).hexdigest()}"
+
+    def _find(self, slot: str, group: str) -> Optional[str]:
+        if group_id := self._indexes.get(slot, {}).get(group):
+            return group_id
+        if _is_shared_backend() and (index := cache.get(self._cache_key(slot))) and (group_id := index.get(group)):
+            self._indexes[slot] = index
+            return group_id
+        return None
+
+    def _store(self, slot: str, index: Dict[str, str]):
+        self._indexes[slot] = index
+        if _is_shared_backend():
+            cache.set(self._cache_key(slot), index, timeout=_timeout())
+
+    def _claim_reload(self, slot: str) -> bool:
+        """Return True when this thread may reload the tree of the slot, at most one reload per interval."""
+        with self._lock:
+            if time.monotonic() - self._loaded_at.get(slot, float("-inf")) < _reload_seconds():
+                return False
+            self._loaded_at[slot] = time.monotonic()
+            return True
+
+    def _known_missing(self, slot: str, group: str) -> bool:
+        return self._missing.get(slot, {}).get(group, 0) > time.monotonic()
+
+    def group_id(
+        self,
+        slot: str,
+        group: str,
+        fetch_groups: Callable[[], List[Dict]],
+        search_group: Callable[[], Optional[str]] = None,
+    ) -> Optional[str]:
+        """Return the id of the group, by name or by path.
+
+        fetch_groups returns the group tree, search_group the id of the group when the tree does not have it. Neither
+        is called while holding a lock.
+        """
+        if group_id := self._find(slot, group):
+            return group_id
+        if self._known_missing(slot, group):
+            return None
+        if self._claim_reload(slot):
+            self._store(slot, index_groups(fetch_groups()))
+            if group_id := self._indexes[slot].get(group):
+                return group_id
+        if search_group and (group_id := search_group()):
+            self._store(slot, {**self._indexes.get(slot, {}), group: group_id})
+            return group_id
+        with self._lock:
+            self._missing.setdefault(slot, {})[group] = time.monotonic() + _reload_seconds()
+        return None
+
+    def invalidate(self, slot: str):
+        """Forget the group tree of the slot, e.g. after a group id was rejected."""
+        with self._lock:
+            self._indexes.pop(slot, None)
+            self._loaded_at.pop(slot, None)
+            self._missing.pop(slot, None)
+        if _is_shared_backend():
+            cache.delete(self._cache_key(slot))
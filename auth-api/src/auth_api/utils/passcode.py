@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Using the bcrypt library to securely hash and check hashed passcode."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 import bcrypt
 
 
@@ -23,6 +26,14 @@ def passcode_hash(passcode: str):
     return None
 
 
+def passcode_hashes(passcodes: List[str], max_workers: int = 4) -> List[str]:
+    """Return the hashes of the passcodes, in order, hashing on a few threads as bcrypt releases the GIL."""
+    if len(passcodes) < 2:
+        return [passcode_hash(passcode) for passcode in passcodes]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(passcode_hash, passcodes))
+
+
 def validate_passcode(passcode: str, hashed_passcode: str):
     """Validate passcode and hashed passcode."""
     if passcode and hashed_passcode:
@@ -0,0 +1,112 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Request scoped memoization backed by flask.g.
+
+Values live on the application context, so they are discarded at the end of every request.
+"""
+from collections.abc import Hashable
+from typing import Any, Callable, Dict, List
+
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_FLUSH_CLEARED_CACHES: List["RequestCache"] = []
+_ROLLBACK_CLEARED_CACHES: List["RequestCache"] = []
+
+
+class RequestCache:
+    """Memoize lookups for the lifetime of the current application context."""
+
+    def __init__(self, name: str, clear_on_flush: bool = False, clear_on_rollback: bool = False):
+        """Return a request cache stored under the given name on flask.g.
+
+        When clear_on_flush is set the cached values are dropped whenever the session flushes, so lookups that
+        depend on database state never outlive a write made in the same request. clear_on_rollback only drops them
+        on rollback, for values that stay valid across writes but may refer to rows that were never committed.
+        """
+        self.name = name
+        self._attribute = f"_request_cache_{name}"
+        if clear_on_flush:
+            _FLUSH_CLEARED_CACHES.append(self)
+        elif clear_on_rollback:
+            _ROLLBACK_CLEARED_CACHES.append(self)
+
+    def _store(self) -> Dict:
+        if not has_app_context():
+            return None
+        store = g.get(self._attribute)
+        if store is None:
+            store = {"values": {}, "hits": 0, "misses": 0}
+            setattr(g, self._attribute, store)
+        return store
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]):
+        """Return the cached value for key, calling loader once per request on a miss."""
+        store = self._store()
+        if store is None:
+            return loader()
+        if key in store["values"]:
+            store["hits"] += 1
+            return store["values"][key]
+        store["misses"] += 1
+        value = loader()
+        store["values"][key] = value
+        return value
+
+    def get(self, key: Hashable, default: Any = None):
+        """Return the cached value for key, or default when nothing is cached for it."""
+        store = self._store()
+        if store is None:
+            return default
+        if key in store["values"]:
+            store["hits"] += 1
+            return store["values"][key]
+        store["misses"] += 1
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value for the rest of the request."""
+        store = self._store()
+        if store is not None:
+            store["values"][key] = value
+
+    def clear(self):
+        """Drop the cached values, counters are kept."""
+        if has_app_context() and (store := g.get(self._attribute)):
+            store["values"].clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters for the current request."""
+        store = g.get(self._attribute) if has_app_context() else None
+        if not store:
+            return {"hits": 0, "misses": 0}
+        return {"hits": store["hits"], "misses": store["misses"]}
+
+
+def _clear_flush_cleared_caches(*args):  # pylint: disable=unused-argument
+    """Invalidate database backed request caches once pending changes are written or rolled back."""
+    for request_cache in _FLUSH_CLEARED_CACHES:
+        request_cache.clear()
+
+
+def _clear_rollback_cleared_caches(*args):  # pylint: disable=unused-argument
+    """Invalidate request caches that may hold rows from a rolled back transaction."""
+    for request_cache in _ROLLBACK_CLEARED_CACHES:
+        request_cache.clear()
+
+
+event.listen(Session, "after_flush", _clear_flush_cleared_caches)
+event.listen(Session, "after_rollback", _clear_flush_cleared_caches)
+event.listen(Session, "after_rollback", _clear_rollback_cleared_caches)
@@ -0,0 +1,158 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reuse of client credentials tokens until shortly before they expire.
+
+Tokens are kept per slot, a slot being one client of one realm. A worker keeps its tokens in memory and shares them
+with other workers through the configured cache when that cache is Redis or Memcached. Only one thread per slot
+fetches a new token at a time, the others wait and reuse it. Managers created with background_refresh renew tokens
+that are close to expiry on a separate thread while callers keep using the current one. A token the server rejects
+before it expires (revoked, or signed with rotated keys) is invalidated by the caller and replaced on the next call.
+Each slot remembers the token it last replaced, so every caller rejected with that token gets the new one and retries.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from .cache import cache
+
+DEFAULT_EXPIRES_IN = 60
+
+
+def _is_shared_backend() -> bool:
+    return has_app_context() and cache.config.get("CACHE_TYPE") in ("RedisCache", "MemcachedCache")
+
+
+def _refresh_skew() -> int:
+    return current_app.config.get("TOKEN_REFRESH_SKEW_SECONDS", 30) if has_app_context() else 30
+
+
+def _background_refresh_window() -> int:
+    return current_app.config.get("TOKEN_BACKGROUND_REFRESH_SECONDS", 60) if has_app_context() else 60
+
+
+class TokenManager:
+    """Hand out client credentials tokens, fetching a new one only when the current one is about to expire."""
+
+    def __init__(self, name: str, background_refresh: bool = False):
+        """Return a token manager, name keeps its cache keys apart from other managers."""
+        self.name = name
+        self.background_refresh = background_refresh
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._fetchers: Dict[str, Callable[[], Dict]] = {}
+        self._replaced: Dict[str, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _cache_key(self, slot: str) -> str:
+        return f"tokens:{self.name}:{hashlib.sha256(slot.encode()).hexdigest()}"
+
+    def _lock(self, slot: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(slot, threading.Lock())
+
+    def _hold(self, slot: str, token: str, expires_at: float):
+        held, _ = self._tokens.get(slot, (None, 0))
+        if held and held != token:
+            self._replaced[slot] = held
+        self._tokens[slot] = (token, expires_at)
+
+    def _valid_token(self, slot: str) -> Optional[str]:
+        """Return a token for the slot that is not within the refresh skew of its expiry."""
+        deadline = time.time() + _refresh_skew()
+        token, expires_at = self._tokens.get(slot, (None, 0))
+        if token and expires_at > deadline:
+            return token
+        if _is_shared_backend() and (shared := cache.get(self._cache_key(slot))):
+            token, expires_at = shared
+            if expires_at > deadline:
+                self._hold(slot, token, expires_at)
+                return token
+        return None
+
+    def _store(self, slot: str, token_response: Dict) -> Optional[str]:
+        if not (token := token_response.get("access_token")):
+            return None
+        expires_in = int(token_response.get("expires_in") or DEFAULT_EXPIRES_IN)
+        expires_at = time.time() + expires_in
+        self._hold(slot, token, expires_at)
+        if _is_shared_backend() and expires_in > _refresh_skew():
+            cache.set(self._cache_key(slot), (token, expires_at), timeout=expires_in - _refresh_skew())
+        return token
+
+    def _refresh_in_background(self, slot: str, fetch: Callable[[], Dict]):
+        """Fetch a new token on a daemon thread, unless another thread is already fetching one for the slot."""
+        lock = self._lock(slot)
+        if not lock.acquire(blocking=False):
+            return
+        app = current_app._get_current_object() if has_app_context() else None  # pylint: disable=protected-access
+
+        def refresh():
+            try:
+                if app is None:
+                    self._store(slot, fetch())
+                else:
+                    with app.app_context():
+                        self._store(slot, fetch())
+            except Exception as e:  # NOQA # pylint: disable=broad-except
+                if app is not None:
+                    app.logger.warning(f"Background token refresh failed for {self.name}: {e}")
+            finally:
+                lock.release()
+
+        threading.Thread(target=refresh, name=f"token-refresh-{self.name}", daemon=True).start()
+
+    def get_token(self, slot: str, fetch: Callable[[], Dict]) -> Optional[str]:
+        """Return the token of the slot, calling fetch for a new token response when none is valid.
+
+        fetch must not rely on the request context, it may run on a background thread.
+        """
+        self._fetchers[slot] = fetch
+        if token := self._valid_token(slot):
+            _, expires_at = self._tokens.get(slot, (None, 0))
+            if self.background_refresh and expires_at - time.time() < _background_refresh_window():
+                self._refresh_in_background(slot, fetch)
+            return token
+        with self._lock(slot):
+            # Another thread may have refreshed the slot while this one was waiting.
+            if token := self._valid_token(slot):
+                return token
+            return self._store(slot, fetch())
+
+    def invalidate(self, slot: str, token: str = None):
+        """Forget the token of the slot, e.g. after it was rejected, unless the slot already holds another token."""
+        with self._lock(slot):
+            held, _ = self._tokens.get(slot, (None, 0))
+            if token and held and held != token:
+                return
+            if held:
+                self._replaced[slot] = held
+            self._tokens.pop(slot, None)
+            if _is_shared_backend():
+                cache.delete(self._cache_key(slot))
+
+    def renew(self, token: str) -> Optional[str]:
+        """Return a new token in place of a rejected one, None when the token is neither held nor last replaced.
+
+        Callers rejected with a token another thread already replaced get the current token of its slot.
+        """
+        slot = next((slot for slot, (held, _) in list(self._tokens.items()) if held == token), None)
+        if slot is None:
+            slot = next((slot for slot, replaced in list(self._replaced.items()) if replaced == token), None)
+        if slot is None or slot not in self._fetchers:
+            return None
+        self.invalidate(slot, token)
+        return self.get_token(slot, self._fetchers[slot])
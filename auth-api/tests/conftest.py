@@ -189,6 +189,10 @@ def keycloak_mock(monkeypatch):
     monkeypatch.setattr(
         "auth_api.services.keycloak.KeycloakService.remove_from_account_holders_group", lambda *args, **kwargs: None
     )
+    monkeypatch.setattr(
+        "auth_api.services.keycloak.KeycloakService.remove_users_from_account_holders_group",
+        lambda *args, **kwargs: None,
+    )
     monkeypatch.setattr(
         "auth_api.services.keycloak.KeycloakService.add_or_remove_product_keycloak_groups", lambda *args, **kwargs: None
     )
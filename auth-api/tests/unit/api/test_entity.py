@@ -530,6 +530,41 @@ def test_authorizations_for_affiliated_users_returns_200(client, jwt, session):
     assert rv.json.get("orgMembership") == "ADMIN"
 
 
+def test_bulk_authorizations_for_affiliated_users(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert bulk authorizations resolve every business identifier in one call."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    entity = factory_entity_model()
+    factory_affiliation_model(entity.id, org.id)
+    other_entity = factory_entity_model(entity_info=TestEntityInfo.entity2)
+
+    claims = copy.deepcopy(TestJwtClaims.edit_user_role.value)
+    claims["sub"] = str(user.keycloak_guid)
+
+    headers = factory_auth_header(jwt=jwt, claims=claims)
+    rv = client.post(
+        "/api/v1/entities/authorizations",
+        data=json.dumps({"businessIdentifiers": [entity.business_identifier, other_entity.business_identifier]}),
+        headers=headers,
+        content_type="application/json",
+    )
+
+    assert rv.status_code == HTTPStatus.OK
+    authorizations = {auth["businessIdentifier"]: auth for auth in rv.json["authorizations"]}
+    assert authorizations[entity.business_identifier]["orgMembership"] == "ADMIN"
+    assert authorizations[entity.business_identifier]["roles"]
+    assert authorizations[other_entity.business_identifier].get("orgMembership") is None
+
+    rv = client.post(
+        "/api/v1/entities/authorizations",
+        data=json.dumps({"businessIdentifiers": []}),
+        headers=headers,
+        content_type="application/json",
+    )
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
+
+
 def test_authorizations_for_expanded_result(client, jwt, session):  # pylint:disable=unused-argument
     """Assert authorizations for affiliated users returns 200."""
     user = factory_user_model()
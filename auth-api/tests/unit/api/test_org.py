@@ -32,7 +32,7 @@ from auth_api.models import Affiliation as AffiliationModel
 from auth_api.models import Entity as EntityModel
 from auth_api.models import Membership as MembershipModel
 from auth_api.models import Org as OrgModel
-from auth_api.models.dataclass import TaskSearch
+from auth_api.models.dataclass import ParallelPostResult, TaskSearch
 from auth_api.schemas import utils as schema_utils
 from auth_api.services import Affiliation as AffiliationService
 from auth_api.services import Invitation as InvitationService
@@ -2802,8 +2802,8 @@ def test_get_org_affiliations(
 
     # mock function that calls namex / lear
     mocker.patch(
-        "auth_api.services.rest_service.RestService.call_posts_in_parallel",
-        return_value=[entities_response, nrs_response],
+        "auth_api.services.rest_service.RestService.post_in_parallel",
+        return_value=ParallelPostResult(responses=[entities_response, nrs_response]),
     )
     mocker.patch("auth_api.services.rest_service.RestService.get_service_account_token", return_value="token")
 
@@ -2815,6 +2815,7 @@ def test_get_org_affiliations(
         assert rv.status_code == HTTPStatus.OK
         assert rv.json.get("entities", None) and isinstance(rv.json["entities"], list)
         assert len(rv.json["entities"]) == len(businesses) + len(drafts) + len(nrs)
+        assert rv.json["degraded"] is False
 
         drafts_nr_numbers = [data[3] for data in drafts_with_nrs]
         for entity in rv.json["entities"]:
@@ -50,3 +50,15 @@ def test_returns_empty_string_permissions(client, jwt, session):  # pylint:disab
     dictionary = json.loads(rv.data)
     present = "VIEW_USER_LOGINSOURCE" in dictionary
     assert present is True
+
+
+def test_reload_permissions(client, jwt, session):  # pylint:disable=unused-argument
+    """Assert the permission matrix reload endpoint is limited to system accounts."""
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.public_user_role)
+    rv = client.post("/api/v1/permissions/reload", headers=headers, content_type="application/json")
+    assert rv.status_code == HTTPStatus.UNAUTHORIZED
+
+    headers = factory_auth_header(jwt=jwt, claims=TestJwtClaims.system_role)
+    rv = client.post("/api/v1/permissions/reload", headers=headers, content_type="application/json")
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.json.get("version")
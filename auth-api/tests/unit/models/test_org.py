@@ -15,17 +15,26 @@
 
 Test suite to ensure that the Org model routines are working as expected.
 """
+import os
+import time
+from datetime import datetime
 
 import pytest
+from sqlalchemy import String, cast, text
 
 from auth_api.exceptions.errors import Error
 from auth_api.exceptions.exceptions import BusinessException
+from auth_api.models import Invitation as InvitationModel
+from auth_api.models import InvitationMembership as InvitationMembershipModel
 from auth_api.models import Org as OrgModel
 from auth_api.models import OrgStatus as OrgStatusModel
 from auth_api.models import OrgType as OrgTypeModel
 from auth_api.models import PaymentType as PaymentTypeModel
+from auth_api.models.dataclass import OrgSearch
+from auth_api.utils.enums import AccessType, InvitationStatus, InvitationType
 from auth_api.utils.enums import OrgStatus as OrgStatusEnum
 from auth_api.utils.enums import OrgType as OrgTypeEnum
+from tests import run_benchmarks
 from tests.utilities.factory_utils import factory_user_model
 
 
@@ -206,3 +215,125 @@ def test_invalid_org_create_type_code(session):
         session.commit()
 
     assert excinfo.value.code == Error.INSUFFICIENT_PERMISSION.name
+
+
+def test_search_org_excludes_pending_activation(session):  # pylint:disable=unused-argument
+    """Assert that orgs waiting for their director search invitation to be accepted are left out of searches."""
+    user = factory_user_model()
+    pending_org, accepted_org = (
+        OrgModel(
+            name=name,
+            type_code=OrgTypeEnum.PREMIUM.value,
+            status_code=OrgStatusEnum.ACTIVE.value,
+            access_type=AccessType.ANONYMOUS.value,
+        )
+        for name in ("Pending Anonymous Org", "Accepted Anonymous Org")
+    )
+    session.add_all([pending_org, accepted_org])
+    session.flush()
+    for org, status in ((pending_org, InvitationStatus.PENDING), (accepted_org, InvitationStatus.ACCEPTED)):
+        invitation = InvitationModel(
+            sender_id=user.id,
+            recipient_email="abc123@email.com",
+            sent_date=datetime.now(),
+            type=InvitationType.DIRECTOR_SEARCH.value,
+            invitation_status_code=status.value,
+        )
+        invitation.membership = [InvitationMembershipModel(org_id=org.id, membership_type_code="ADMIN")]
+        session.add(invitation)
+    session.commit()
+
+    search = OrgSearch("Anonymous Org", "", "", [], [], "", "", "", "", False, "", 1, 10)
+    orgs, total = OrgModel.search_org(search)
+    assert total == 1
+    assert orgs[0].id == accepted_org.id
+
+    orgs, total = OrgModel.search_pending_activation_orgs("Anonymous Org")
+    assert total == 1
+    assert orgs[0].id == pending_org.id
+
+
+MEMBER_SEARCH_EXISTS = """
+    EXISTS (
+        SELECT 1
+        FROM memberships
+        JOIN users ON users.id = memberships.user_id
+        WHERE memberships.org_id = orgs.id
+        AND memberships.status = 1
+        AND users.status = 1
+        AND (COALESCE(users.last_name, '') || ' ' || COALESCE(users.first_name, '') || ' '
+            || COALESCE(users.username, '')) ILIKE '%6512bd43%'
+    )
+"""
+
+
+def _explain(session, statement) -> str:
+    """Return the query plan of the statement."""
+    return "\n".join(row[0] for row in session.execute(text(f"EXPLAIN {statement}")))
+
+
+@run_benchmarks
+@pytest.mark.slow
+def test_search_org_trigram_benchmark(session, record_property):  # pylint:disable=unused-argument
+    """Assert that staff org searches over a large org table are served by the trigram indexes."""
+    count = int(os.getenv("ORG_SEARCH_BENCHMARK_ROWS", "100000"))
+    session.execute(
+        text(
+            """
+            INSERT INTO orgs (type_code, status_code, name, branch_name, decision_made_by, bcol_account_id, created)
+            SELECT 'PREMIUM', 'ACTIVE', 'Benchmark ' || md5(i::text), '', 'staff' || (i % 1000),
+                lpad((i % 100000)::text, 6, '0'), now() - make_interval(secs => i)
+            FROM generate_series(1, :count) AS i
+            """
+        ),
+        {"count": count},
+    )
+    # One member per ten orgs, named after the md5 of its org so member searches are as selective as name searches.
+    session.execute(
+        text(
+            """
+            INSERT INTO users (username, first_name, last_name, status, created)
+            SELECT 'benchmark' || i, md5(i::text), 'Member', 1, now()
+            FROM generate_series(1, :count, 10) AS i
+            """
+        ),
+        {"count": count},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO memberships (user_id, org_id, membership_type_code, status, created)
+            SELECT users.id, orgs.id, 'USER', 1, now()
+            FROM users JOIN orgs ON orgs.name = 'Benchmark ' || users.first_name
+            WHERE users.username LIKE 'benchmark%'
+            """
+        )
+    )
+    for table in ("orgs", "users", "memberships"):
+        session.execute(text(f"ANALYZE {table}"))
+
+    filters = {
+        "ix_orgs_name_trgm": OrgModel.name.ilike("%c4ca4238%"),
+        "ix_orgs_decision_made_by_trgm": OrgModel.decision_made_by.ilike("%staff123%"),
+        "ix_orgs_id_text_trgm": cast(OrgModel.id, String).like("%12345%"),
+    }
+    for index_name, criterion in filters.items():
+        statement = (
+            session.query(OrgModel.id)
+            .filter(criterion)
+            .statement.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        )
+        assert index_name in _explain(session, statement)
+    assert "ix_users_search_text_trgm" in _explain(session, f"SELECT orgs.id FROM orgs WHERE {MEMBER_SEARCH_EXISTS}")
+
+    searches = {
+        "name": ("c4ca4238", OrgSearch("c4ca4238", "", "", [], [], "", "", "", "", False, "", 1, 10)),
+        "member": ("6512bd43", OrgSearch("", "", "", [], [], "", "", "", "", False, "6512bd43", 1, 10)),
+    }
+    for name, (fragment, search) in searches.items():
+        start = time.perf_counter()
+        orgs, total = OrgModel.search_org(search)
+        record_property(f"search_org_{name}_ms", round((time.perf_counter() - start) * 1000, 3))
+        assert orgs
+        assert all(fragment in org.name for org in orgs)
+        assert total >= len(orgs)
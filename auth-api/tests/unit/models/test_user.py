@@ -54,6 +54,28 @@ def test_user_find_by_jwt_token(session, monkeypatch):
     assert u.id is not None
 
 
+def test_find_current_user_id_is_memoized(session, monkeypatch):
+    """Assert that the current user is queried once per request once it exists."""
+    token = {
+        "preferred_username": "CP1234567",
+        "sub": "1b20db59-19a0-4727-affe-c6f64309fd04",
+        "realm_access": {"roles": ["edit", "uma_authorization", "basic"]},
+    }
+    patch_token_info(token, monkeypatch)
+    assert User.find_current_user_id() is None
+
+    user = User(username="CP1234567", keycloak_guid="1b20db59-19a0-4727-affe-c6f64309fd04")
+    session.add(user)
+    session.commit()
+
+    before = User.current_user_cache_stats()
+    assert User.find_current_user_id() == user.id
+    assert User.find_current_user_id() == user.id
+    after = User.current_user_cache_stats()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+
+
 def test_create_from_jwt_token(session, monkeypatch):  # pylint: disable=unused-argument
     """Assert User is created from the JWT fields."""
     token = {
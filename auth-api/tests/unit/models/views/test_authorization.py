@@ -15,10 +15,18 @@
 
 Test suite to ensure that the Authorizations view routines are working as expected.
 """
+import statistics
+import time
 import uuid
 
+import pytest
+from sqlalchemy import text
+
+from auth_api.models import db
 from auth_api.models.views.authorization import Authorization
 from auth_api.utils.enums import ProductCode
+from tests import run_benchmarks
+from tests.utilities.factory_scenarios import TestEntityInfo, TestUserInfo
 from tests.utilities.factory_utils import (
     factory_affiliation_model,
     factory_entity_model,
@@ -112,3 +120,130 @@ def test_find_user_authorization_by_business_number_product(session):  # pylint:
 
     assert authorization is not None
     assert authorization.product_code == ProductCode.DIR_SEARCH.value
+
+
+AUTHORIZATION_COLUMNS = (
+    "business_identifier, entity_name, folio_number, corp_type_code, org_membership, keycloak_guid, user_id, "
+    "org_id, org_name, status_code, org_type, product_code, bcol_user_id, bcol_account_id"
+)
+
+
+def _authorization_rows(relation: str, org_id: int):
+    """Return the authorization rows of an org from the given relation."""
+    return sorted(
+        db.session.execute(
+            text(f"SELECT {AUTHORIZATION_COLUMNS} FROM {relation} WHERE org_id = :org_id"), {"org_id": org_id}
+        ).fetchall(),
+        key=str,
+    )
+
+
+def _assert_materialized_in_sync(org_id: int):
+    assert _authorization_rows("authorizations_materialized", org_id) == _authorization_rows(
+        "authorizations_view", org_id
+    )
+
+
+def test_materialized_authorizations_in_sync(session):  # pylint:disable=unused-argument
+    """Assert that the triggers keep authorizations_materialized identical to authorizations_view."""
+    user = factory_user_model()
+    org = factory_org_model()
+    _assert_materialized_in_sync(org.id)
+
+    membership = factory_membership_model(user.id, org.id)
+    _assert_materialized_in_sync(org.id)
+
+    entity = factory_entity_model()
+    affiliation = factory_affiliation_model(entity.id, org.id)
+    factory_product_model(org.id, product_code=ProductCode.BUSINESS.value)
+    _assert_materialized_in_sync(org.id)
+
+    other_user = factory_user_model(TestUserInfo.user2)
+    factory_membership_model(other_user.id, org.id, member_type="USER")
+    membership.membership_type_code = "COORDINATOR"
+    membership.save()
+    _assert_materialized_in_sync(org.id)
+
+    entity.name = "Renamed, Inc."
+    entity.save()
+    org.name = "Renamed org"
+    org.save()
+    _assert_materialized_in_sync(org.id)
+
+    affiliation.delete()
+    membership.status = 2
+    membership.save()
+    _assert_materialized_in_sync(org.id)
+
+
+def _factory_business_orgs(user, count: int) -> list:
+    """Create orgs with an admin membership, a business product and one affiliated business each."""
+    org_ids = []
+    for index in range(count):
+        org = factory_org_model()
+        factory_membership_model(user.id, org.id)
+        factory_product_model(org.id, product_code=ProductCode.BUSINESS.value)
+        entity = factory_entity_model(
+            {**TestEntityInfo.entity1, "businessIdentifier": f"CP{index:07d}", "businessNumber": None}
+        )
+        factory_affiliation_model(entity.id, org.id)
+        org_ids.append(org.id)
+    return org_ids
+
+
+MATERIALIZED_LOOKUPS = {
+    "ix_authorizations_materialized_keycloak_guid_org_id": "keycloak_guid = :guid AND org_id = :org_id",
+    "ix_authorizations_materialized_business_identifier_org_id": "business_identifier = :identifier "
+    "AND org_id = :org_id",
+    "ix_authorizations_materialized_org_id_product_code_membership": "org_id = :org_id "
+    "AND product_code = :product AND org_membership = 'ADMIN'",
+}
+
+
+@pytest.mark.slow
+def test_materialized_authorizations_indexed(session):  # pylint:disable=unused-argument
+    """Assert that authorization lookups on authorizations_materialized are served by its indexes."""
+    user = factory_user_model()
+    org_ids = _factory_business_orgs(user, 50)
+    db.session.execute(text("ANALYZE authorizations_materialized"))
+    # The table is small here, keep the planner from preferring a sequential scan to check the indexes match.
+    db.session.execute(text("SET LOCAL enable_seqscan = off"))
+
+    params = {
+        "guid": str(user.keycloak_guid),
+        "org_id": org_ids[0],
+        "identifier": "CP0000000",
+        "product": ProductCode.BUSINESS.value,
+    }
+    for index_name, criterion in MATERIALIZED_LOOKUPS.items():
+        plan = db.session.execute(text(f"EXPLAIN SELECT * FROM authorizations_materialized WHERE {criterion}"), params)
+        assert index_name in "\n".join(row[0] for row in plan)
+
+    for org_id in org_ids:
+        _assert_materialized_in_sync(org_id)
+
+
+@run_benchmarks
+@pytest.mark.slow
+def test_materialized_authorizations_benchmark(session, record_property):  # pylint:disable=unused-argument
+    """Assert that the p95 lookup latency of authorizations_materialized does not exceed that of the view."""
+    user = factory_user_model()
+    org_ids = _factory_business_orgs(user, 50)
+
+    for index_name, criterion in MATERIALIZED_LOOKUPS.items():
+        p95 = {}
+        for relation in ("authorizations_view", "authorizations_materialized"):
+            timings = []
+            for index, org_id in enumerate(org_ids * 4):
+                params = {
+                    "guid": str(user.keycloak_guid),
+                    "org_id": org_id,
+                    "identifier": f"CP{index % len(org_ids):07d}",
+                    "product": ProductCode.BUSINESS.value,
+                }
+                start = time.perf_counter()
+                db.session.execute(text(f"SELECT * FROM {relation} WHERE {criterion}"), params).fetchall()
+                timings.append(time.perf_counter() - start)
+            p95[relation] = statistics.quantiles(timings, n=20)[-1] * 1000
+            record_property(f"{index_name}_{relation}_p95_ms", round(p95[relation], 3))
+        assert p95["authorizations_materialized"] <= p95["authorizations_view"]
@@ -15,6 +15,10 @@
 
 Test suite to ensure that the Affiliation service routines are working as expected.
 """
+import os
+import time
+from copy import deepcopy
+from datetime import datetime
 from unittest import mock
 from unittest.mock import ANY, patch
 
@@ -22,15 +26,22 @@ import pytest
 from sbc_common_components.utils.enums import QueueMessageTypes
 
 import auth_api
-from auth_api.exceptions import BusinessException
+from auth_api.exceptions import BusinessException, ServiceUnavailableException
 from auth_api.exceptions.errors import Error
 from auth_api.models.affiliation import Affiliation as AffiliationModel
 from auth_api.models.dataclass import Activity
 from auth_api.models.dataclass import Affiliation as AffiliationData
-from auth_api.models.dataclass import DeleteAffiliationRequest
+from auth_api.models.dataclass import (
+    AffiliationBase,
+    AffiliationSearchDetails,
+    DeleteAffiliationRequest,
+    ParallelPostFailure,
+    ParallelPostResult,
+)
 from auth_api.models.org import Org as OrgModel
 from auth_api.services import ActivityLogPublisher
 from auth_api.services import Affiliation as AffiliationService
+from auth_api.services.rest_service import RestService
 from auth_api.utils.enums import ActivityAction, OrgType
 from tests.conftest import mock_token
 from tests.utilities.factory_scenarios import TestEntityInfo, TestJwtClaims, TestOrgInfo, TestOrgTypeInfo, TestUserInfo
@@ -295,6 +306,25 @@ def test_find_affiliated_entities_by_org_id(session, auth_mock):  # pylint:disab
     assert affiliated_entities[0]["business_identifier"] == entity_dictionary2["business_identifier"]
 
 
+def test_find_affiliated_identifiers_by_org_id(session, auth_mock):  # pylint:disable=unused-argument
+    """Assert that the identifiers-only lookup matches the entities returned for the org."""
+    business_identifiers = []
+    for entity_info in (TestEntityInfo.entity_lear_mock, TestEntityInfo.entity_lear_mock2):
+        business_identifiers.append(factory_entity_service(entity_info=entity_info).as_dict()["business_identifier"])
+
+    org_id = factory_org_service().as_dict()["id"]
+    AffiliationService.create_affiliation(org_id, business_identifiers[0], TestEntityInfo.entity_lear_mock["passCode"])
+    AffiliationService.create_affiliation(org_id, business_identifiers[1], TestEntityInfo.entity_lear_mock2["passCode"])
+
+    identifiers = AffiliationService.find_affiliated_identifiers_by_org_id(org_id)
+
+    assert identifiers == list(reversed(business_identifiers))
+    assert identifiers == [
+        entity["business_identifier"] for entity in AffiliationService.find_affiliations_by_org_id(org_id)
+    ]
+    assert AffiliationService.find_affiliated_identifiers_by_org_id(None) == []
+
+
 def test_find_affiliated_entities_by_org_id_no_org(session, auth_mock):  # pylint:disable=unused-argument
     """Assert that an Affiliation can not be find without org id or org id not exists."""
     with pytest.raises(BusinessException) as exception:
@@ -660,3 +690,197 @@ def test_find_affiliation(session, auth_mock):  # pylint:disable=unused-argument
     assert affiliation
     assert affiliation["business"]["business_identifier"] == business_identifier
     assert affiliation["organization"]["id"] == org_dictionary["id"]
+
+
+def test_get_affiliation_details_partial(session, app):  # pylint:disable=unused-argument
+    """Assert that details of the sources that answered are returned when another source fails."""
+    businesses = {"businessEntities": [{"identifier": "BC1234567", "legalType": "BC"}], "draftEntities": []}
+    partial = ParallelPostResult(
+        responses=[businesses],
+        failures=[ParallelPostFailure(url="namex", status=503, error="Error response from namex")],
+    )
+    affiliation_bases = [
+        AffiliationBase(identifier="BC1234567", created=datetime.now()),
+        AffiliationBase(identifier="NR 1234567", created=datetime.now()),
+    ]
+    search_details = AffiliationSearchDetails(page=1, limit=100)
+    with (
+        patch.object(RestService, "get_service_account_token", return_value="token"),
+        patch.object(RestService, "post_in_parallel", return_value=partial),
+    ):
+        details, degraded = AffiliationService.get_affiliation_details(affiliation_bases, search_details, 1, True)
+    assert degraded
+    assert [detail["identifier"] for detail in details] == ["BC1234567"]
+
+    with (
+        patch.object(RestService, "get_service_account_token", return_value="token"),
+        patch.object(RestService, "post_in_parallel", return_value=ParallelPostResult(failures=partial.failures)),
+    ):
+        with pytest.raises(ServiceUnavailableException):
+            AffiliationService.get_affiliation_details(affiliation_bases, search_details, 1, True)
+
+
+def test_get_affiliation_details_partial_keeps_drafts(session, app):  # pylint:disable=unused-argument
+    """Assert that drafts with an NR are not dropped as stale when namex failed."""
+    lear = {
+        "businessEntities": [],
+        "draftEntities": [{"identifier": "T123456789", "draftType": "TMP", "nrNumber": "NR 1234567"}],
+    }
+    partial = ParallelPostResult(
+        responses=[lear],
+        failures=[ParallelPostFailure(url="namex", status=503, error="Error response from namex")],
+    )
+    affiliation_bases = [
+        AffiliationBase(identifier="T123456789", created=datetime.now()),
+        AffiliationBase(identifier="NR 1234567", created=datetime.now()),
+    ]
+    with (
+        patch.object(RestService, "get_service_account_token", return_value="token"),
+        patch.object(RestService, "post_in_parallel", return_value=partial),
+    ):
+        details, degraded = AffiliationService.get_affiliation_details(
+            affiliation_bases, AffiliationSearchDetails(page=1, limit=100), 1, True
+        )
+    assert degraded
+    assert [detail["identifier"] for detail in details] == ["T123456789"]
+
+
+def test_get_affiliation_details_batched(session, app, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that identifiers are sent in batches and the batch responses are merged in order."""
+    monkeypatch.setitem(app.config, "AFFILIATION_DETAILS_BATCH_SIZE", 2)
+    identifiers = [f"BC000000{i}" for i in range(5)]
+    affiliation_bases = [
+        AffiliationBase(identifier=identifier, created=datetime(2024, 1, 10 - i))
+        for i, identifier in enumerate(identifiers)
+    ]
+
+    async def post_in_parallel(call_info, token, org_id):  # pylint:disable=unused-argument
+        return ParallelPostResult(
+            responses=[
+                {
+                    "businessEntities": [{"identifier": identifier} for identifier in call["payload"]["identifiers"]],
+                    "draftEntities": [],
+                }
+                for call in call_info
+            ]
+        )
+
+    with (
+        patch.object(RestService, "get_service_account_token", return_value="token"),
+        patch.object(RestService, "post_in_parallel", side_effect=post_in_parallel) as post_mock,
+    ):
+        details, degraded = AffiliationService.get_affiliation_details(
+            affiliation_bases, AffiliationSearchDetails(page=1, limit=100), 1, True
+        )
+    call_info = post_mock.call_args.args[0]
+    batches = [call["payload"]["identifiers"] for call in call_info]
+    assert batches == [identifiers[0:2], identifiers[2:4], identifiers[4:]]
+    assert not degraded
+    assert [detail["identifier"] for detail in details] == identifiers
+
+
+def test_get_affiliation_details_batched_limit(session, app, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that a batched search returns at most limit rows, not limit rows per batch."""
+    monkeypatch.setitem(app.config, "AFFILIATION_DETAILS_BATCH_SIZE", 2)
+    identifiers = [f"BC000000{i}" for i in range(6)]
+    affiliation_bases = [
+        AffiliationBase(identifier=identifier, created=datetime(2024, 1, 10 - i))
+        for i, identifier in enumerate(identifiers)
+    ]
+
+    async def post_in_parallel(call_info, token, org_id):  # pylint:disable=unused-argument
+        return ParallelPostResult(
+            responses=[
+                {
+                    "businessEntities": [
+                        {"identifier": identifier}
+                        for identifier in call["payload"]["identifiers"][: call["payload"]["limit"]]
+                    ],
+                    "draftEntities": [],
+                }
+                for call in call_info
+            ]
+        )
+
+    with (
+        patch.object(RestService, "get_service_account_token", return_value="token"),
+        patch.object(RestService, "post_in_parallel", side_effect=post_in_parallel),
+    ):
+        details, _ = AffiliationService.get_affiliation_details(
+            affiliation_bases, AffiliationSearchDetails(page=1, limit=3), 1, True
+        )
+    assert [detail["identifier"] for detail in details] == identifiers[:3]
+
+
+def test_sort_affiliation_details_without_created():
+    """Assert that details of affiliations without a created date sort last instead of failing the sort."""
+    affiliation_bases = [
+        AffiliationBase(identifier="BC0000001", created=None),
+        AffiliationBase(identifier="BC0000002", created=datetime(2024, 1, 2)),
+        AffiliationBase(identifier="BC0000003", created=datetime(2024, 1, 3)),
+    ]
+    combined = [{"identifier": base.identifier} for base in affiliation_bases]
+
+    AffiliationService._sort_affiliation_details(combined, affiliation_bases)
+
+    assert [detail["identifier"] for detail in combined] == ["BC0000003", "BC0000002", "BC0000001"]
+
+
+def _combine_nrs_with_list_removal(name_requests, businesses, drafts, remove_stale_drafts=True):
+    """Combine NRs the way the service did before the merge became linear, used as the expected output."""
+    for business in drafts + businesses:
+        if "nrNumber" in business and business["nrNumber"]:
+            nr_num = business["nrNumber"]
+            if nr_num in name_requests:
+                business["nameRequest"] = name_requests[nr_num]["nameRequest"]
+                if business.get("draftType") and business["nameRequest"]["request_action_cd"] == "AML":
+                    business["draftType"] = "ATMP"
+                if business["nameRequest"]["stateCd"] == "CONSUMED":
+                    drafts.remove(business)
+                del name_requests[nr_num]
+            elif remove_stale_drafts and business in drafts:
+                drafts.remove(business)
+    return list(name_requests.values()) + drafts + businesses
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("remove_stale_drafts", [True, False])
+def test_combine_affiliation_details_benchmark(remove_stale_drafts, record_property):
+    """Assert that the linear merge matches the list removal merge for 10k entities of each kind.
+
+    The timings are recorded, with RUN_BENCHMARKS set the linear merge must also be at least twice as fast.
+    """
+    count = 10000
+    states = ["APPROVED", "CONSUMED", "DRAFT"]
+    name_requests = [
+        {"nrNum": f"NR {i:07d}", "stateCd": states[i % 3], "request_action_cd": "AML" if i % 5 == 0 else "NEW"}
+        for i in range(count)
+    ]
+    # Every fourth draft points at an NR that is not part of the results, i.e. a stale draft.
+    drafts = [
+        {
+            "identifier": f"T{i:09d}",
+            "draftType": "TMP",
+            "nrNumber": f"NR {i + (count if i % 4 == 0 else 0):07d}" if i % 7 else None,
+        }
+        for i in range(count)
+    ]
+    businesses = [{"identifier": f"BC{i:07d}", "nrNumber": None} for i in range(count)]
+    details = [name_requests, {"businessEntities": businesses, "draftEntities": drafts}]
+
+    start = time.perf_counter()
+    combined = AffiliationService._combine_affiliation_details(deepcopy(details), remove_stale_drafts)
+    linear = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _combine_nrs_with_list_removal(
+        *AffiliationService._group_details(deepcopy(details)), remove_stale_drafts=remove_stale_drafts
+    )
+    quadratic = time.perf_counter() - start
+
+    assert combined == expected
+    record_property("linear_ms", round(linear * 1000, 3))
+    record_property("quadratic_ms", round(quadratic * 1000, 3))
+    if os.getenv("RUN_BENCHMARKS", False):
+        # The list removal merge is quadratic, at this size it is far slower, the ratio leaves room for noisy runners.
+        assert quadratic / linear > 2
@@ -22,7 +22,7 @@ from contextlib import nullcontext as does_not_raise
 import pytest
 from werkzeug.exceptions import Forbidden, HTTPException
 
-from auth_api.services.authorization import Authorization, check_auth
+from auth_api.services.authorization import Authorization, authorization_cache_stats, check_auth
 from auth_api.utils.enums import ProductCode
 from auth_api.utils.roles import ADMIN, STAFF, USER
 from tests.utilities.factory_scenarios import TestEntityInfo, TestJwtClaims, TestUserInfo
@@ -88,6 +88,31 @@ def test_get_user_authorizations_for_entity(session, monkeypatch):  # pylint:dis
     assert authorization.get("orgMembership", None) == membership.membership_type_code
 
 
+def test_get_user_authorizations_for_entities(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that bulk user authorizations match the single entity lookups."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    factory_product_model(org.id, product_code=ProductCode.BUSINESS.value)
+    entity = factory_entity_model()
+    factory_affiliation_model(entity.id, org.id)
+    other_entity = factory_entity_model(entity_info=TestEntityInfo.entity2)
+    identifiers = [entity.business_identifier, other_entity.business_identifier]
+
+    for claims in (
+        {"sub": str(user.keycloak_guid), "realm_access": {"roles": ["basic"]}},
+        {"loginSource": "", "realm_access": {"roles": ["staff"]}},
+        {"loginSource": "", "realm_access": {"roles": ["system"]}, "product_code": ProductCode.BUSINESS.value},
+    ):
+        patch_token_info(claims, monkeypatch)
+        for expanded in (False, True):
+            authorizations = Authorization.get_user_authorizations_for_entities(identifiers, expanded)
+            for identifier in identifiers:
+                assert authorizations[identifier] == Authorization.get_user_authorizations_for_entity(
+                    identifier, expanded
+                )
+
+
 def test_get_user_authorizations_for_org(session, monkeypatch):  # pylint:disable=unused-argument
     """Assert that user authorizations for entity is working."""
     user = factory_user_model()
@@ -249,6 +274,29 @@ def test_check_auth(session, monkeypatch):  # pylint:disable=unused-argument
             assert excinfo.exception.code == 403
 
 
+def test_check_auth_uses_request_cache(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that repeated authorization lookups in a request hit authorizations_view only once."""
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    patch_token_info({"realm_access": {"roles": ["public"]}, "sub": str(user.keycloak_guid)}, monkeypatch)
+
+    before = authorization_cache_stats()
+    check_auth(one_of_roles=[ADMIN], org_id=org.id)
+    check_auth(one_of_roles=[ADMIN], org_id=org.id)
+    authorization = Authorization.get_account_authorizations_for_org(org.id, None)
+    after = authorization_cache_stats()
+
+    assert authorization.get("orgMembership", None) == ADMIN
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+    # A write in the same request drops the memo so the next lookup reads the view again.
+    factory_membership_model(factory_user_model(TestUserInfo.user2).id, org.id)
+    check_auth(one_of_roles=[ADMIN], org_id=org.id)
+    assert authorization_cache_stats()["misses"] - after["misses"] == 1
+
+
 @pytest.mark.parametrize(
     "test_desc,test_expect,additional_kwargs,add_org_id",
     [
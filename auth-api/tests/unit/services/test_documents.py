@@ -17,9 +17,11 @@
 Test-Suite to ensure that the Document Service is working as expected.
 """
 
+from unittest.mock import patch
+
 from auth_api.models import Documents as DocumentsModel
 from auth_api.services import Documents as DocumentService
-from tests.utilities.factory_utils import get_tos_latest_version
+from tests.utilities.factory_utils import factory_document_model, get_tos_latest_version
 
 
 def test_as_dict(session):  # pylint: disable=unused-argument
@@ -58,3 +60,24 @@ def test_find_latest_version_for_director_search(session):  # pylint: disable=un
     """Assert that a document is rendered correctly as a dictionary."""
     terms_of_use = DocumentService.find_latest_version_by_type("termsofuse_directorsearch")
     assert terms_of_use == "d1"
+
+
+def test_find_latest_versions_are_cached_until_documents_change(
+    session, app, monkeypatch
+):  # pylint: disable=unused-argument
+    """Assert that latest versions are read once per type and refreshed when a document is inserted."""
+    monkeypatch.setitem(app.config, "DOCUMENTS_CACHE_TIMEOUT", 60)
+    DocumentService.invalidate_latest_versions(["termsofuse", "sometype"])
+    with patch.object(
+        DocumentsModel, "find_latest_versions_by_types", wraps=DocumentsModel.find_latest_versions_by_types
+    ) as find_versions:
+        versions = DocumentService.find_latest_versions_by_types(["termsofuse", "sometype"])
+        assert versions == {"termsofuse": get_tos_latest_version()}
+        assert DocumentService.find_latest_version_by_type("termsofuse") == get_tos_latest_version()
+        assert DocumentService.find_latest_version_by_type("sometype") is None
+        assert find_versions.call_count == 1
+
+        factory_document_model("z99", "sometype", "<p>content</p>")
+        assert DocumentService.find_latest_version_by_type("sometype") == "z99"
+        assert find_versions.call_count == 2
+    DocumentService.invalidate_latest_versions(["termsofuse", "sometype"])
@@ -2,11 +2,17 @@
 
 from unittest.mock import Mock, patch
 
+import pytest
+
+from auth_api.exceptions import BusinessException
+from auth_api.exceptions.errors import Error
 from auth_api.models.affiliation import Affiliation as AffiliationModel
 from auth_api.models.dataclass import AffiliationSearchDetails
 from auth_api.models.entity import Entity
 from auth_api.models.entity_mapping import EntityMapping
+from auth_api.models.org_affiliation_row import OrgAffiliationRow
 from auth_api.services.entity_mapping import EntityMappingService
+from auth_api.services.org_affiliation_rows import OrgAffiliationRows
 from tests.utilities.factory_utils import factory_org_service
 
 
@@ -289,3 +295,124 @@ def test_get_filtered_affiliations_pagination_limit_one(session):
     assert len(results) == 1
     assert has_more is True
     assert results[0][0] == ["BC1234569"]
+
+
+def test_get_filtered_affiliations_cursor_pagination(session):
+    """Assert that walking the pages with the cursor returns every row once, in the same order as one page."""
+    entity_mapping_data = [
+        {"identifier": f"BC123456{index}", "bootstrapIdentifier": None, "nrNumber": None} for index in range(5)
+    ]
+
+    service = EntityMappingService()
+    org_id, _ = _setup_orgs()
+
+    for data in entity_mapping_data:
+        _create_affiliations_for_mapping(session, org_id, data, None)
+
+    expected, _ = service.paginate_from_affiliations(org_id, AffiliationSearchDetails(page=1, limit=1000))
+
+    results = []
+    search_details = AffiliationSearchDetails(page=1, limit=2)
+    while True:
+        data, has_more = service.paginate_from_affiliations(org_id, search_details)
+        results.extend(data)
+        if not (cursor := service.next_cursor(data, has_more)):
+            break
+        search_details = AffiliationSearchDetails(page=1, limit=2, cursor=cursor)
+
+    assert [result[0] for result in results] == [result[0] for result in expected]
+    assert len(results) == 5
+
+
+@pytest.mark.parametrize("rows_enabled", [False, True])
+def test_get_filtered_affiliations_cursor_without_created(session, app, monkeypatch, rows_enabled):
+    """Assert that rows without a created date are paged last, and a cursor can point at one of them."""
+    monkeypatch.setitem(app.config, "AFFILIATION_ROWS_MAINTAINED", rows_enabled)
+    service = EntityMappingService()
+    org_id, _ = _setup_orgs()
+    for index in range(5):
+        _create_affiliations_for_mapping(
+            session, org_id, {"identifier": f"BC765432{index}", "bootstrapIdentifier": None, "nrNumber": None}, None
+        )
+    for affiliation in (
+        session.query(AffiliationModel)
+        .join(Entity, AffiliationModel.entity_id == Entity.id)
+        .filter(AffiliationModel.org_id == org_id, Entity.business_identifier.in_(["BC7654321", "BC7654323"]))
+    ):
+        affiliation.created = None
+    session.commit()
+    if rows_enabled:
+        OrgAffiliationRows.rebuild([org_id])
+    monkeypatch.setitem(app.config, "AFFILIATION_ROWS_ENABLED", rows_enabled)
+
+    expected, _ = service.paginate_from_affiliations(org_id, AffiliationSearchDetails(page=1, limit=1000))
+    assert [result[1] for result in expected[-2:]] == [None, None]
+
+    results = []
+    search_details = AffiliationSearchDetails(page=1, limit=1)
+    while True:
+        data, has_more = service.paginate_from_affiliations(org_id, search_details)
+        results.extend(data)
+        if not (cursor := service.next_cursor(data, has_more)):
+            break
+        search_details = AffiliationSearchDetails(page=1, limit=1, cursor=cursor)
+
+    assert [result[0] for result in results] == [result[0] for result in expected]
+    assert results[-2:] == [(["BC7654323"], None), (["BC7654321"], None)]
+
+
+def test_get_filtered_affiliations_invalid_cursor(session):  # pylint:disable=unused-argument
+    """Assert that a cursor that can not be decoded is rejected."""
+    with pytest.raises(BusinessException) as exception:
+        EntityMappingService.paginate_from_affiliations(1, AffiliationSearchDetails(page=1, limit=2, cursor="bad"))
+    assert exception.value.code == Error.INVALID_INPUT.name
+
+
+def test_org_affiliation_rows_maintained_on_write(session, app, monkeypatch):
+    """Assert that org_affiliation_rows follow affiliation and mapping changes and serve the same pages."""
+    monkeypatch.setitem(app.config, "AFFILIATION_ROWS_MAINTAINED", True)
+    entity_mapping_data = [
+        {"identifier": None, "bootstrapIdentifier": "Tqqqqqqq", "nrNumber": "NR4444444"},
+        {"identifier": "BC4444441", "bootstrapIdentifier": None, "nrNumber": None},
+        {"identifier": None, "bootstrapIdentifier": "Trrrrrrr", "nrNumber": None},
+        {"identifier": None, "bootstrapIdentifier": None, "nrNumber": "NR4444445", "nrDifferentOrg": True},
+    ]
+
+    service = EntityMappingService()
+    org_id, alternate_org_id = _setup_orgs()
+    for data in entity_mapping_data:
+        _create_affiliations_for_mapping(session, org_id, data, alternate_org_id)
+
+    search_details = AffiliationSearchDetails(page=1, limit=1000)
+    computed, _ = service.paginate_from_affiliations(org_id, search_details)
+    monkeypatch.setitem(app.config, "AFFILIATION_ROWS_ENABLED", True)
+    stored, _ = service.paginate_from_affiliations(org_id, search_details)
+    assert [row[0] for row in stored] == [row[0] for row in computed]
+    assert [row[0] for row in stored] == [["Trrrrrrr"], ["BC4444441"], ["Tqqqqqqq", "NR4444444"]]
+    assert OrgAffiliationRows.verify(alternate_org_id)
+
+    # The TEMP is incorporated, the business replaces the TEMP and NR pair.
+    _create_affiliations_for_mapping(
+        session, org_id, {"identifier": "BC4444442", "bootstrapIdentifier": "Tqqqqqqq", "nrNumber": "NR4444444"}, None
+    )
+    stored, _ = service.paginate_from_affiliations(org_id, search_details)
+    assert [row[0] for row in stored] == [["BC4444442"], ["Trrrrrrr"], ["BC4444441"]]
+
+    entity = session.query(Entity).filter(Entity.business_identifier == "Trrrrrrr").one()
+    session.query(AffiliationModel).filter(
+        AffiliationModel.org_id == org_id, AffiliationModel.entity_id == entity.id
+    ).one().delete()
+    assert OrgAffiliationRows.verify(org_id)
+    stored, _ = service.paginate_from_affiliations(org_id, search_details)
+    assert [row[0] for row in stored] == [["BC4444442"], ["BC4444441"]]
+
+
+def test_org_affiliation_rows_not_maintained_when_off(session, app, monkeypatch):
+    """Assert that writes skip the org_affiliation_rows rebuild while the rows are neither maintained nor enabled."""
+    monkeypatch.setitem(app.config, "AFFILIATION_ROWS_MAINTAINED", False)
+    monkeypatch.setitem(app.config, "AFFILIATION_ROWS_ENABLED", False)
+    org_id, _ = _setup_orgs()
+    _create_affiliations_for_mapping(
+        session, org_id, {"identifier": "BC4444443", "bootstrapIdentifier": None, "nrNumber": None}, None
+    )
+    assert not session.query(OrgAffiliationRow).filter(OrgAffiliationRow.org_id == org_id).count()
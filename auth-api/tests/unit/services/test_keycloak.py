@@ -22,7 +22,8 @@ import pytest
 from auth_api.exceptions import BusinessException
 from auth_api.exceptions.errors import Error
 from auth_api.models.dataclass import KeycloakGroupSubscription
-from auth_api.services.keycloak import KeycloakService
+from auth_api.services.keycloak import KeycloakService, admin_tokens
+from auth_api.services.keycloak_group_sync import KeycloakGroupSync
 from auth_api.utils.constants import GROUP_ACCOUNT_HOLDERS, GROUP_ANONYMOUS_USERS, GROUP_PUBLIC_USERS
 from auth_api.utils.enums import KeycloakGroupActions, LoginSource
 from auth_api.utils.roles import Role
@@ -49,6 +50,18 @@ def test_keycloak_get_user_by_username(session):
     assert user.user_name == request.user_name
 
 
+def test_keycloak_rejected_admin_token_replaced(session):
+    """Assert that an admin token keycloak rejects before its expiry is replaced and the call is sent once more."""
+    request = KeycloakScenario.create_user_request()
+    KEYCLOAK_SERVICE.add_user(request, return_if_exists=True)
+    slot = KeycloakService._admin_token_slot(upstream=True)  # pylint: disable=protected-access
+    admin_tokens._store(slot, {"access_token": "revoked", "expires_in": 300})  # pylint: disable=protected-access
+
+    user = KEYCLOAK_SERVICE.get_user_by_username(request.user_name)
+    assert user.user_name == request.user_name
+    assert KeycloakService._get_admin_token(upstream=True) != "revoked"  # pylint: disable=protected-access
+
+
 def test_keycloak_get_user_by_username_not_exist(session):
     """Get user by a username not exists in Keycloak. Assert user is None, error code is data not found."""
     user = None
@@ -272,6 +285,30 @@ def test_add_remove_group_bulk(session):
     assert "ppr" in ["ppr" for user_group in user1_groups if user_group.get("name") == "ppr"]
     assert "bca" not in ["bca" for user_group in user2_groups if user_group.get("name") == "bca"]
 
+    # Nothing differs anymore, a second sync must not change any membership.
+    report = KeycloakService.add_or_remove_product_keycloak_groups(kgs)
+    assert report.changed == 0
+    assert report.unchanged == 2
+    assert not report.failed
+
+
+def test_group_sync_desired_memberships():
+    """Assert that a removal wins over an addition of the same user and group."""
+    add, remove = KeycloakGroupActions.ADD_TO_GROUP.value, KeycloakGroupActions.REMOVE_FROM_GROUP.value
+    kgs = [
+        KeycloakGroupSubscription("user1", "ppr", "ppr", add),
+        KeycloakGroupSubscription("user1", "ppr", "ppr", add),
+        KeycloakGroupSubscription("user2", "bca", "bca", add),
+        KeycloakGroupSubscription("user2", "bca", "bca", remove),
+        KeycloakGroupSubscription("user3", "bca", "bca", remove),
+        KeycloakGroupSubscription("user3", "bca", "bca", add),
+    ]
+    assert KeycloakGroupSync.desired_memberships(kgs) == {
+        ("user1", "ppr"): True,
+        ("user2", "bca"): False,
+        ("user3", "bca"): False,
+    }
+
 
 def test_service_account_by_client_name(session):
     """Test keycloak service account by client name."""
@@ -60,6 +60,7 @@ from auth_api.utils.enums import (
     TaskRelationshipType,
     TaskStatus,
 )
+from auth_api.utils.passcode import validate_passcode
 from tests.conftest import mock_token
 from tests.utilities.factory_scenarios import (
     KeycloakScenario,
@@ -880,10 +881,11 @@ def test_delete_org_with_members(session, auth_mock, keycloak_mock, monkeypatch)
     assert len(MembershipService.get_members_for_org(org_id)) == 0
 
 
+@patch.object(auth_api.services.affiliation, "publish_affiliation_events")
 @patch.object(auth_api.services.affiliation, "publish_affiliation_event")
 @mock.patch("auth_api.services.affiliation_invitation.RestService.get_service_account_token", mock_token)
 def test_delete_org_with_affiliation(
-    publish_mock, session, auth_mock, keycloak_mock, monkeypatch
+    publish_mock, publish_bulk_mock, session, auth_mock, keycloak_mock, monkeypatch
 ):  # pylint:disable=unused-argument
     """Assert that an org cannot be deleted."""
     user_with_token = dict(TestUserInfo.user_test)
@@ -905,10 +907,50 @@ def test_delete_org_with_affiliation(
     patch_pay_account_delete(monkeypatch)
     OrgService.delete_org(org_id)
 
-    publish_mock.assert_called_once_with(QueueMessageTypes.BUSINESS_UNAFFILIATED.value, org_id, business_identifier)
+    publish_mock.assert_not_called()
+    publish_bulk_mock.assert_called_once_with(
+        QueueMessageTypes.BUSINESS_UNAFFILIATED.value, org_id, [business_identifier], [user.id]
+    )
     assert len(AffiliationService.find_visible_affiliations_by_org_id(org_id)) == 0
 
 
+@mock.patch("auth_api.services.affiliation_invitation.RestService.get_service_account_token", mock_token)
+def test_delete_org_with_affiliations_and_members(
+    session, auth_mock, keycloak_mock, monkeypatch
+):  # pylint:disable=unused-argument
+    """Assert that every affiliation and member of the org is removed in one go."""
+    user_with_token = dict(TestUserInfo.user_test)
+    user_with_token["keycloak_guid"] = TestJwtClaims.public_user_role["sub"]
+    user = factory_user_model(user_info=user_with_token)
+
+    patch_token_info({"sub": user.keycloak_guid, "idp_userid": user.idp_userid}, monkeypatch)
+    org = OrgService.create_org(TestOrgInfo.org1, user.id)
+    org_id = org.as_dict()["id"]
+    user2 = factory_user_model(user_info=TestUserInfo.user2)
+    factory_membership_model(user2.id, org_id, member_type="COORDINATOR")
+
+    entities = []
+    for entity_info in (TestEntityInfo.entity_lear_mock, TestEntityInfo.entity_lear_mock2):
+        business_identifier = factory_entity_service(entity_info=entity_info).as_dict()["business_identifier"]
+        AffiliationService.create_affiliation(org_id, business_identifier, entity_info["passCode"])
+        entities.append((business_identifier, entity_info["passCode"]))
+
+    patch_token_info(TestJwtClaims.public_user_role, monkeypatch)
+    patch_pay_account_delete(monkeypatch)
+    with patch.object(KeycloakService, "remove_users_from_account_holders_group") as remove_mock:
+        OrgService.delete_org(org_id)
+
+    assert AffiliationService.find_affiliated_identifiers_by_org_id(org_id) == []
+    assert len(MembershipService.get_members_for_org(org_id)) == 0
+    remove_mock.assert_called_once()
+    removed_guids = sorted(map(str, remove_mock.call_args.args[0]))
+    assert removed_guids == sorted([str(user.keycloak_guid), str(user2.keycloak_guid)])
+    for business_identifier, pass_code in entities:
+        entity = EntityService.find_by_business_identifier(business_identifier, skip_auth=True)
+        assert not entity.as_dict().get("pass_code_claimed")
+        assert not validate_passcode(pass_code, entity._model.pass_code)  # pylint:disable=protected-access
+
+
 @mock.patch("auth_api.services.affiliation_invitation.RestService.get_service_account_token", mock_token)
 def test_delete_org_with_members_success(
     session, auth_mock, keycloak_mock, monkeypatch
@@ -19,21 +19,29 @@ Test-Suite to ensure that the Permissions Service is working as expected.
 from unittest.mock import patch
 
 from auth_api.services import Permissions as PermissionService
-from auth_api.utils.cache import cache
 
 
 def test_build_all_permission_cache(session):  # pylint: disable=unused-argument
-    """Assert that building cache works."""
-    PermissionService.build_all_permission_cache()
-    assert cache is not None
-    assert cache.get((None, "ADMIN")) is not None
+    """Assert that building the permission matrix works and bumps its version."""
+    matrix = PermissionService.build_all_permission_cache()
+    assert matrix is not None
+    assert matrix.actions.get((None, "ADMIN"))
+    assert isinstance(matrix.actions[(None, "ADMIN")], frozenset)
+    assert PermissionService.build_all_permission_cache().version == matrix.version + 1
 
 
-def test_get_permissions_for_membership_cache_miss(session):  # pylint: disable=unused-argument
-    """Assert the cache miss and hit."""
+def test_get_permissions_for_membership_in_process(session):  # pylint: disable=unused-argument
+    """Assert permission resolution never queries the database once the matrix is loaded."""
     PermissionService.build_all_permission_cache()
     with patch("auth_api.models.Permissions.get_permissions_by_membership") as method:
-        PermissionService.get_permissions_for_membership("ACTIVE", "ADMIN")
-        assert not method.called, "Should Not miss the Cache"
-        PermissionService.get_permissions_for_membership("invalid", "invalid")
-        assert method.called, "Should miss the Cache"
+        assert PermissionService.get_permissions_for_membership("ACTIVE", "ADMIN")
+        assert PermissionService.get_permissions_for_membership("invalid", "invalid") == []
+        assert not method.called, "Should not leave the process"
+
+
+def test_permission_matrix_refresh(session, app):  # pylint: disable=unused-argument
+    """Assert the matrix reloads once it is older than the refresh interval."""
+    matrix = PermissionService.build_all_permission_cache()
+    with patch.dict(app.config, {"PERMISSIONS_MATRIX_REFRESH_SECONDS": 1}):
+        with patch("auth_api.services.permissions.time.monotonic", return_value=matrix.loaded_at + 2):
+            assert PermissionService.get_permission_matrix().version == matrix.version + 1
@@ -374,3 +374,14 @@ def test_get_users_sub_product_subscriptions_kc_groups(session, keycloak_mock, m
     assert kc_groups[2].group_action == KeycloakGroupActions.REMOVE_FROM_GROUP.value
     assert kc_groups[3].group_name == "mhr_qsln"
     assert kc_groups[3].group_action == KeycloakGroupActions.REMOVE_FROM_GROUP.value
+
+
+def test_find_product_type_by_code_uses_lookup_table(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that product types are served from the in process table and unknown codes are only queried once."""
+    ProductService.build_all_products_cache()
+    with patch.object(ProductCodeModel, "find_by_code", wraps=ProductCodeModel.find_by_code) as find_by_code:
+        assert ProductService.find_product_type_by_code(ProductCode.BUSINESS.value) == "INTERNAL"
+        assert ProductService.find_product_code_info(ProductCode.BUSINESS.value).code == ProductCode.BUSINESS.value
+        assert ProductService.find_product_type_by_code("UNKNOWN_PRODUCT") == ""
+        assert ProductService.find_product_type_by_code("UNKNOWN_PRODUCT") == ""
+        assert find_by_code.call_count == 1
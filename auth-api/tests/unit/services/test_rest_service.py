@@ -0,0 +1,63 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Rest service.
+
+Test suite to ensure that service account tokens rejected before their expiry are replaced, and that parallel POSTs
+report bad responses as failures.
+"""
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from auth_api.models.dataclass import ParallelPostFailure
+from auth_api.services.rest_service import RestService, service_account_tokens
+from auth_api.utils.async_runner import async_runner
+
+
+def test_rejected_service_account_token_renewed(app):
+    """Assert that a call rejected with a 401 is sent once more with a new service account token."""
+    tokens = iter([{"access_token": "revoked", "expires_in": 300}, {"access_token": "renewed", "expires_in": 300}])
+    calls = []
+
+    def get(_endpoint, headers, timeout):  # pylint: disable=unused-argument
+        calls.append(headers["Authorization"])
+        status = HTTPStatus.UNAUTHORIZED if headers["Authorization"] == "Bearer revoked" else HTTPStatus.OK
+        return MagicMock(status_code=status)
+
+    with app.app_context():
+        token = service_account_tokens.get_token("test-slot", lambda: next(tokens))
+        with patch("auth_api.services.rest_service.http_sessions.session") as session:
+            session.return_value.get.side_effect = get
+            response = RestService.get("https://example.com/businesses", token=token)
+
+        assert response.status_code == HTTPStatus.OK
+        assert calls == ["Bearer revoked", "Bearer renewed"]
+        service_account_tokens.invalidate("test-slot")
+
+
+def test_post_in_parallel_non_json_response(app):
+    """Assert that a 200 with a body that is not JSON is reported as a failure of its call, not raised."""
+    response = MagicMock(status=HTTPStatus.OK)
+    response.json = AsyncMock(side_effect=ValueError("Expecting value: line 1 column 1 (char 0)"))
+    session = MagicMock()
+    session.post.return_value.__aenter__.return_value = response
+    call_info = [{"url": "https://example.com/entities", "payload": {}}]
+
+    with app.app_context(), patch.object(async_runner, "client_session", AsyncMock(return_value=session)):
+        result = asyncio.run(RestService.post_in_parallel(call_info, "token"))
+
+    assert result.responses == []
+    assert len(result.failures) == 1
+    assert isinstance(result.failures[0], ParallelPostFailure)
+    assert result.failures[0].status == HTTPStatus.OK
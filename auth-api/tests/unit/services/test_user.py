@@ -364,6 +364,67 @@ def test_create_user_add_membership_reenable(
     assert users["users"][0]["type"] == Role.ANONYMOUS_USER.name
 
 
+def test_create_user_and_add_membership_bulk_chunks(
+    app, session, auth_mock, keycloak_mock, monkeypatch
+):  # pylint:disable=unused-argument
+    """Assert that bulk users are created in chunks and every user keeps its own result, in order."""
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    user = factory_user_model()
+    factory_membership_model(user.id, org.id)
+    factory_product_model(org.id, product_code=ProductCode.DIR_SEARCH.value)
+    claims = TestJwtClaims.get_test_real_user(user.keycloak_guid)
+
+    patch_token_info(claims, monkeypatch)
+    membership = [TestAnonymousMembership.generate_random_user(USER) for _ in range(3)]
+    membership.append(dict(membership[1]))
+    monkeypatch.setitem(app.config, "BULK_USERS_COMMIT_SIZE", 2)
+    users = UserService.create_user_and_add_membership(membership, org.id)
+
+    assert len(users["users"]) == 4
+    for index in range(3):
+        assert users["users"][index]["username"] == IdpHint.BCROS.value + "/" + membership[index]["username"]
+        assert users["users"][index]["http_status"] == 201
+    assert users["users"][3]["http_status"] == 409
+    assert users["users"][3]["error"] == "The username is already taken"
+    assert len(MembershipModel.find_members_by_org_id(org.id)) == 4
+
+
+def test_create_user_and_add_membership_bulk_chunk_failure(
+    app, session, auth_mock, keycloak_mock, monkeypatch
+):  # pylint:disable=unused-argument
+    """Assert that a user failing in a chunk is the only one rolled back, the rest of the chunk is still created."""
+    org = factory_org_model(org_info=TestOrgInfo.org_anonymous)
+    user = factory_user_model()
+    factory_membership_model(user.id, org.id)
+    factory_product_model(org.id, product_code=ProductCode.DIR_SEARCH.value)
+    claims = TestJwtClaims.get_test_real_user(user.keycloak_guid)
+
+    patch_token_info(claims, monkeypatch)
+    membership = [TestAnonymousMembership.generate_random_user(USER) for _ in range(3)]
+    failing_username = IdpHint.BCROS.value + "/" + membership[1]["username"]
+    create_new_user_and_membership = UserService._create_new_user_and_membership  # pylint: disable=protected-access
+
+    def create_or_fail(db_username, kc_user, membership_info, org_id):
+        if db_username == failing_username:
+            raise Exception("Saving the user failed")  # pylint: disable=broad-exception-raised
+        return create_new_user_and_membership(db_username, kc_user, membership_info, org_id)
+
+    monkeypatch.setitem(app.config, "BULK_USERS_COMMIT_SIZE", 2)
+    with (
+        patch.object(UserService, "_create_new_user_and_membership", side_effect=create_or_fail),
+        patch.object(KeycloakService, "delete_user_by_username") as delete_user_by_username,
+    ):
+        users = UserService.create_user_and_add_membership(membership, org.id)
+
+    assert [result["http_status"] for result in users["users"]] == [201, 500, 201]
+    assert users["users"][0]["username"] == IdpHint.BCROS.value + "/" + membership[0]["username"]
+    assert users["users"][1]["error"] == Error.FAILED_ADDING_USER_ERROR.value[0]
+    assert users["users"][2]["username"] == IdpHint.BCROS.value + "/" + membership[2]["username"]
+    delete_user_by_username.assert_called_once_with(membership[1]["username"])
+    assert UserModel.find_by_username(failing_username) is None
+    assert len(MembershipModel.find_members_by_org_id(org.id)) == 3
+
+
 def test_create_user_and_add_membership_admin_bulk_mode_unauthorised(
     session, auth_mock, keycloak_mock, monkeypatch
 ):  # pylint:disable=unused-argument
@@ -0,0 +1,87 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the affiliation details cache.
+
+Test suite to ensure that only identifiers missing from the cache are fetched from LEAR and namex.
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+from auth_api.models.dataclass import AffiliationBase, AffiliationSearchDetails, ParallelPostResult
+from auth_api.services import Affiliation as AffiliationService
+from auth_api.services.rest_service import RestService
+from auth_api.utils.affiliation_details_cache import (
+    affiliation_details_cache_stats,
+    cache_details,
+    get_cached_details,
+    invalidate_affiliation_details,
+)
+
+
+def test_affiliation_details_served_from_cache(app, monkeypatch):
+    """Assert that cached identifiers are not fetched again until they are invalidated."""
+    monkeypatch.setattr("auth_api.utils.affiliation_details_cache._is_shared_backend", lambda: True)
+    monkeypatch.setitem(app.config, "AFFILIATION_DETAILS_CACHE_TIMEOUT", 60)
+    identifiers = ["BC0000001", "NR 0000001", "BC0000404"]
+    affiliation_bases = [AffiliationBase(identifier=identifier, created=datetime.now()) for identifier in identifiers]
+    requested = []
+
+    async def post_in_parallel(call_info, token, org_id):  # pylint:disable=unused-argument
+        identifiers = [identifier for call in call_info for identifier in call["payload"]["identifiers"]]
+        requested.append(sorted(identifiers))
+        responses = []
+        if "BC0000001" in identifiers:
+            responses.append({"businessEntities": [{"identifier": "BC0000001"}], "draftEntities": []})
+        if "NR 0000001" in identifiers:
+            responses.append([{"nrNum": "NR 0000001", "stateCd": "APPROVED"}])
+        return ParallelPostResult(responses=responses)
+
+    def get_details():
+        return AffiliationService.get_affiliation_details(
+            affiliation_bases, AffiliationSearchDetails(page=1, limit=100), 1, True
+        )
+
+    with (
+        app.app_context(),
+        patch.object(RestService, "get_service_account_token", return_value="token"),
+        patch.object(RestService, "post_in_parallel", side_effect=post_in_parallel),
+    ):
+        invalidate_affiliation_details(identifiers)
+        before = affiliation_details_cache_stats()
+        first, _ = get_details()
+        second, _ = get_details()
+        invalidate_affiliation_details(["NR 0000001"])
+        get_details()
+        after = affiliation_details_cache_stats()
+
+    assert first == second
+    assert len(first) == 2
+    assert requested == [sorted(identifiers), ["NR 0000001"]]
+    assert after["hits"] - before["hits"] == 5
+    assert after["misses"] - before["misses"] == 4
+
+
+def test_affiliation_details_invalidated_without_timeout(app, monkeypatch):
+    """Assert that entries are invalidated by processes without AFFILIATION_DETAILS_CACHE_TIMEOUT, like the queues."""
+    monkeypatch.setattr("auth_api.utils.affiliation_details_cache._is_shared_backend", lambda: True)
+    with app.app_context():
+        monkeypatch.setitem(app.config, "AFFILIATION_DETAILS_CACHE_TIMEOUT", 60)
+        cache_details({"NR 0000002": {"nrNum": "NR 0000002", "stateCd": "DRAFT"}})
+        assert get_cached_details(["NR 0000002"])
+
+        monkeypatch.delitem(app.config, "AFFILIATION_DETAILS_CACHE_TIMEOUT")
+        invalidate_affiliation_details(["NR 0000002"])
+
+        monkeypatch.setitem(app.config, "AFFILIATION_DETAILS_CACHE_TIMEOUT", 60)
+        assert not get_cached_details(["NR 0000002"])
@@ -0,0 +1,75 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the background event loop.
+
+Test suite to ensure that coroutines run on one long lived loop with the caller's context.
+"""
+import asyncio
+import threading
+
+import aiohttp
+import pytest
+from flask import current_app
+
+from auth_api.utils.async_runner import AsyncRunner
+
+
+def test_run_on_background_loop(app):
+    """Assert that coroutines share one loop and a cookie free session, and see the application context."""
+    runner = AsyncRunner()
+
+    async def loop_details():
+        session = await runner.client_session("test")
+        return asyncio.get_running_loop(), threading.current_thread(), session, current_app.name
+
+    with app.app_context():
+        first_loop, first_thread, first_session, app_name = runner.run(loop_details())
+        second_loop, _, second_session, _ = runner.run(loop_details())
+
+    assert first_loop is second_loop
+    assert first_session is second_session
+    assert isinstance(first_session.cookie_jar, aiohttp.DummyCookieJar)
+    assert first_thread is not threading.current_thread()
+    assert app_name == app.name
+    runner.close()
+
+
+def test_run_raises_coroutine_errors():
+    """Assert that exceptions raised by the coroutine reach the caller."""
+    runner = AsyncRunner()
+
+    async def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        runner.run(fail())
+    runner.close()
+
+
+def test_run_cancels_coroutine_on_timeout():
+    """Assert that a coroutine that runs past the deadline is cancelled and the caller gets a TimeoutError."""
+    runner = AsyncRunner()
+    cancelled = threading.Event()
+
+    async def stuck():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runner.run(stuck(), timeout=0.1)
+    assert cancelled.wait(5)
+    runner.close()
@@ -0,0 +1,134 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared authorization cache.
+
+Test suite to ensure that cached authorizations are dropped whenever the underlying data changes.
+"""
+import uuid
+from datetime import datetime
+
+from auth_api.models.views.authorization import Authorization as AuthorizationView
+from auth_api.utils.authorization_cache import get_authorization
+from auth_api.utils.enums import OrgStatus
+from auth_api.utils.roles import ADMIN, USER
+from tests.utilities.factory_utils import (
+    factory_affiliation_model,
+    factory_entity_model,
+    factory_membership_model,
+    factory_org_model,
+    factory_user_model,
+)
+
+
+def test_authorization_cache_invalidation(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that cached authorizations are reused and invalidated by membership and org changes."""
+    monkeypatch.setattr("auth_api.utils.authorization_cache._is_shared_backend", lambda: True)
+    user = factory_user_model()
+    org = factory_org_model()
+    membership = factory_membership_model(user.id, org.id)
+    queries = []
+
+    def loader():
+        queries.append(org.id)
+        return AuthorizationView.find_user_authorization_by_org_id(str(user.keycloak_guid), org.id)
+
+    key = ("user_by_org_id", str(user.keycloak_guid), str(org.id), None, None)
+    assert get_authorization(key, org.id, loader).org_membership == ADMIN
+    assert get_authorization(key, org.id, loader).org_membership == ADMIN
+    assert len(queries) == 1
+
+    membership.membership_type_code = USER
+    membership.save()
+    assert get_authorization(key, org.id, loader).org_membership == USER
+    assert len(queries) == 2
+
+    org.status_code = OrgStatus.NSF_SUSPENDED.value
+    org.save()
+    assert get_authorization(key, org.id, loader).status_code == OrgStatus.NSF_SUSPENDED.value
+    assert len(queries) == 3
+
+
+def test_authorization_cache_not_found(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that missing authorizations are cached until a membership is added."""
+    monkeypatch.setattr("auth_api.utils.authorization_cache._is_shared_backend", lambda: True)
+    user = factory_user_model()
+    org = factory_org_model()
+    queries = []
+
+    def loader():
+        queries.append(org.id)
+        return AuthorizationView.find_user_authorization_by_org_id(str(user.keycloak_guid), org.id)
+
+    key = ("user_by_org_id", str(user.keycloak_guid), str(org.id), None, None)
+    assert get_authorization(key, org.id, loader) is None
+    assert get_authorization(key, org.id, loader) is None
+    assert len(queries) == 1
+
+    factory_membership_model(user.id, org.id)
+    assert get_authorization(key, org.id, loader).org_membership == ADMIN
+    assert len(queries) == 2
+
+
+def test_authorization_cache_entity_change(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that cached authorizations of the affiliated orgs are invalidated by entity changes."""
+    monkeypatch.setattr("auth_api.utils.authorization_cache._is_shared_backend", lambda: True)
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    entity = factory_entity_model()
+    factory_affiliation_model(entity.id, org.id)
+    queries = []
+
+    def loader():
+        queries.append(org.id)
+        return AuthorizationView.find_user_authorization_by_business_number(
+            entity.business_identifier, str(user.keycloak_guid), org.id
+        )
+
+    key = ("user_by_business_number", entity.business_identifier, str(user.keycloak_guid), str(org.id), None)
+    assert get_authorization(key, org.id, loader).folio_number == entity.folio_number
+    assert get_authorization(key, org.id, loader).folio_number == entity.folio_number
+    assert len(queries) == 1
+
+    entity.folio_number = "FOLIO-CHANGED"
+    entity.save()
+    assert get_authorization(key, org.id, loader).folio_number == "FOLIO-CHANGED"
+    assert len(queries) == 2
+
+
+def test_authorization_cache_user_change(session, monkeypatch):  # pylint:disable=unused-argument
+    """Assert that cached authorizations of the user's orgs are invalidated by keycloak guid changes only."""
+    monkeypatch.setattr("auth_api.utils.authorization_cache._is_shared_backend", lambda: True)
+    user = factory_user_model()
+    org = factory_org_model()
+    factory_membership_model(user.id, org.id)
+    queries = []
+
+    def loader():
+        queries.append(org.id)
+        return AuthorizationView.find_authorization_for_admin_by_org_id(org.id)
+
+    key = ("admin_by_org_id", None, str(org.id), None, None)
+    assert str(get_authorization(key, org.id, loader).keycloak_guid) == str(user.keycloak_guid)
+    assert len(queries) == 1
+
+    user.login_time = datetime.now()
+    user.save()
+    assert str(get_authorization(key, org.id, loader).keycloak_guid) == str(user.keycloak_guid)
+    assert len(queries) == 1
+
+    user.keycloak_guid = uuid.uuid4()
+    user.save()
+    assert str(get_authorization(key, org.id, loader).keycloak_guid) == str(user.keycloak_guid)
+    assert len(queries) == 2
@@ -0,0 +1,49 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the pooled HTTP sessions.
+
+Test suite to ensure that outbound calls share their connection pools.
+"""
+import requests
+from requests.cookies import MockRequest, create_cookie
+
+from auth_api.utils.http_session import HttpSessions
+
+
+def test_sessions_are_pooled(app):
+    """Assert that sessions are reused, sized from config and rebuilt after close."""
+    http_sessions = HttpSessions()
+    with app.app_context():
+        session = http_sessions.session()
+        assert http_sessions.session() is session
+        assert http_sessions.session(retry_on_failure=True) is not session
+
+        adapter = session.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == app.config["HTTP_POOL_MAXSIZE"]  # pylint: disable=protected-access
+        assert adapter.max_retries.total == app.config["HTTP_MAX_RETRIES"]
+        assert http_sessions.timeout() == (app.config["HTTP_CONNECT_TIMEOUT"], app.config.get("CONNECT_TIMEOUT", 60))
+
+        http_sessions.close()
+        assert http_sessions.session() is not session
+
+
+def test_sessions_reject_cookies(app):
+    """Assert that cookies set by a response are not kept for later calls."""
+    http_sessions = HttpSessions()
+    with app.app_context():
+        session = http_sessions.session()
+        cookie = create_cookie("KEYCLOAK_SESSION", "user-1", domain="example.com")
+        request = MockRequest(requests.Request("GET", "https://example.com/token").prepare())
+        assert not session.cookies.get_policy().set_ok(cookie, request)
+        http_sessions.close()
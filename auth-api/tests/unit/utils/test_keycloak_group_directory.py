@@ -0,0 +1,101 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the keycloak group directory.
+
+Test suite to ensure that group ids are resolved by name and path and the group tree is only loaded on a miss,
+at most once per reload interval.
+"""
+from auth_api.utils.keycloak_group_directory import KeycloakGroupDirectory, index_groups
+
+GROUP_TREE = [
+    {
+        "id": "1",
+        "name": "products",
+        "path": "/products",
+        "subGroups": [{"id": "2", "name": "ppr", "path": "/products/ppr", "subGroups": []}],
+    },
+    {"id": "3", "name": "ppr", "path": "/ppr", "subGroups": []},
+    {"id": "4", "name": "account_holders", "subGroups": []},
+]
+
+
+def test_index_groups():
+    """Assert that groups are indexed by name and path, the first group depth first wins a shared name."""
+    index = index_groups(GROUP_TREE)
+    assert index["products"] == "1"
+    assert index["ppr"] == "2"
+    assert index["/products/ppr"] == "2"
+    assert index["/ppr"] == "3"
+    assert index["/account_holders"] == "4"
+
+
+def test_group_tree_loaded_on_miss(app, monkeypatch):
+    """Assert that the group tree is loaded once and again only for an unknown group after the reload interval."""
+    directory = KeycloakGroupDirectory("test")
+    trees = [GROUP_TREE, GROUP_TREE + [{"id": "5", "name": "new_group", "subGroups": []}]]
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return trees[min(len(fetched), len(trees)) - 1]
+
+    with app.app_context():
+        monkeypatch.setitem(app.config, "KEYCLOAK_GROUP_DIRECTORY_RELOAD_SECONDS", 0)
+        assert directory.group_id("slot", "products", fetch) == "1"
+        assert directory.group_id("slot", "/products/ppr", fetch) == "2"
+        assert directory.group_id("slot", "account_holders", fetch) == "4"
+        assert len(fetched) == 1
+
+        assert directory.group_id("slot", "new_group", fetch) == "5"
+        assert len(fetched) == 2
+
+        directory.invalidate("slot")
+        assert directory.group_id("slot", "products", fetch) == "1"
+        assert len(fetched) == 3
+
+
+def test_group_misses_throttled(app, monkeypatch):
+    """Assert that repeated misses neither reload the tree nor search again within the reload interval."""
+    directory = KeycloakGroupDirectory("test")
+    fetched, searched = [], []
+
+    def fetch():
+        fetched.append(1)
+        return GROUP_TREE
+
+    def search(group_id):
+        def _search():
+            searched.append(1)
+            return group_id
+
+        return _search
+
+    with app.app_context():
+        monkeypatch.setitem(app.config, "KEYCLOAK_GROUP_DIRECTORY_RELOAD_SECONDS", 60)
+        assert directory.group_id("slot", "products", fetch, search(None)) == "1"
+        assert len(fetched) == 1
+
+        # A subgroup only the search finds is added to the index.
+        assert directory.group_id("slot", "paged_subgroup", fetch, search("6")) == "6"
+        assert directory.group_id("slot", "paged_subgroup", fetch, search("6")) == "6"
+        assert (len(fetched), len(searched)) == (1, 1)
+
+        # A group neither finds is remembered as missing.
+        assert directory.group_id("slot", "missing", fetch, search(None)) is None
+        assert directory.group_id("slot", "missing", fetch, search(None)) is None
+        assert (len(fetched), len(searched)) == (1, 2)
+
+        directory.invalidate("slot")
+        assert directory.group_id("slot", "missing", fetch, search("7")) == "7"
+        assert (len(fetched), len(searched)) == (2, 3)
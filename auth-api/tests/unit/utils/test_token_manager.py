@@ -0,0 +1,129 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the token manager.
+
+Test suite to ensure that client credentials tokens are reused until they are about to expire.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from auth_api.utils.token_manager import TokenManager
+
+
+def test_token_reused_until_expiry(app):
+    """Assert that a token is fetched once and refreshed once it is within the refresh skew."""
+    manager = TokenManager("test")
+    responses = [{"access_token": "first", "expires_in": 300}, {"access_token": "second", "expires_in": 10}]
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return responses[len(fetched) - 1]
+
+    with app.app_context():
+        assert manager.get_token("slot", fetch) == "first"
+        assert manager.get_token("slot", fetch) == "first"
+        assert len(fetched) == 1
+
+        manager.invalidate("slot")
+        assert manager.get_token("slot", fetch) == "second"
+        # expires_in is below the refresh skew, the next call fetches again
+        responses.append({"access_token": "third", "expires_in": 300})
+        assert manager.get_token("slot", fetch) == "third"
+        assert manager.get_token("other", lambda: {"access_token": "other"}) == "other"
+
+
+def test_token_fetch_is_single_flight(app):
+    """Assert that concurrent callers share a single token request."""
+    manager = TokenManager("test")
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return {"access_token": "token", "expires_in": 300}
+
+    def get_token(_):
+        with app.app_context():
+            return manager.get_token("slot", fetch)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert set(executor.map(get_token, range(32))) == {"token"}
+    assert len(fetched) == 1
+
+
+def test_token_refreshed_in_background(app):
+    """Assert that a token close to expiry is still handed out while a new one is fetched on another thread."""
+    manager = TokenManager("test", background_refresh=True)
+    responses = [{"access_token": "first", "expires_in": 45}, {"access_token": "second", "expires_in": 300}]
+    fetched = []
+    refreshed = Event()
+
+    def fetch():
+        fetched.append(1)
+        if len(fetched) == 2:
+            refreshed.set()
+        return responses[len(fetched) - 1]
+
+    with app.app_context():
+        assert manager.get_token("slot", fetch) == "first"
+        # Within the background refresh window but outside the refresh skew.
+        assert manager.get_token("slot", fetch) == "first"
+        assert refreshed.wait(5)
+        manager._lock("slot").acquire()  # pylint: disable=protected-access
+        manager._lock("slot").release()  # pylint: disable=protected-access
+        assert manager.get_token("slot", fetch) == "second"
+        assert len(fetched) == 2
+
+
+def test_rejected_token_renewed(app):
+    """Assert that a rejected token is replaced once, callers rejected with it later get the same replacement."""
+    manager = TokenManager("test")
+    responses = [{"access_token": "first", "expires_in": 300}, {"access_token": "second", "expires_in": 300}]
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return responses[len(fetched) - 1]
+
+    with app.app_context():
+        assert manager.get_token("slot", fetch) == "first"
+        assert manager.renew("first") == "second"
+        # Another caller rejecting the same token gets the second as well, without a new fetch.
+        assert manager.renew("first") == "second"
+        manager.invalidate("slot", "first")
+        assert manager.get_token("slot", fetch) == "second"
+        assert manager.renew("unknown") is None
+        assert len(fetched) == 2
+
+
+def test_concurrent_rejections_all_renewed(app):
+    """Assert that every thread rejected with the same token retries with the one replacement."""
+    manager = TokenManager("test")
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return {"access_token": f"token-{len(fetched)}", "expires_in": 300}
+
+    def renew():
+        with app.app_context():
+            return manager.renew("token-1")
+
+    with app.app_context():
+        assert manager.get_token("slot", fetch) == "token-1"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        renewed = list(executor.map(lambda _: renew(), range(8)))
+
+    assert renewed == ["token-2"] * 8
+    assert len(fetched) == 2
@@ -21,3 +21,6 @@ from dotenv import find_dotenv, load_dotenv
 load_dotenv(find_dotenv())
 
 skip_in_pod = pytest.mark.skipif(os.getenv("POD_TESTING", False), reason="Skip test when running in pod")
+run_benchmarks = pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS", False), reason="Benchmarks only run with RUN_BENCHMARKS set"
+)
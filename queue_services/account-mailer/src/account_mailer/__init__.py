@@ -27,6 +27,7 @@ from auth_api.resources.ops import bp as ops_bp
 from auth_api.services.flags import flags
 from auth_api.services.gcp_queue import queue
 from auth_api.utils.cache import cache
+from auth_api.utils.http_session import http_sessions
 from auth_api.utils.logging import setup_logging
 from flask import Flask
 from google.cloud.sql.connector import Connector
@@ -104,6 +105,7 @@ def create_app(run_mode=os.getenv("DEPLOYMENT_ENV", "production")) -> Flask:
     db.init_app(app)
     flags.init_app(app)
     cache.init_app(app)
+    http_sessions.init_app(app)
     queue.init_app(app)
 
     register_endpoints(app)
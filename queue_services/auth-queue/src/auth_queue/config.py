@@ -86,6 +86,9 @@ class _Config:  # pylint: disable=too-few-public-methods
     KEYCLOAK_SERVICE_ACCOUNT_ID = os.getenv("SBC_AUTH_ADMIN_CLIENT_ID")
     KEYCLOAK_SERVICE_ACCOUNT_SECRET = os.getenv("SBC_AUTH_ADMIN_CLIENT_SECRET")
 
+    # Keep org_affiliation_rows up to date for the affiliations and entities the queue writes
+    AFFILIATION_ROWS_MAINTAINED = os.getenv("AFFILIATION_ROWS_MAINTAINED", "False").lower() == "true"
+
 
 class DevConfig(_Config):  # pylint: disable=too-few-public-methods
     """Creates the Development Config object."""
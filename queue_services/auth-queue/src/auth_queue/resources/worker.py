@@ -28,6 +28,7 @@ from auth_api.services.flags import flags
 from auth_api.services.gcp_queue import queue
 from auth_api.services.rest_service import RestService
 from auth_api.utils.account_mailer import publish_to_mailer
+from auth_api.utils.affiliation_details_cache import invalidate_affiliation_details
 from auth_api.utils.enums import AccessType, ActivityAction, CorpType, OrgStatus, QueueSources
 from dateutil import parser
 from flask import Blueprint, current_app, request
@@ -170,6 +171,8 @@ def process_name_events(event_message: SimpleCloudEvent):
         current_app.logger.info("Entity doesn't exist, creating a new entity.")
         nr_entity = EntityModel(business_identifier=nr_number, corp_type_code=CorpType.NR.value)
 
+    # Dashboards must not keep showing the previous state of the NR.
+    invalidate_affiliation_details([nr_number])
     nr_entity.status = nr_status
     nr_entity.name = request_data.get("name", "")  # its not part of event now, this is to handle if they include it.
     nr_entity.last_modified_by = None  # TODO not present in event message.
@@ -177,10 +180,8 @@ def process_name_events(event_message: SimpleCloudEvent):
     # Future - None needs to be replaced with whatever we decide to fill the data with.
     if nr_status == "DRAFT" and not AffiliationModel.find_affiliations_by_business_identifier(nr_number):
         current_app.logger.info("Status is DRAFT, getting invoices for account")
-        token = None
         # Find account details for the NR.
-        with current_app.test_request_context("service_token"):
-            token = RestService.get_service_account_token()
+        token = RestService.get_service_account_token()
         invoices = RestService.get(
             f'{current_app.config.get("PAY_API_URL")}/payment-requests?businessIdentifier={nr_number}',
             token=token,